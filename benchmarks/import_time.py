@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+import_time.py — CLI startup / import-time benchmark
+=====================================================
+Measures, in fresh interpreters, how long it takes to start the CLI and to
+import each pipeline module, so import-time regressions show up as numbers.
+
+Usage:
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --repeat 10 --json import_times.json
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# (label, argv passed to the interpreter)
+CASES = [
+    ("python (baseline)", ["-c", "pass"]),
+    ("generate.py --help", [str(ROOT / "generate.py"), "--help"]),
+    ("generate.py <bad arg>", [str(ROOT / "generate.py"), "--bogus"]),
+    ("import generate", ["-c", "import generate"]),
+] + [
+    (f"import brainrot.{m}", ["-c", f"import brainrot.{m}"])
+    for m in (
+        "cache",
+        "scheduler",
+        "tracing",
+        "daemon",
+        "script_writer",
+        "gemini",
+        "image_generator",
+        "tts_engine",
+        "transcriber",
+        "renderer",
+        "compositor",
+        "streaming",
+    )
+]
+
+
+def _time_case(argv: list[str], repeat: int) -> dict:
+    """Run ``python <argv>`` *repeat* times and collect wall-clock seconds."""
+    samples = []
+    error = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, *argv],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+        )
+        samples.append(time.perf_counter() - start)
+        if proc.returncode not in (0, 2) and "ModuleNotFoundError" in proc.stderr:
+            error = proc.stderr.strip().splitlines()[-1]
+            break
+    return {
+        "median_s": statistics.median(samples),
+        "min_s": min(samples),
+        "runs": len(samples),
+        "error": error,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per case.")
+    parser.add_argument("--json", metavar="PATH", help="Also write results as JSON.")
+    args = parser.parse_args()
+
+    results = {}
+    width = max(len(label) for label, _ in CASES)
+    print(f"{'case':<{width}}  {'median':>8}  {'min':>8}")
+    for label, argv in CASES:
+        r = _time_case(argv, args.repeat)
+        results[label] = r
+        if r["error"]:
+            print(f"{label:<{width}}  {'—':>8}  {'—':>8}  ({r['error']})")
+        else:
+            print(
+                f"{label:<{width}}  {r['median_s'] * 1000:>6.0f}ms"
+                f"  {r['min_s'] * 1000:>6.0f}ms"
+            )
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+        print(f"\nWrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+pipeline.py — Offline pipeline benchmark
+=========================================
+Times the pipeline stages without an API key or network: Gemini is replaced
+by the local stand-in in ``brainrot.fake_gemini``, scripts are synthetic
+(3–50 scenes), and TTS clips are silent WAVs sized to each narration.
+
+Results are written as JSON tagged with the current commit so runs from
+different commits can be compared.
+
+Usage:
+    python benchmarks/pipeline.py --scenes 3 7 20 --json bench.json
+    python benchmarks/pipeline.py --stages render compose --repeat 3
+    python benchmarks/pipeline.py --json new.json --compare old.json
+    python benchmarks/pipeline.py --stages images --image-backend procedural
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import wave
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from brainrot import fake_gemini  # noqa: E402
+from brainrot.offline_script import generate_offline_script  # noqa: E402
+
+STAGES = ("script", "images", "render", "compose")
+SAMPLE_RATE = 24000
+WORDS_PER_SECOND = 2.5
+
+
+def _silent_wav(path: Path, seconds: float):
+    """Write *seconds* of 16-bit mono silence to *path*."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(SAMPLE_RATE)
+        w.writeframes(b"\x00\x00" * int(seconds * SAMPLE_RATE))
+
+
+def _fake_transcription(text: str) -> dict:
+    words, t = [], 0.0
+    for word in text.split():
+        words.append({"word": word, "start": t, "end": t + 0.35})
+        t += 1 / WORDS_PER_SECOND
+    return {"text": text, "segments": [{"start": 0.0, "end": t, "words": words}]}
+
+
+def _commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_once(
+    n_scenes: int,
+    stages: list[str],
+    workdir: Path,
+    latency: float,
+    image_backend: str = "gemini",
+) -> dict:
+    """Run the selected stages once for an *n_scenes* script; return seconds."""
+    fake_gemini.install(latency=latency, n_scenes=n_scenes)
+    timings: dict[str, float] = {}
+    topic = f"Benchmark topic with {n_scenes} scenes"
+
+    def _timed(stage, fn):
+        start = time.perf_counter()
+        result = fn()
+        timings[stage] = time.perf_counter() - start
+        return result
+
+    if "script" in stages:
+        from brainrot.script_writer import generate_script
+
+        script = _timed("script", lambda: generate_script(topic))
+    else:
+        script = generate_offline_script(topic, n_scenes)
+
+    assets = workdir / "generated_assets"
+    if "images" in stages:
+        if image_backend == "procedural":
+            from brainrot.procedural_images import generate_scene_images
+        else:
+            from brainrot.image_generator import generate_scene_images
+
+        image_paths = _timed(
+            "images", lambda: generate_scene_images(script["scenes"], str(assets))
+        )
+    else:
+        assets.mkdir(parents=True, exist_ok=True)
+        png = fake_gemini.canned_png()
+        image_paths = []
+        for scene in script["scenes"]:
+            p = assets / f"scene_{scene['scene_id']}.png"
+            p.write_bytes(png)
+            image_paths.append(str(p))
+
+    tts_paths, transcriptions = [], []
+    for scene in script["scenes"]:
+        p = workdir / "audio" / f"tts_{scene['scene_id']}.wav"
+        _silent_wav(p, len(scene["narration"].split()) / WORDS_PER_SECOND)
+        tts_paths.append(str(p))
+        transcriptions.append(_fake_transcription(scene["narration"]))
+
+    if "render" in stages or "compose" in stages:
+        from brainrot.renderer import render
+
+        media = str(workdir / "media")
+        if "render" in stages:
+            video_path = _timed("render", lambda: render(script, image_paths, media))
+        else:
+            video_path = render(script, image_paths, media)
+
+    if "compose" in stages:
+        from brainrot.compositor import compose
+
+        final = str(workdir / "final_brainrot.mp4")
+        _timed("compose", lambda: compose(video_path, tts_paths, transcriptions, final))
+
+    return timings
+
+
+def compare(new: dict, old: dict) -> str:
+    """Return a table of median changes between two result files."""
+    lines = [f"{'case':<20}  {'old':>8}  {'new':>8}  {'change':>8}"]
+    for case, r in new["results"].items():
+        if case not in old["results"]:
+            continue
+        a, b = old["results"][case]["median_s"], r["median_s"]
+        delta = (b - a) / a * 100 if a else 0.0
+        lines.append(f"{case:<20}  {a:>7.2f}s  {b:>7.2f}s  {delta:>+7.1f}%")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument(
+        "--scenes",
+        type=int,
+        nargs="+",
+        default=[3, 7],
+        help="Scene counts to benchmark (3–50; default: 3 7).",
+    )
+    parser.add_argument(
+        "--stages",
+        nargs="+",
+        choices=STAGES,
+        default=list(STAGES),
+        help="Stages to time (default: all).",
+    )
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per case.")
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="Simulated seconds per Gemini request (default: 0).",
+    )
+    parser.add_argument(
+        "--image-backend",
+        choices=("gemini", "procedural"),
+        default="gemini",
+        help="Image backend for the images stage (default: %(default)s).",
+    )
+    parser.add_argument("--json", metavar="PATH", help="Write results as JSON.")
+    parser.add_argument(
+        "--compare", metavar="PATH", help="Compare against an earlier JSON result."
+    )
+    args = parser.parse_args()
+
+    for n in args.scenes:
+        if not 3 <= n <= 50:
+            parser.error("--scenes values must be between 3 and 50")
+
+    samples: dict[str, list[float]] = {}
+    for n in args.scenes:
+        for i in range(args.repeat):
+            with tempfile.TemporaryDirectory(prefix="brainrot-bench-") as tmp:
+                timings = run_once(
+                    n, args.stages, Path(tmp), args.latency, args.image_backend
+                )
+            for stage, seconds in timings.items():
+                samples.setdefault(f"{stage}/{n}", []).append(seconds)
+                print(f"  {stage:<8} {n:>3} scenes  run {i + 1}: {seconds:.2f}s")
+
+    results = {
+        "commit": _commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "latency": args.latency,
+        "image_backend": args.image_backend,
+        "results": {
+            case: {
+                "median_s": statistics.median(v),
+                "min_s": min(v),
+                "runs": len(v),
+            }
+            for case, v in samples.items()
+        },
+    }
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+        print(f"\nWrote {args.json}")
+    if args.compare:
+        old = json.loads(Path(args.compare).read_text())
+        print(f"\nvs {old.get('commit')} ({args.compare}):")
+        print(compare(results, old))
+
+
+if __name__ == "__main__":
+    main()
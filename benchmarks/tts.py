@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+tts.py — Multi-scene TTS throughput benchmark
+==============================================
+Compares synthesizing a script's narrations one scene at a time (the old
+``synthesize_scenes`` loop) with :func:`brainrot.tts_engine.synthesize_batch`
+on thread replicas and, with ``--processes``, on forked worker pools.
+Needs pocket-tts and its model weights, but no API key: narrations come
+from the offline script generator.
+
+Usage:
+    python benchmarks/tts.py
+    python benchmarks/tts.py --scenes 12 --workers 1 2 4 --json tts.json
+    python benchmarks/tts.py --scenes 32 --processes 1 2 4 8 --threads 2
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from brainrot import tts_engine  # noqa: E402
+from brainrot.offline_script import generate_offline_script  # noqa: E402
+
+
+def _loop(texts: list[str]) -> float:
+    """Synthesize *texts* one call at a time; return seconds of audio."""
+    return sum(tts_engine.synthesize_batch([t], 1)[0].duration for t in texts)
+
+
+def _batch(texts: list[str], workers: int) -> float:
+    clips = tts_engine.synthesize_batch(texts, workers)
+    return sum(buf.duration for buf in clips)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--scenes", type=int, default=8, help="Narrations per run.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=[1, 2, 4],
+        help="Batch worker counts (model replicas) to try (default: 1 2 4).",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        nargs="+",
+        default=[],
+        help="Process-pool sizes to try (Linux; default: none).",
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        help="Torch threads per pool process (default: CPUs / processes).",
+    )
+    parser.add_argument("--repeat", type=int, default=2, help="Runs per case.")
+    parser.add_argument("--json", metavar="PATH", help="Write results as JSON.")
+    args = parser.parse_args()
+
+    texts = [
+        s["narration"]
+        for s in generate_offline_script("TTS benchmark", args.scenes)["scenes"]
+    ]
+    results = {}
+
+    def _run(case, fn):
+        samples = []
+        for i in range(args.repeat):
+            start = time.perf_counter()
+            audio_s = fn()
+            samples.append(time.perf_counter() - start)
+            print(f"  {case:<9} run {i + 1}: {samples[-1]:.2f}s")
+        wall = statistics.median(samples)
+        results[case] = {
+            "median_s": wall,
+            "min_s": min(samples),
+            "audio_s": audio_s,
+            "scenes_per_s": args.scenes / wall,
+            "realtime_factor": audio_s / wall,
+        }
+
+    # Pools fork first: the parent must not have run inference yet.
+    for n in args.processes:
+        pool = tts_engine.start_pool(n, args.threads)
+        pool.map(texts[:n], [tts_engine.VOICE] * n)  # warm-up
+        _run(f"pool/{n}", lambda: _batch(texts, n))
+        tts_engine.stop_pool()
+
+    print(f"Loading model with {max(args.workers)} replicas …")
+    tts_engine.preload(max(args.workers))
+    _loop(texts[:1])  # warm-up
+    _run("loop", lambda: _loop(texts))
+    for w in args.workers:
+        _run(f"batch/{w}", lambda w=w: _batch(texts, w))
+
+    base = results["loop"]["median_s"]
+    results = {"loop": results.pop("loop"), **results}
+    print(f"\n{'case':<9}  {'wall':>7}  {'scenes/s':>8}  {'x realtime':>10}  speedup")
+    for case, r in results.items():
+        print(
+            f"{case:<9}  {r['median_s']:>6.2f}s  {r['scenes_per_s']:>8.2f}  "
+            f"{r['realtime_factor']:>10.2f}  {base / r['median_s']:>6.2f}x"
+        )
+
+    if args.json:
+        Path(args.json).write_text(
+            json.dumps(
+                {
+                    "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "cpus": os.cpu_count(),
+                    "scenes": args.scenes,
+                    "results": results,
+                },
+                indent=2,
+            )
+        )
+        print(f"\nWrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""
+Audio - In-memory audio handed between pipeline stages.
+========================================================
+:class:`AudioBuffer` carries a scene's samples from TTS to transcription and
+compositing without a WAV encode/decode at every hop: the transcriber gets
+a 16 kHz array directly, the compositor an ``AudioArrayClip``.  A buffer
+is written to disk only when something asks for it (:meth:`AudioBuffer.save`).
+
+A buffer can be moved into shared memory (:meth:`AudioBuffer.share`), after
+which pickling it — e.g. to return it from a worker process — sends only the
+segment's name, not the samples.
+
+WAVs are always 16-bit mono PCM, written with :class:`WavWriter`.
+"""
+
+import hashlib
+import io
+import os
+import sys
+import wave
+from pathlib import Path
+
+import numpy as np
+
+
+def _pcm16(samples: np.ndarray) -> bytes:
+    """Float samples in [-1, 1] as little-endian 16-bit PCM."""
+    return (np.clip(samples, -1.0, 1.0) * 32767.0).astype("<i2").tobytes()
+
+
+class WavWriter:
+    """
+    A 16-bit mono WAV opened for appending.  The header is patched and the
+    file flushed after every :meth:`append`, so readers always see a valid
+    (if growing) file.
+
+    Args:
+        target: Path or binary file object to write to.
+        sample_rate: Samples per second.
+    """
+
+    def __init__(self, target, sample_rate: int):
+        if isinstance(target, (str, os.PathLike)):
+            Path(target).parent.mkdir(parents=True, exist_ok=True)
+            self._file, self._owned = open(target, "wb"), True
+        else:
+            self._file, self._owned = target, False
+        self._wav = wave.open(self._file, "wb")
+        self._wav.setnchannels(1)
+        self._wav.setsampwidth(2)
+        self._wav.setframerate(sample_rate)
+
+    def append(self, samples: np.ndarray):
+        self._wav.writeframes(_pcm16(samples))
+        self._file.flush()
+
+    def close(self):
+        self._wav.close()
+        if self._owned:
+            self._file.close()
+
+
+class AudioBuffer:
+    """
+    Mono float32 samples plus their sample rate.
+
+    Args:
+        samples: 1-D array of samples in [-1, 1].
+        sample_rate: Samples per second.
+        path: WAV file holding the same audio, if it has been saved.
+    """
+
+    def __init__(self, samples: np.ndarray, sample_rate: int, path: str | None = None):
+        self.samples = np.asarray(samples, dtype=np.float32).reshape(-1)
+        self.sample_rate = int(sample_rate)
+        self.path = path
+        self._wav: bytes | None = None
+        self._shm = None
+        self._owner = False
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    @property
+    def duration(self) -> float:
+        """Length in seconds."""
+        return len(self.samples) / self.sample_rate
+
+    # ----------------------------------------------------------
+    @classmethod
+    def from_wav_bytes(cls, data: bytes, path: str | None = None) -> "AudioBuffer":
+        """
+        Decode a 16-bit mono WAV.
+
+        Raises:
+            ValueError: If *data* is not 16-bit mono PCM.
+        """
+        try:
+            with wave.open(io.BytesIO(data)) as w:
+                if w.getnchannels() != 1 or w.getsampwidth() != 2:
+                    raise ValueError("expected 16-bit mono PCM")
+                rate = w.getframerate()
+                pcm = np.frombuffer(w.readframes(w.getnframes()), dtype="<i2")
+        except (wave.Error, EOFError) as exc:
+            raise ValueError(f"Unreadable WAV: {exc}") from exc
+        buf = cls(pcm / np.float32(32767.0), rate, path)
+        buf._wav = data
+        return buf
+
+    @classmethod
+    def from_file(cls, path: str) -> "AudioBuffer":
+        """Read a 16-bit mono WAV file."""
+        return cls.from_wav_bytes(Path(path).read_bytes(), os.path.abspath(path))
+
+    def wav_bytes(self) -> bytes:
+        """The audio encoded as a 16-bit mono WAV (computed once)."""
+        if self._wav is None:
+            out = io.BytesIO()
+            writer = WavWriter(out, self.sample_rate)
+            writer.append(self.samples)
+            writer.close()
+            self._wav = out.getvalue()
+        return self._wav
+
+    def digest(self) -> str:
+        """
+        SHA-256 of :meth:`wav_bytes` — equal to
+        :func:`~brainrot.cache.hash_file` of the saved file, so cache keys
+        do not depend on whether the audio was ever written.
+        """
+        return hashlib.sha256(self.wav_bytes()).hexdigest()
+
+    def save(self, path: str) -> str:
+        """Write the audio to *path* as a WAV and remember it as :attr:`path`."""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        Path(path).write_bytes(self.wav_bytes())
+        self.path = os.path.abspath(path)
+        return self.path
+
+    def resampled(self, sample_rate: int) -> "AudioBuffer":
+        """Return the audio at *sample_rate* (band-limited FFT resampling)."""
+        if sample_rate == self.sample_rate or not len(self.samples):
+            return self
+        n = len(self.samples)
+        m = max(1, round(n * sample_rate / self.sample_rate))
+        spectrum = np.fft.rfft(self.samples)
+        out = np.zeros(m // 2 + 1, dtype=spectrum.dtype)
+        keep = min(len(spectrum), len(out))
+        out[:keep] = spectrum[:keep]
+        samples = np.fft.irfft(out, m) * (m / n)
+        return AudioBuffer(samples, sample_rate)
+
+    # ----------------------------------------------------------
+    def share(self) -> "AudioBuffer":
+        """
+        Return a copy backed by a new shared-memory segment.  The returned
+        buffer owns the segment; call :meth:`release` when done with it.
+
+        Ownership travels with the pickle: the unpickled copy owns the
+        segment and must be released, so pickle an owning buffer only once.
+        """
+        from multiprocessing import shared_memory
+
+        shm = shared_memory.SharedMemory(create=True, size=max(1, self.samples.nbytes))
+        samples = np.ndarray(self.samples.shape, np.float32, buffer=shm.buf)
+        samples[:] = self.samples
+        buf = AudioBuffer(samples, self.sample_rate, self.path)
+        buf._shm, buf._owner = shm, True
+        return buf
+
+    def release(self):
+        """
+        Copy the samples out of shared memory and detach, freeing the
+        segment if this buffer owns it.
+        """
+        if self._shm is None:
+            return
+        self.samples = self.samples.copy()
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+        self._shm, self._owner = None, False
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        if self._shm is not None:
+            # Send the segment name; the receiver maps the same pages.
+            state.update(samples=len(self.samples), _wav=None, _shm=self._shm.name)
+            self._owner = False
+        return state
+
+    def __setstate__(self, state: dict):
+        name = state["_shm"]
+        if name is not None:
+            from multiprocessing import shared_memory
+
+            if sys.version_info >= (3, 13) and not state["_owner"]:
+                # Only the owner may unlink the segment.
+                shm = shared_memory.SharedMemory(name=name, track=False)
+            else:
+                # The creating process registered the segment with the
+                # resource tracker it shares with this one (see
+                # :class:`~brainrot.tts_engine.TTSPool`); registering again
+                # is a no-op, and unlinking unregisters it.
+                shm = shared_memory.SharedMemory(name=name)
+            state.update(
+                samples=np.ndarray(state["samples"], np.float32, buffer=shm.buf),
+                _shm=shm,
+            )
+        self.__dict__.update(state)
@@ -0,0 +1,290 @@
+"""
+Cache - Content-addressed artifact store with LRU eviction.
+============================================================
+Stage outputs (script JSON, scene images, TTS WAVs, transcriptions, rendered
+MP4s) are stored under a key derived from everything that went into them —
+inputs plus model/version constants — so a re-run only redoes the stages
+whose inputs actually changed.  The store is capped by total size; the least
+recently used entries are evicted first.
+
+:class:`SingleFlight` complements the cache for concurrent callers: the
+first caller for a key does the work and everyone else asking for the same
+key meanwhile waits for (and shares) that result.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import weakref
+from concurrent.futures import Future
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Awaitable, Callable
+
+if TYPE_CHECKING:
+    import asyncio
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+DEFAULT_MAX_BYTES = 5 * 1024**3  # 5 GiB
+
+_CHUNK = 1 << 20
+
+
+def cache_key(*parts: Any) -> str:
+    """
+    Return a stable hex digest for *parts*.
+
+    Parts may be any JSON-serialisable values; dict keys are sorted so the
+    key does not depend on insertion order.
+    """
+    blob = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def _to_builtin(obj: Any) -> Any:
+    """JSON fallback for NumPy scalars/arrays found in model outputs."""
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    if hasattr(obj, "item"):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serialisable")
+
+
+def hash_file(path: str) -> str:
+    """Return the SHA-256 hex digest of a file's contents."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class ArtifactCache:
+    """
+    A directory of immutable blobs addressed by :func:`cache_key` digests.
+
+    Entries are plain files; an entry's mtime doubles as its last-access
+    time, so LRU order survives across processes without an index file.
+
+    The total size is scanned once and then tracked across writes, so the
+    directory is only walked again when a write takes it over ``max_bytes``.
+    Writes by other processes are picked up at that scan.
+    """
+
+    def __init__(self, root: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._size: int | None = None  # tracked total; None until scanned
+
+    # ----------------------------------------------------------
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / key
+
+    def _touch(self, path: Path):
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+
+    def _write_atomic(self, key: str, write) -> Path:
+        dest = self._path(key)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=dest.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                write(f)
+                written = f.tell()
+            try:
+                replaced = dest.stat().st_size
+            except FileNotFoundError:
+                replaced = 0
+            os.replace(tmp, dest)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        with self._lock:
+            if self._size is None:
+                self._size = self.size()  # includes this write
+            else:
+                self._size += written - replaced
+            over = self._size > self.max_bytes
+        if over:
+            self.evict()
+        return dest
+
+    # ----------------------------------------------------------
+    def has(self, key: str) -> bool:
+        """Return True if an entry exists for *key*."""
+        return self._path(key).exists()
+
+    def fetch(self, key: str, dest: str) -> str | None:
+        """
+        Copy the entry for *key* to *dest*.
+
+        Returns:
+            The absolute destination path, or None on a cache miss.
+        """
+        src = self._path(key)
+        if not src.exists():
+            return None
+        Path(dest).parent.mkdir(parents=True, exist_ok=True)
+        try:
+            shutil.copyfile(src, dest)
+        except FileNotFoundError:  # evicted concurrently
+            return None
+        self._touch(src)
+        return os.path.abspath(dest)
+
+    def store(self, key: str, src: str) -> None:
+        """Copy the file at *src* into the cache under *key*."""
+        with open(src, "rb") as f_in:
+            self._write_atomic(key, lambda f_out: shutil.copyfileobj(f_in, f_out))
+
+    def load_bytes(self, key: str) -> bytes | None:
+        """Return the raw bytes stored under *key*, or None on a miss."""
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        self._touch(path)
+        return data
+
+    def save_bytes(self, key: str, data: bytes) -> None:
+        """Store raw *data* under *key*."""
+        self._write_atomic(key, lambda f: f.write(data))
+
+    def load_json(self, key: str) -> Any | None:
+        """Return the JSON value stored under *key*, or None on a miss."""
+        path = self._path(key)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        self._touch(path)
+        return data
+
+    def save_json(self, key: str, value: Any) -> None:
+        """Store a JSON-serialisable *value* under *key*."""
+        blob = json.dumps(value, ensure_ascii=False, default=_to_builtin)
+        blob = blob.encode("utf-8")
+        self._write_atomic(key, lambda f: f.write(blob))
+
+    # ----------------------------------------------------------
+    def size(self) -> int:
+        """Return the total size of all entries in bytes."""
+        return sum(p.stat().st_size for p in self._entries())
+
+    def _entries(self):
+        for sub in self.root.iterdir():
+            if sub.is_dir():
+                for p in sub.iterdir():
+                    if not p.name.startswith(".tmp-"):
+                        yield p
+
+    def evict(self) -> int:
+        """
+        Delete least-recently-used entries until the cache fits in
+        ``max_bytes``.
+
+        Returns:
+            Number of bytes freed.
+        """
+        with self._lock:
+            entries = []
+            total = 0
+            for p in self._entries():
+                try:
+                    st = p.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, p))
+                total += st.st_size
+
+            freed = 0
+            entries.sort()
+            for _, size, p in entries:
+                if total - freed <= self.max_bytes:
+                    break
+                try:
+                    p.unlink()
+                except FileNotFoundError:
+                    continue
+                freed += size
+            self._size = total - freed
+            return freed
+
+
+class SingleFlight:
+    """
+    Collapse concurrent calls for the same key into one.
+
+    While a call for a key is in flight, further callers with that key block
+    until it finishes and receive its result (or exception) instead of
+    repeating the work.  Nothing is remembered once the call completes —
+    pair it with :class:`ArtifactCache` for persistence.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[str, Future] = {}
+        # In-flight tasks per event loop: a task can only be awaited on the
+        # loop that runs it.
+        self._tasks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self.shared = 0  # callers served by someone else's request
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Return ``fn()``, sharing one in-flight call per *key* across threads."""
+        with self._lock:
+            fut = self._calls.get(key)
+            leader = fut is None
+            if leader:
+                fut = self._calls[key] = Future()
+            else:
+                self.shared += 1
+        if not leader:
+            return fut.result()
+
+        try:
+            result = fn()
+        except BaseException as exc:
+            fut.set_exception(exc)
+            raise
+        else:
+            fut.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    async def ado(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Async variant of :meth:`do`, sharing one in-flight call per *key*
+        among callers on the same event loop.
+        """
+        # Imported here so the CLI does not pay for asyncio at start-up.
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            tasks = self._tasks.setdefault(loop, {})
+            task = tasks.get(key)
+            if task is None:
+                task = tasks[key] = loop.create_task(fn())
+                task.add_done_callback(lambda _: self._forget(tasks, key))
+            else:
+                self.shared += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, tasks: dict, key: str):
+        with self._lock:
+            tasks.pop(key, None)
@@ -3,24 +3,31 @@ Compositor - Assembles final video with audio, captions, and speed-up.
 ======================================================================
 Combines the rendered Manim video with TTS audio and word-level captions
 from MLX-Whisper transcription, then exports the final brainrot video.
+TTS audio may be given as WAV paths or as in-memory
+:class:`~brainrot.audio.AudioBuffer` objects (used without re-decoding).
 """
 
 import os
 from pathlib import Path
 
 from moviepy import (
+    AudioArrayClip,
     AudioFileClip,
     CompositeAudioClip,
     TextClip,
     CompositeVideoClip,
     VideoFileClip,
     concatenate_audioclips,
+    concatenate_videoclips,
 )
 
+from brainrot.audio import AudioBuffer
+from brainrot.tracing import file_size, span
+
 
 def compose(
     video_path: str,
-    tts_paths: list[str],
+    tts_paths: list[str | AudioBuffer],
     transcriptions: list[dict],
     output_path: str,
     speed: float = 1.35,
@@ -37,7 +44,7 @@ def compose(
 
     Args:
         video_path: Path to the rendered Manim MP4.
-        tts_paths: Ordered list of TTS WAV files (one per scene).
+        tts_paths: Ordered TTS WAV files or buffers (one per scene).
         transcriptions: Ordered list of mlx-whisper result dicts.
         output_path: Destination for the final MP4.
         speed: Playback speed multiplier (default 1.35×).
@@ -49,11 +56,53 @@ def compose(
 
     # -- Load video --
     video = VideoFileClip(video_path)
+    return _export(video, tts_paths, output_path, speed)
+
+
+def compose_segments(
+    segment_paths: list[str],
+    tts_paths: list[str | AudioBuffer],
+    transcriptions: list[dict],
+    output_path: str,
+    speed: float = 1.35,
+) -> str:
+    """
+    Stitch per-scene Manim segments and compose the final brainrot video.
+
+    Identical to :func:`compose` except that the video track is the
+    concatenation of *segment_paths* (in order) instead of a single render.
+
+    Args:
+        segment_paths: Ordered list of rendered segment MP4s.
+        tts_paths: Ordered TTS WAV files or buffers (one per scene).
+        transcriptions: Ordered list of mlx-whisper result dicts.
+        output_path: Destination for the final MP4.
+        speed: Playback speed multiplier (default 1.35×).
 
+    Returns:
+        Absolute path of the exported video.
+    """
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+
+    segments = [VideoFileClip(p) for p in segment_paths]
+    video = concatenate_videoclips(segments)
+    try:
+        return _export(video, tts_paths, output_path, speed)
+    finally:
+        for clip in segments:
+            clip.close()
+
+
+def _export(
+    video, tts_paths: list[str | AudioBuffer], output_path: str, speed: float
+) -> str:
+    """Overlay TTS audio, apply the speed-up and write *video* to disk."""
     # -- Build composite audio from TTS clips --
-    audio_clips: list[AudioFileClip] = []
+    audio_clips = []
     for p in tts_paths:
-        if os.path.exists(p):
+        if isinstance(p, AudioBuffer):
+            audio_clips.append(AudioArrayClip(p.samples[:, None], fps=p.sample_rate))
+        elif os.path.exists(p):
             audio_clips.append(AudioFileClip(p))
 
     if audio_clips:
@@ -68,14 +117,16 @@ def compose(
         video = video.with_speed_scaled(speed)
 
     # -- Export --
-    video.write_videofile(
-        output_path,
-        codec="libx264",
-        audio_codec="aac",
-        fps=30,
-        preset="fast",
-        threads=8,  # leverage M2 cores
-    )
+    with span("moviepy.encode", cat="compose") as info:
+        video.write_videofile(
+            output_path,
+            codec="libx264",
+            audio_codec="aac",
+            fps=30,
+            preset="fast",
+            threads=8,  # leverage M2 cores
+        )
+        info["bytes"] = file_size(output_path)
 
     video.close()
     return os.path.abspath(output_path)
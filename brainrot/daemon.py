@@ -0,0 +1,240 @@
+"""
+Daemon - Long-running render server with a local job queue.
+============================================================
+Keeps the heavy models (pocket-tts, Whisper, Manim/MoviePy imports, the
+Gemini client) warm in one process and accepts jobs over localhost HTTP, so
+short videos no longer pay the cold-start cost on every run.
+
+Endpoints (JSON in, JSON out)::
+
+    POST /jobs        {"topic": "..."} | {"script": {...}} | {"random": true}
+    GET  /jobs        every job, newest first
+    GET  /jobs/<id>   status, timings and final video path of one job
+    GET  /health      liveness probe
+"""
+
+import json
+import queue
+import threading
+import time
+import uuid
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable
+
+from brainrot.script_writer import validate_script
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+_MAX_BODY = 1 << 20
+
+
+def validate_spec(spec: Any) -> dict:
+    """
+    Check a job request body.
+
+    Returns:
+        The spec, unchanged.
+
+    Raises:
+        ValueError: If it does not name exactly one of ``topic``, ``script``
+            or ``random``, or the script does not match the script schema.
+    """
+    if not isinstance(spec, dict):
+        raise ValueError("job spec must be a JSON object")
+    kinds = [k for k in ("topic", "script", "random") if spec.get(k)]
+    if len(kinds) != 1:
+        raise ValueError("job spec needs exactly one of 'topic', 'script', 'random'")
+    if "topic" in kinds and not isinstance(spec["topic"], str):
+        raise ValueError("'topic' must be a string")
+    if "script" in kinds:
+        problems = validate_script(spec["script"])
+        if problems:
+            raise ValueError("invalid 'script': " + "; ".join(problems))
+    return spec
+
+
+class JobQueue:
+    """
+    FIFO job queue drained by long-lived worker threads.
+
+    *run_job* is called as ``run_job(job_id, spec)`` and must return the
+    final video path; anything it raises marks the job as failed.
+    """
+
+    def __init__(self, run_job: Callable[[str, dict], str], workers: int = 1):
+        self._run_job = run_job
+        self._queue: queue.Queue[str | None] = queue.Queue()
+        self._jobs: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._threads = [
+            threading.Thread(target=self._worker, name=f"job-worker-{i}", daemon=True)
+            for i in range(max(1, workers))
+        ]
+
+    def start(self):
+        """Start the worker threads."""
+        for t in self._threads:
+            t.start()
+
+    def stop(self):
+        """
+        Let workers finish their current job and exit.  Jobs still queued
+        are not started; they are marked ``cancelled``.
+        """
+        while True:
+            try:
+                job_id = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if job_id is not None:
+                self._update(job_id, status="cancelled", finished=time.time())
+        for _ in self._threads:
+            self._queue.put(None)
+        for t in self._threads:
+            t.join()
+
+    def submit(self, spec: dict) -> dict:
+        """Validate and enqueue a job; return its status record."""
+        validate_spec(spec)
+        job_id = uuid.uuid4().hex[:12]
+        job = {
+            "id": job_id,
+            "status": "queued",
+            "spec": spec,
+            "created": time.time(),
+            "started": None,
+            "finished": None,
+            "result": None,
+            "error": None,
+        }
+        with self._lock:
+            self._jobs[job_id] = job
+        self._queue.put(job_id)
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> dict | None:
+        """Return a snapshot of one job's status record."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            snapshot = dict(job)
+        snapshot["queue_position"] = self._position(job_id)
+        return snapshot
+
+    def list(self) -> list[dict]:
+        """Return every job, newest first."""
+        with self._lock:
+            ids = sorted(self._jobs, key=lambda j: -self._jobs[j]["created"])
+        return [self.get(j) for j in ids]
+
+    def _position(self, job_id: str) -> int | None:
+        with self._queue.mutex:
+            pending = list(self._queue.queue)
+        return pending.index(job_id) + 1 if job_id in pending else None
+
+    def _update(self, job_id: str, **fields):
+        with self._lock:
+            self._jobs[job_id].update(fields)
+
+    def _worker(self):
+        while True:
+            job_id = self._queue.get()
+            if job_id is None:
+                return
+            self._update(job_id, status="running", started=time.time())
+            spec = self._jobs[job_id]["spec"]
+            try:
+                result = self._run_job(job_id, spec)
+            except Exception as exc:
+                self._update(
+                    job_id, status="failed", error=repr(exc), finished=time.time()
+                )
+                print(f"\n❌ Job {job_id} failed: {exc}")
+            else:
+                self._update(
+                    job_id, status="done", result=result, finished=time.time()
+                )
+                print(f"\n✅ Job {job_id} done: {result}")
+
+
+def _make_handler(jobs: JobQueue):
+    """Return a request handler class bound to *jobs*."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, status: HTTPStatus, body: Any):
+            data = json.dumps(body, default=str).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            path = self.path.rstrip("/")
+            if path == "/health":
+                self._send(HTTPStatus.OK, {"status": "ok"})
+            elif path == "/jobs":
+                self._send(HTTPStatus.OK, jobs.list())
+            elif path.startswith("/jobs/"):
+                job = jobs.get(path.split("/", 2)[2])
+                if job is None:
+                    self._send(HTTPStatus.NOT_FOUND, {"error": "unknown job"})
+                else:
+                    self._send(HTTPStatus.OK, job)
+            else:
+                self._send(HTTPStatus.NOT_FOUND, {"error": "not found"})
+
+        def do_POST(self):
+            if self.path.rstrip("/") != "/jobs":
+                self._send(HTTPStatus.NOT_FOUND, {"error": "not found"})
+                return
+            length = int(self.headers.get("Content-Length") or 0)
+            if length > _MAX_BODY:
+                self._send(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "too large"})
+                return
+            try:
+                spec = json.loads(self.rfile.read(length) or b"null")
+                job = jobs.submit(spec)
+            except (json.JSONDecodeError, ValueError) as exc:
+                self._send(HTTPStatus.BAD_REQUEST, {"error": str(exc)})
+                return
+            self._send(HTTPStatus.ACCEPTED, job)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def serve(
+    run_job: Callable[[str, dict], str],
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    workers: int = 1,
+):
+    """
+    Run the job server until interrupted.
+
+    Args:
+        run_job: Callable executing one job (see :class:`JobQueue`).
+        host: Interface to bind; keep it on localhost, there is no auth.
+        port: TCP port to listen on.
+        workers: Number of jobs processed concurrently.
+    """
+    jobs = JobQueue(run_job, workers)
+    jobs.start()
+    server = ThreadingHTTPServer((host, port), _make_handler(jobs))
+    print(f"\n🛰  Brainrot daemon listening on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Shutting down …")
+    finally:
+        server.server_close()
+        jobs.stop()
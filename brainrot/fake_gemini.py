@@ -0,0 +1,202 @@
+"""
+Fake Gemini - Offline stand-in for the Gemini client.
+======================================================
+Implements just enough of ``genai.Client`` for the script writer and image
+generator: ``client.models.generate_content`` (and its async twin under
+``client.aio``) returns canned script JSON or a canned PNG, with an optional
+simulated network latency.  Scripts come from the offline template
+generator (:mod:`brainrot.offline_script`).  ``generate_content_stream``
+yields the script text in small chunks, spreading the latency across them,
+and requests constrained to the single-scene or outline schema get one
+scene or a long-form outline back.  ``client.caches`` emulates context
+caching, and text responses report (estimated) prompt and cached token
+counts.  Install it with :func:`install` to run or benchmark the pipeline
+without an API key.
+"""
+
+import asyncio
+import json
+import re
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from brainrot.gemini import set_client
+from brainrot.offline_script import generate_offline_script
+from brainrot.procedural_images import png_bytes
+
+# ---------------------------------------------------------------------------
+# Synthetic content
+# ---------------------------------------------------------------------------
+def canned_png(width: int = 1080, height: int = 1920) -> bytes:
+    """Return a PNG (dark vertical gradient) of the given size."""
+    v = 10 + (np.arange(height) * 60) // height
+    column = np.stack([v, np.zeros_like(v), v * 2], axis=1).astype(np.uint8)
+    return png_bytes(np.broadcast_to(column[:, None, :], (height, width, 3)))
+
+
+# ---------------------------------------------------------------------------
+# Client stand-in
+# ---------------------------------------------------------------------------
+STREAM_CHUNK = 64  # characters per streamed response chunk
+
+
+def _response(parts: list, text: str | None = None, usage=None):
+    return SimpleNamespace(
+        text=text,
+        candidates=[SimpleNamespace(content=SimpleNamespace(parts=parts))],
+        usage_metadata=usage,
+    )
+
+
+def _tokens(text) -> int:
+    """Rough token estimate (~4 characters per token)."""
+    return len(str(text or "")) // 4
+
+
+def _usage(owner: "FakeClient", contents, config):
+    name = getattr(config, "cached_content", None)
+    if name and name not in owner.contexts:
+        raise ValueError(f"404 NOT_FOUND: CachedContent {name} not found")
+    cached = owner.contexts.get(name, 0)
+    prompt = _tokens(contents) + _tokens(getattr(config, "system_instruction", None))
+    return SimpleNamespace(
+        prompt_token_count=prompt + cached, cached_content_token_count=cached
+    )
+
+
+def _respond(owner: "FakeClient", model: str, contents, config):
+    """Build the canned response for one request."""
+    owner.calls.append({"model": model, "contents": contents, "config": config})
+    usage = _usage(owner, contents, config)
+
+    modalities = getattr(config, "response_modalities", None) or []
+    if any(m.lower() == "image" for m in modalities):
+        blob = SimpleNamespace(mime_type="image/png", data=owner.png)
+        return _response([SimpleNamespace(text=None, inline_data=blob)])
+
+    prompt = contents if isinstance(contents, str) else str(contents)
+    schema = getattr(config, "response_schema", None) or {}
+    if "narration" in schema.get("properties", {}):
+        # A single-scene repair request.
+        scene = generate_offline_script(prompt, 1, owner.seed)["scenes"][0]
+        text = json.dumps(scene)
+        return _response(
+            [SimpleNamespace(text=text, inline_data=None)], text=text, usage=usage
+        )
+
+    if "acts" in schema.get("properties", {}):
+        # A long-form outline request.
+        n_acts = int(re.search(r"(\d+)-act", prompt).group(1))
+        topic = prompt.split(":", 1)[-1].strip()
+        outline = {
+            "title": topic,
+            "acts": [
+                {"summary": f"Act {i} of {topic}", "beats": ["setup", "twist"]}
+                for i in range(1, n_acts + 1)
+            ],
+        }
+        text = json.dumps(outline)
+        return _response(
+            [SimpleNamespace(text=text, inline_data=None)], text=text, usage=usage
+        )
+
+    # Long-form act requests ask for an exact scene count.
+    wanted = re.search(r"exactly (\d+) scenes", prompt)
+    n_scenes = int(wanted.group(1)) if wanted else owner.n_scenes
+    topic = prompt.split(":", 1)[-1].strip()
+    script = generate_offline_script(topic, n_scenes, owner.seed)
+    text = "```json\n" + json.dumps(script, indent=2) + "\n```"
+    return _response(
+        [SimpleNamespace(text=text, inline_data=None)], text=text, usage=usage
+    )
+
+
+class _FakeModels:
+    def __init__(self, owner: "FakeClient"):
+        self._owner = owner
+
+    def generate_content(self, *, model: str, contents, config=None):
+        if self._owner.latency:
+            time.sleep(self._owner.latency)
+        return _respond(self._owner, model, contents, config)
+
+    def generate_content_stream(self, *, model: str, contents, config=None):
+        full = _respond(self._owner, model, contents, config)
+        text = full.text
+        pieces = [text[i : i + STREAM_CHUNK] for i in range(0, len(text), STREAM_CHUNK)]
+        for n, piece in enumerate(pieces, 1):
+            if self._owner.latency:
+                time.sleep(self._owner.latency / len(pieces))
+            usage = full.usage_metadata if n == len(pieces) else None
+            yield _response(
+                [SimpleNamespace(text=piece, inline_data=None)], text=piece, usage=usage
+            )
+
+
+class _FakeAsyncModels:
+    def __init__(self, owner: "FakeClient"):
+        self._owner = owner
+
+    async def generate_content(self, *, model: str, contents, config=None):
+        if self._owner.latency:
+            await asyncio.sleep(self._owner.latency)
+        return _respond(self._owner, model, contents, config)
+
+
+class _FakeCaches:
+    def __init__(self, owner: "FakeClient"):
+        self._owner = owner
+
+    def create(self, *, model: str, config=None):
+        if not self._owner.context_cache:
+            raise ValueError("Cached content is not supported by this client")
+        name = f"cachedContents/fake-{len(self._owner.contexts) + 1}"
+        tokens = _tokens(getattr(config, "system_instruction", None))
+        self._owner.contexts[name] = tokens
+        return SimpleNamespace(
+            name=name,
+            model=model,
+            usage_metadata=SimpleNamespace(total_token_count=tokens),
+        )
+
+
+class FakeClient:
+    """
+    Minimal offline ``genai.Client`` replacement.
+
+    Args:
+        latency: Seconds to sleep per request, to emulate network time.
+        n_scenes: Number of scenes in generated scripts.
+        seed: Seed for generated scripts.
+        png_size: ``(width, height)`` of returned images.
+        context_cache: Whether ``caches.create`` succeeds; False emulates a
+            model or prompt that cannot be cached.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        n_scenes: int = 6,
+        seed: int = 0,
+        png_size: tuple[int, int] = (1080, 1920),
+        context_cache: bool = True,
+    ):
+        self.latency = latency
+        self.n_scenes = n_scenes
+        self.seed = seed
+        self.png = canned_png(*png_size)
+        self.context_cache = context_cache
+        self.contexts: dict[str, int] = {}
+        self.calls: list[dict] = []
+        self.models = _FakeModels(self)
+        self.aio = SimpleNamespace(models=_FakeAsyncModels(self))
+        self.caches = _FakeCaches(self)
+
+
+def install(**kwargs) -> FakeClient:
+    """Create a :class:`FakeClient` and make it the process-wide client."""
+    client = FakeClient(**kwargs)
+    set_client(client)
+    return client
@@ -0,0 +1,285 @@
+"""
+Gemini - Shared, pooled Gemini client.
+=======================================
+One ``genai.Client`` per process, created on first use and shared by the
+script writer and image generator so batch runs reuse the same client (and
+its kept-alive HTTP connections) instead of building a new one for every
+request.  The client's sync and async (``client.aio``) transports are both
+given a connection pool large enough for bulk jobs to keep many requests in
+flight.  Async requests all run on one process-wide event loop
+(:func:`run`), since the async transport's connections belong to the loop
+that opened them.
+
+Long, static system instructions can be uploaded once as a context cache
+(:func:`context_config`) and referenced by handle on every request instead
+of being resent.  Prompt-token and latency figures for cached and inline
+requests are collected for the run summary (:func:`usage_summary`); the
+totals are process-wide, so each run snapshots them (:func:`usage_snapshot`)
+and reports only what was added since.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from typing import TYPE_CHECKING
+
+from brainrot.cache import SingleFlight
+
+if TYPE_CHECKING:
+    import asyncio
+
+    from google import genai
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+MAX_CONNECTIONS = 64
+KEEPALIVE_SECONDS = 60.0
+
+CONTEXT_CACHE_TTL = 3600  # seconds a cached system instruction lives
+CONTEXT_CACHE_MARGIN = 300  # recreate this long before it expires
+CONTEXT_RETRY_SECONDS = 600  # wait before retrying a failed cache creation
+
+_client: "genai.Client | None" = None
+_client_lock = threading.Lock()
+
+_loop: "asyncio.AbstractEventLoop | None" = None
+_loop_lock = threading.Lock()
+
+# (model, instruction digest) -> (cache name or None, monotonic deadline)
+_contexts: dict[tuple[str, str], tuple[str | None, float]] = {}
+_context_lock = threading.Lock()
+_context_flight = SingleFlight()
+
+_usage = {
+    mode: {"requests": 0, "seconds": 0.0, "prompt_tokens": 0, "cached_tokens": 0}
+    for mode in ("cached", "inline")
+}
+_usage_lock = threading.Lock()
+
+
+def _http_options():
+    """
+    Return ``HttpOptions`` sizing the sync and async connection pools, or
+    None on google-genai versions that do not accept transport arguments.
+    """
+    import httpx
+    from google.genai import types
+
+    limits = httpx.Limits(
+        max_connections=MAX_CONNECTIONS,
+        max_keepalive_connections=MAX_CONNECTIONS,
+        keepalive_expiry=KEEPALIVE_SECONDS,
+    )
+    try:
+        return types.HttpOptions(
+            client_args={"limits": limits},
+            async_client_args={"limits": limits},
+        )
+    except (TypeError, ValueError):
+        return None
+
+
+def get_client() -> "genai.Client":
+    """Return the process-wide Gemini client, creating it on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                api_key = os.environ.get("GEMINI_API_KEY")
+                if not api_key:
+                    raise EnvironmentError(
+                        "GEMINI_API_KEY environment variable is required. "
+                        "Get one at https://ai.google.dev/"
+                    )
+                from google import genai  # heavy; only on first use
+
+                options = _http_options()
+                if options is None:
+                    _client = genai.Client(api_key=api_key)
+                else:
+                    _client = genai.Client(api_key=api_key, http_options=options)
+    return _client
+
+
+def set_client(client) -> None:
+    """
+    Install *client* as the process-wide client.
+
+    Used to swap in a local stand-in (see :mod:`brainrot.fake_gemini`) for
+    benchmarks and tests; pass None to go back to a real client.
+    """
+    global _client
+    with _client_lock:
+        _client = client
+    with _context_lock:
+        _contexts.clear()
+
+
+def run(coro):
+    """
+    Run *coro* on the process-wide event loop and return its result,
+    blocking the calling thread (which must not be that loop's) until done.
+
+    The loop is started on first use in a daemon thread.  Sharing it lets
+    every caller's async requests reuse the same kept-alive connections.
+    """
+    global _loop
+    # Imported here: generate.py loads this module at start-up for the
+    # usage summary, and most runs never touch the async transport.
+    import asyncio
+
+    with _loop_lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_loop.run_forever, name="gemini-loop", daemon=True
+            ).start()
+        loop = _loop
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+
+# ---------------------------------------------------------------------------
+# Context caching
+# ---------------------------------------------------------------------------
+def _context_key(model: str, system_instruction: str) -> tuple[str, str]:
+    return model, hashlib.sha256(system_instruction.encode()).hexdigest()
+
+
+def cached_context(model: str, system_instruction: str) -> str | None:
+    """
+    Return the name of a context cache holding *system_instruction* for
+    *model*, creating (or renewing) it when needed.
+
+    Returns None when context caching is unavailable — the instruction is
+    below the model's minimum cacheable size, the model or client does not
+    support it, or creation failed recently — so callers send the
+    instruction inline instead.
+    """
+    key = _context_key(model, system_instruction)
+    with _context_lock:
+        name, deadline = _contexts.get(key, (None, 0.0))
+        if time.monotonic() < deadline:
+            return name
+    # Create outside the lock (it is a network call); callers needing the
+    # same context wait for one creation instead of each making their own.
+    return _context_flight.do(
+        "\0".join(key), lambda: _create_context(key, system_instruction)
+    )
+
+
+def _create_context(key: tuple[str, str], system_instruction: str) -> str | None:
+    """Create the context cache for *key* and publish its handle."""
+    with _context_lock:
+        # Another caller may have published one since we last looked.
+        name, deadline = _contexts.get(key, (None, 0.0))
+        if time.monotonic() < deadline:
+            return name
+    client = get_client()
+    try:
+        from google.genai import types
+
+        cache = client.caches.create(
+            model=key[0],
+            config=types.CreateCachedContentConfig(
+                system_instruction=system_instruction,
+                ttl=f"{CONTEXT_CACHE_TTL}s",
+            ),
+        )
+    except Exception as exc:
+        print(f"  Context cache unavailable ({exc}); sending prompt inline")
+        name, deadline = None, time.monotonic() + CONTEXT_RETRY_SECONDS
+    else:
+        name = cache.name
+        deadline = time.monotonic() + CONTEXT_CACHE_TTL - CONTEXT_CACHE_MARGIN
+    with _context_lock:
+        _contexts[key] = (name, deadline)
+    return name
+
+
+def drop_context(model: str, system_instruction: str):
+    """Forget the cache handle for *system_instruction* (e.g. it expired)."""
+    with _context_lock:
+        _contexts.pop(_context_key(model, system_instruction), None)
+
+
+def context_config(model: str, system_instruction: str) -> dict:
+    """
+    Return ``GenerateContentConfig`` keyword arguments that supply
+    *system_instruction*: a ``cached_content`` handle when one is available,
+    else the instruction itself.
+    """
+    name = cached_context(model, system_instruction)
+    if name:
+        return {"cached_content": name}
+    return {"system_instruction": system_instruction}
+
+
+def record_usage(response, config, seconds: float, info: dict | None = None):
+    """
+    Add one request's prompt tokens and latency to the usage totals.
+
+    Args:
+        response: The ``generate_content`` response.
+        config: The request's config (tells cached and inline apart).
+        seconds: Wall time of the request.
+        info: Optional span arguments to annotate with the same figures.
+    """
+    usage = getattr(response, "usage_metadata", None)
+    prompt = getattr(usage, "prompt_token_count", None) or 0
+    cached = getattr(usage, "cached_content_token_count", None) or 0
+    mode = "cached" if getattr(config, "cached_content", None) else "inline"
+    with _usage_lock:
+        totals = _usage[mode]
+        totals["requests"] += 1
+        totals["seconds"] += seconds
+        totals["prompt_tokens"] += prompt
+        totals["cached_tokens"] += cached
+    if info is not None:
+        info.update(context=mode, prompt_tokens=prompt, cached_tokens=cached)
+
+
+def usage_snapshot() -> dict:
+    """Return a copy of the usage totals, to pass to :func:`usage_summary`."""
+    with _usage_lock:
+        return {mode: dict(totals) for mode, totals in _usage.items()}
+
+
+def usage_summary(since: dict | None = None) -> str | None:
+    """
+    Return a one-paragraph summary of context-cache savings, or None if no
+    requests were recorded.
+
+    Args:
+        since: A :func:`usage_snapshot` taken at the start of a run; only
+            requests made after it are counted.  Runs overlapping in the same
+            process (``--jobs``) still see each other's requests.
+    """
+    now = usage_snapshot()
+    if since is not None:
+        now = {
+            mode: {k: v - since[mode][k] for k, v in totals.items()}
+            for mode, totals in now.items()
+        }
+    cached, inline = now["cached"], now["inline"]
+    if not cached["requests"] + inline["requests"]:
+        return None
+
+    def _mean(totals):
+        return totals["seconds"] / totals["requests"]
+
+    lines = [
+        f"   context cache: {cached['requests']} cached / "
+        f"{inline['requests']} inline requests, "
+        f"{cached['cached_tokens']:,} of "
+        f"{cached['prompt_tokens'] + inline['prompt_tokens']:,} prompt tokens "
+        "served from cache"
+    ]
+    if cached["requests"] and inline["requests"]:
+        saved = _mean(inline) - _mean(cached)
+        lines.append(
+            f"   mean latency {_mean(cached):.2f}s cached vs "
+            f"{_mean(inline):.2f}s inline ({saved:+.2f}s saved per request)"
+        )
+    return "\n".join(lines)
@@ -5,84 +5,243 @@ Uses gemini-2.0-flash-exp for native image generation to create brainrot
 visual assets (backgrounds, meme images, diagrams) without static files.
 """
 
+import asyncio
 import os
 from pathlib import Path
 
-from google import genai
 from google.genai import types
 
+from brainrot.cache import ArtifactCache, SingleFlight, cache_key
+from brainrot.gemini import get_client, run
+from brainrot.ratelimit import GEMINI_IMAGE, aretry_call, get_limiter, retry_call
+from brainrot.tracing import file_size, span
+
 # ---------------------------------------------------------------------------
 # Constants
 # ---------------------------------------------------------------------------
 IMAGE_MODEL = "gemini-2.0-flash-exp"
+IMAGE_CONCURRENCY = 4
+IMAGE_RPM = 30
 
 
-def _get_client() -> genai.Client:
-    """Return a configured Gemini client."""
-    api_key = os.environ.get("GEMINI_API_KEY")
-    if not api_key:
-        raise EnvironmentError(
-            "GEMINI_API_KEY environment variable is required. "
-            "Get one at https://ai.google.dev/"
-        )
-    return genai.Client(api_key=api_key)
+def _request(prompt: str) -> dict:
+    """Return the ``generate_content`` keyword arguments for *prompt*."""
+    return dict(
+        model=IMAGE_MODEL,
+        contents=prompt,
+        config=types.GenerateContentConfig(
+            response_modalities=["Image", "Text"],
+        ),
+    )
 
 
-def generate_image(prompt: str, output_path: str) -> str:
+def image_key(prompt: str) -> str:
+    """
+    Return the cache / dedup key for *prompt*: the model name plus the final
+    prompt (style suffix included) with runs of whitespace collapsed, so
+    re-wrapped copies of the same prompt share one image.  Case is kept:
+    the model may draw "OHIO" differently from "ohio".
+    """
+    return cache_key("image", IMAGE_MODEL, " ".join(prompt.split()))
+
+
+# Concurrent requests for the same prompt (across scenes, batch jobs and
+# daemon workers) share a single API call.
+_inflight = SingleFlight()
+
+
+def _image_bytes(response, prompt: str) -> bytes:
+    """Return the first image in *response*."""
+    # Walk through parts and return the first image
+    for part in response.candidates[0].content.parts:
+        if part.inline_data and part.inline_data.mime_type.startswith("image/"):
+            return part.inline_data.data
+
+    raise RuntimeError(f"No image returned by Gemini for prompt: {prompt!r}")
+
+
+def _write_image(data: bytes, output_path: str) -> str:
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "wb") as f:
+        f.write(data)
+    return os.path.abspath(output_path)
+
+
+def _fetch_image(prompt: str, key: str, cache: ArtifactCache | None) -> bytes:
+    """Request an image from Gemini (rate-limited, retried) and cache it."""
+    if cache is not None:
+        # Another caller may have finished this prompt since we last looked.
+        data = cache.load_bytes(key)
+        if data is not None:
+            return data
+
+    client = get_client()
+    limiter = get_limiter(GEMINI_IMAGE, IMAGE_RPM, IMAGE_CONCURRENCY)
+
+    def _call():
+        limiter.acquire()
+        with span("gemini.image", cat="gemini", model=IMAGE_MODEL):
+            return client.models.generate_content(**_request(prompt))
+
+    data = _image_bytes(retry_call(_call), prompt)
+    if cache is not None:
+        cache.save_bytes(key, data)
+    return data
+
+
+async def _afetch_image(prompt: str, key: str, cache: ArtifactCache | None) -> bytes:
+    """Async variant of :func:`_fetch_image`."""
+    if cache is not None:
+        # Another caller may have finished this prompt since we last looked.
+        data = cache.load_bytes(key)
+        if data is not None:
+            return data
+
+    client = get_client()
+    limiter = get_limiter(GEMINI_IMAGE, IMAGE_RPM, IMAGE_CONCURRENCY)
+
+    async def _call():
+        await limiter.aacquire()
+        with span("gemini.image", cat="gemini", model=IMAGE_MODEL):
+            return await client.aio.models.generate_content(**_request(prompt))
+
+    data = _image_bytes(await aretry_call(_call), prompt)
+    if cache is not None:
+        cache.save_bytes(key, data)
+    return data
+
+
+def generate_image(
+    prompt: str,
+    output_path: str,
+    cache: ArtifactCache | None = None,
+) -> str:
     """
     Generate a single image from a text prompt using Gemini native image
     generation and save it to *output_path*.
 
+    Requests draw from the process-wide ``gemini.image`` token bucket
+    (shared by every scene, batch job and daemon worker) and are retried
+    with exponential backoff when throttled.  Concurrent requests for the
+    same prompt are collapsed into one.
+
     Args:
         prompt: Descriptive image generation prompt.
         output_path: File path to save the resulting image (PNG).
+        cache: Optional artifact cache; images are keyed by :func:`image_key`.
 
     Returns:
         The absolute path of the saved image.
     """
-    client = _get_client()
-
-    response = client.models.generate_content(
-        model=IMAGE_MODEL,
-        contents=prompt,
-        config=types.GenerateContentConfig(
-            response_modalities=["Image", "Text"],
-        ),
-    )
+    key = image_key(prompt)
+    data = cache.load_bytes(key) if cache is not None else None
+    if data is None:
+        data = _inflight.do(key, lambda: _fetch_image(prompt, key, cache))
+    return _write_image(data, output_path)
+
+
+async def agenerate_image(
+    prompt: str,
+    output_path: str,
+    cache: ArtifactCache | None = None,
+) -> str:
+    """
+    Async variant of :func:`generate_image` on the shared client's pooled
+    connections, for keeping many requests in flight at once.
+    """
+    key = image_key(prompt)
+    data = cache.load_bytes(key) if cache is not None else None
+    if data is None:
+        data = await _inflight.ado(key, lambda: _afetch_image(prompt, key, cache))
+    return _write_image(data, output_path)
+
+
+def generate_scene_image(
+    scene: dict,
+    output_dir: str,
+    cache: ArtifactCache | None = None,
+) -> str:
+    """
+    Generate the background image for a single scene.
 
-    # Walk through parts and save the first image
-    for part in response.candidates[0].content.parts:
-        if part.inline_data and part.inline_data.mime_type.startswith("image/"):
-            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-            with open(output_path, "wb") as f:
-                f.write(part.inline_data.data)
-            return os.path.abspath(output_path)
+    Args:
+        scene: Scene dict containing ``scene_id`` and ``image_prompt``.
+        output_dir: Directory where the image will be saved.
+        cache: Optional artifact cache; images are keyed by :func:`image_key`.
 
-    raise RuntimeError(f"No image returned by Gemini for prompt: {prompt!r}")
+    Returns:
+        The absolute path of the scene image.
+    """
+    prompt, out = _scene_request(scene, output_dir, cache)
+    with span("image", cat="scene", scene=scene["scene_id"]) as info:
+        path = generate_image(prompt, out, cache)
+        info["bytes"] = file_size(path)
+    return path
+
+
+async def agenerate_scene_image(
+    scene: dict,
+    output_dir: str,
+    cache: ArtifactCache | None = None,
+) -> str:
+    """Async variant of :func:`generate_scene_image`."""
+    prompt, out = _scene_request(scene, output_dir, cache)
+    with span("image", cat="scene", scene=scene["scene_id"]) as info:
+        path = await agenerate_image(prompt, out, cache)
+        info["bytes"] = file_size(path)
+    return path
+
+
+def _scene_request(
+    scene: dict, output_dir: str, cache: ArtifactCache | None
+) -> tuple[str, str]:
+    """Return the full image prompt and output path for *scene*."""
+    scene_id = scene["scene_id"]
+    prompt = (
+        f"{scene['image_prompt']}. "
+        "Style: vibrant neon colors on dark background, "
+        "9:16 vertical aspect ratio, digital art, "
+        "high contrast brainrot aesthetic, glowing elements."
+    )
+    if cache is not None and cache.has(image_key(prompt)):
+        print(f"  Reusing cached image for scene {scene_id}")
+    else:
+        print(f"  Generating image for scene {scene_id} …")
+    return prompt, os.path.join(output_dir, f"scene_{scene_id}.png")
 
 
-def generate_scene_images(scenes: list[dict], output_dir: str) -> list[str]:
+def generate_scene_images(
+    scenes: list[dict],
+    output_dir: str,
+    cache: ArtifactCache | None = None,
+    concurrency: int = IMAGE_CONCURRENCY,
+) -> list[str]:
     """
-    Generate images for every scene in a script.
+    Generate images for every scene in a script, up to *concurrency* at a
+    time.  Concurrent requests are async ones on the shared client's event
+    loop (:func:`brainrot.gemini.run`), so they share its pooled connections.
 
     Args:
         scenes: List of scene dicts, each containing an ``image_prompt`` key.
         output_dir: Directory where images will be saved.
+        cache: Optional artifact cache; images are keyed by :func:`image_key`.
+        concurrency: Maximum requests in flight for this call.  The shared
+            rate limit still applies across all concurrent callers.
 
     Returns:
-        List of file paths for the generated images (one per scene).
+        List of file paths for the generated images (one per scene, in
+        scene order).
     """
-    paths: list[str] = []
-    for scene in scenes:
-        scene_id = scene["scene_id"]
-        prompt = (
-            f"{scene['image_prompt']}. "
-            "Style: vibrant neon colors on dark background, "
-            "9:16 vertical aspect ratio, digital art, "
-            "high contrast brainrot aesthetic, glowing elements."
-        )
-        out = os.path.join(output_dir, f"scene_{scene_id}.png")
-        print(f"  Generating image for scene {scene_id} …")
-        path = generate_image(prompt, out)
-        paths.append(path)
-    return paths
+    if concurrency <= 1:
+        return [generate_scene_image(scene, output_dir, cache) for scene in scenes]
+
+    async def _all() -> list[str]:
+        slots = asyncio.Semaphore(concurrency)
+
+        async def _one(scene: dict) -> str:
+            async with slots:
+                return await agenerate_scene_image(scene, output_dir, cache)
+
+        return list(await asyncio.gather(*(_one(scene) for scene in scenes)))
+
+    return run(_all())
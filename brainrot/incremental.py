@@ -0,0 +1,221 @@
+"""
+Incremental - Rebuild only the scenes of a hand-edited script that changed.
+============================================================================
+Every run leaves a ``manifest.json`` next to ``script.json`` recording, per
+scene, the scene data it was built from and the artifacts it produced
+(image, TTS clip, transcription, Manim segment).  After an editor tweaks
+``script.json``, :func:`rebuild` diffs it against the manifest and redoes
+only what changed:
+
+  - a new ``image_prompt`` regenerates the image (and the segment),
+  - new ``narration`` re-synthesizes TTS and re-transcribes it,
+  - any change to the scene, or to whether it opens/closes the video,
+    re-renders its segment.
+
+Everything else is reused and the segments are stitched again.
+"""
+
+import json
+import os
+from pathlib import Path
+
+from brainrot.cache import ArtifactCache
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+
+def _transcript_path(output_dir: Path, scene_id) -> Path:
+    return output_dir / "transcripts" / f"scene_{scene_id}.json"
+
+
+def write_manifest(
+    output_dir: str,
+    script: dict,
+    image_paths: list[str],
+    tts_paths: list[str],
+    transcriptions: list[dict],
+    segment_paths: list[str] | None = None,
+    final_path: str | None = None,
+    image_backend: str = "gemini",
+) -> str:
+    """
+    Record what each scene of *script* was built from and produced.
+
+    Transcriptions are written to ``transcripts/scene_<id>.json`` so the
+    manifest itself stays small.  *segment_paths* is None for runs that
+    rendered one monolithic video; the first :func:`rebuild` then renders
+    every segment.  *image_backend* is recorded so a rebuild redraws
+    changed images the same way.
+
+    Returns:
+        Path of the written manifest.
+    """
+    output_dir = Path(output_dir)
+    scenes = script["scenes"]
+    entries = []
+    for idx, scene in enumerate(scenes):
+        transcript = _transcript_path(output_dir, scene["scene_id"])
+        transcript.parent.mkdir(parents=True, exist_ok=True)
+        transcript.write_text(json.dumps(transcriptions[idx]))
+        entries.append(
+            {
+                "scene": scene,
+                "first": idx == 0,
+                "last": idx == len(scenes) - 1,
+                "image": image_paths[idx],
+                "tts": tts_paths[idx],
+                "transcription": str(transcript),
+                "segment": segment_paths[idx] if segment_paths else None,
+            }
+        )
+
+    path = output_dir / MANIFEST_NAME
+    path.write_text(
+        json.dumps(
+            {
+                "version": MANIFEST_VERSION,
+                "title": script["title"],
+                "scenes": entries,
+                "final": final_path,
+                "image_backend": image_backend,
+            },
+            indent=2,
+        )
+    )
+    return str(path)
+
+
+def load_manifest(output_dir: str) -> dict | None:
+    """Return the manifest in *output_dir*, or None if there is none."""
+    path = Path(output_dir) / MANIFEST_NAME
+    if not path.exists():
+        return None
+    manifest = json.loads(path.read_text())
+    if manifest.get("version") != MANIFEST_VERSION:
+        return None
+    return manifest
+
+
+def _exists(path: str | None) -> bool:
+    return bool(path) and os.path.exists(path)
+
+
+def plan_rebuild(script: dict, manifest: dict | None) -> list[dict]:
+    """
+    Diff *script* against *manifest* scene by scene (matched on
+    ``scene_id``).
+
+    Returns:
+        One dict per scene in *script* with boolean ``image``, ``tts`` and
+        ``segment`` flags saying which artifacts must be rebuilt, plus the
+        previous manifest entry (``prev``, possibly None).
+    """
+    previous = {}
+    for entry in (manifest or {}).get("scenes", []):
+        previous[entry["scene"]["scene_id"]] = entry
+
+    scenes = script["scenes"]
+    plan = []
+    for idx, scene in enumerate(scenes):
+        prev = previous.get(scene["scene_id"])
+        old = prev["scene"] if prev else {}
+        image = not (
+            prev
+            and old.get("image_prompt") == scene.get("image_prompt")
+            and _exists(prev["image"])
+        )
+        tts = not (
+            prev
+            and old.get("narration") == scene.get("narration")
+            and old.get("voice") == scene.get("voice")
+            and _exists(prev["tts"])
+            and _exists(prev["transcription"])
+        )
+        segment = image or not (
+            prev
+            and old == scene
+            and prev["first"] == (idx == 0)
+            and prev["last"] == (idx == len(scenes) - 1)
+            and _exists(prev["segment"])
+        )
+        plan.append({"prev": prev, "image": image, "tts": tts, "segment": segment})
+    return plan
+
+
+def rebuild(output_dir: str, cache: ArtifactCache | None = None) -> str:
+    """
+    Rebuild the video in *output_dir* after ``script.json`` was edited.
+
+    Args:
+        output_dir: A previous run's output directory (containing
+            ``script.json`` and, ideally, ``manifest.json``).
+        cache: Optional artifact cache consulted for every redone step.
+
+    Returns:
+        Absolute path of the re-composited final video.
+    """
+    from brainrot.compositor import compose_segments
+    from brainrot.streaming import render_scene_segment
+    from brainrot.transcriber import transcribe_scene
+    from brainrot.tts_engine import synthesize_scene
+
+    output_dir = Path(output_dir)
+    script = json.loads((output_dir / "script.json").read_text())
+    manifest = load_manifest(str(output_dir))
+    plan = plan_rebuild(script, manifest)
+    image_backend = (manifest or {}).get("image_backend", "gemini")
+    if image_backend == "procedural":
+        from brainrot.procedural_images import generate_scene_image
+    else:
+        from brainrot.image_generator import generate_scene_image
+    scenes = script["scenes"]
+
+    image_paths, tts_paths, transcriptions, segments = [], [], [], []
+    for idx, (scene, step) in enumerate(zip(scenes, plan)):
+        prev = step["prev"]
+        redo = [k for k in ("image", "tts", "segment") if step[k]]
+        print(
+            f"  Scene {scene['scene_id']}: "
+            + (f"rebuilding {', '.join(redo)}" if redo else "unchanged")
+        )
+
+        if step["image"]:
+            image = generate_scene_image(
+                scene, str(output_dir / "generated_assets"), cache
+            )
+        else:
+            image = prev["image"]
+
+        if step["tts"]:
+            tts = synthesize_scene(scene, str(output_dir / "audio"), cache)
+            transcription = transcribe_scene(tts, idx + 1, cache)
+        else:
+            tts = prev["tts"]
+            transcription = json.loads(Path(prev["transcription"]).read_text())
+
+        if step["segment"]:
+            segment = render_scene_segment(
+                script, idx, image, str(output_dir / "media"), cache
+            )
+        else:
+            segment = prev["segment"]
+
+        image_paths.append(image)
+        tts_paths.append(tts)
+        transcriptions.append(transcription)
+        segments.append(segment)
+
+    final_path = str(output_dir / "final_brainrot.mp4")
+    result = compose_segments(segments, tts_paths, transcriptions, final_path)
+    write_manifest(
+        str(output_dir),
+        script,
+        image_paths,
+        tts_paths,
+        transcriptions,
+        segments,
+        result,
+        image_backend,
+    )
+    return result
@@ -0,0 +1,185 @@
+"""
+Offline Script - Template-driven script generator with no network calls.
+=========================================================================
+Builds valid brainrot scripts in milliseconds from
+:data:`~brainrot.script_writer.RANDOM_TOPICS` and a small grammar of
+brainrot vocabulary, for load-testing the render and composite stages
+without Gemini.  Output follows the same schema as
+:func:`~brainrot.script_writer.generate_script`; every scene's
+``math_elements`` holds real LaTeX plus a plain-text line (the renderer
+shows anything MathTex rejects as plain text).
+
+The same (topic, n_scenes, seed) always yields the same script.
+"""
+
+import random
+
+from brainrot.script_writer import RANDOM_TOPICS
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+DEFAULT_SCENES = 6
+
+# ---------------------------------------------------------------------------
+# Grammar
+# ---------------------------------------------------------------------------
+_VOCAB = {
+    "term": [
+        "Skibidi",
+        "Sigma",
+        "Rizz",
+        "Ohio",
+        "Gyatt",
+        "Aura",
+        "Mog",
+        "Fanum Tax",
+        "Mewing",
+        "Looksmaxxing",
+        "Grimace Shake",
+        "NPC energy",
+    ],
+    "field": [
+        "tensor",
+        "manifold",
+        "spectral decomposition",
+        "gradient",
+        "Fourier series",
+        "Markov chain",
+        "wave function",
+        "vector field",
+        "partition function",
+    ],
+    "verb": [
+        "diverges",
+        "collapses",
+        "mogs the baseline",
+        "goes to Ohio",
+        "achieves escape velocity",
+        "becomes unbounded",
+        "enters the backrooms",
+    ],
+    "scientist": [
+        "Euler",
+        "Gauss",
+        "Noether",
+        "Riemann",
+        "Fourier",
+        "Laplace",
+    ],
+    "style": [
+        "neon chalkboard",
+        "vaporwave lecture hall",
+        "glitchy 3Blue1Brown",
+        "deep-fried meme",
+        "cosmic whiteboard",
+        "CRT oscilloscope",
+    ],
+    "subject": [
+        "a toilet orbiting a black hole",
+        "a sigma wolf made of equations",
+        "a Grimace Shake fluid simulation",
+        "an infinite staircase in Ohio",
+        "a jawline rendered as a 3D surface plot",
+        "a rizz particle accelerator",
+    ],
+}
+
+_HOOKS = [
+    "What if I told you {topic} is a real theorem?",
+    "Today we prove {topic}, and {scientist} would be shaking.",
+    "Nobody talks about how {topic} breaks mathematics.",
+]
+_BODIES = [
+    "Model {term} as a {field}. As {term2} increases, the aura {verb}.",
+    "By {scientist}'s lemma, every {term} {field} eventually {verb}.",
+    "Take the {field} of {term}. Apply the Fanum Tax. The result {verb}.",
+    "Peer-reviewed data shows {term} scales with {term2} squared.",
+    "If {term} is conserved, then {term2} {verb}. This is just physics.",
+]
+_OUTROS = [
+    "Therefore {topic}. Q.E.D. Stay sigma.",
+    "And that is why {term} {verb}. Class dismissed.",
+    "The proof is complete. {term} has officially mogged mathematics.",
+]
+_LATEX = [
+    r"\int_0^\infty \text{{{term}}}(t)\,dt = \Sigma",
+    r"\nabla \cdot \vec{{A}}_{{\text{{aura}}}} = \rho_{{\text{{{term}}}}}",
+    r"\lim_{{n \to \infty}} \text{{Ohio}}^n = 0",
+    r"E = m c^{{\text{{{term}}}}}",
+    r"\sum_{{k=1}}^{{N}} \text{{{term}}}_k \geq \text{{{term2}}}",
+    r"\frac{{\partial \text{{{term}}}}}{{\partial t}} = -\nabla^2 \text{{Rizz}}",
+]
+_PLAIN = [
+    "{term} ∝ {term2}²",
+    "{term} = {term2} (trust)",
+    "Aura: +{n}",
+    "{scientist} approved ✓",
+]
+_IMAGES = [
+    "{style} illustration of {subject}, {term} equations glowing, "
+    "dark background, vertical 9:16",
+    "{subject} drawn as a {field}, {style} aesthetic, neon accents, "
+    "vertical 9:16",
+]
+
+
+def _fill(template: str, rng: random.Random, topic: str) -> str:
+    term, term2 = rng.sample(_VOCAB["term"], 2)
+    return template.format(
+        topic=topic,
+        term=term,
+        term2=term2,
+        field=rng.choice(_VOCAB["field"]),
+        verb=rng.choice(_VOCAB["verb"]),
+        scientist=rng.choice(_VOCAB["scientist"]),
+        style=rng.choice(_VOCAB["style"]),
+        subject=rng.choice(_VOCAB["subject"]),
+        n=rng.randint(100, 9000),
+    )
+
+
+def generate_offline_script(
+    topic: str | None = None,
+    n_scenes: int = DEFAULT_SCENES,
+    seed: int = 0,
+) -> dict:
+    """
+    Build a script from templates without any network access.
+
+    Args:
+        topic: Topic of the video; None picks one of ``RANDOM_TOPICS``
+            (deterministically from *seed*).
+        n_scenes: Number of scenes (at least 1).
+        seed: Seed for every random choice.
+
+    Returns:
+        Script dict with title and scenes list, as from ``generate_script``.
+    """
+    if n_scenes < 1:
+        raise ValueError("n_scenes must be at least 1")
+    rng = random.Random(f"{topic}|{n_scenes}|{seed}")
+    topic = topic or rng.choice(RANDOM_TOPICS)
+
+    scenes = []
+    for i in range(1, n_scenes + 1):
+        if i == 1:
+            narration = _HOOKS
+        elif i == n_scenes and n_scenes > 1:
+            narration = _OUTROS
+        else:
+            narration = _BODIES
+        scenes.append(
+            {
+                "scene_id": i,
+                "narration": _fill(rng.choice(narration), rng, topic),
+                "image_prompt": _fill(rng.choice(_IMAGES), rng, topic),
+                "math_elements": [
+                    _fill(rng.choice(_LATEX), rng, topic),
+                    _fill(rng.choice(_PLAIN), rng, topic),
+                ],
+                "duration_hint": rng.randint(3, 6),
+            }
+        )
+
+    return {"title": topic, "scenes": scenes}
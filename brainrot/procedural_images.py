@@ -0,0 +1,289 @@
+"""
+Procedural Images - Fast local backgrounds as an alternative image backend.
+============================================================================
+Draws neon-on-dark backgrounds (gradients, noise fields, synthwave grids,
+tunnels) with vectorised NumPy instead of asking Gemini, for drafts where
+bespoke art is not needed.  Each image is 1080×1920 (9:16) and is seeded
+from a hash of the scene's ``image_prompt``, so the same prompt always
+gives the same picture.  Patterns are drawn at half resolution and
+upscaled (they are soft and shown dimmed behind the captions, so nothing
+visible is lost); an image takes 45–65 ms on one core, two thirds of it
+PNG encoding.
+
+Exposes the same ``generate_scene_image`` / ``generate_scene_images``
+interface as :mod:`brainrot.image_generator`.
+"""
+
+import hashlib
+import os
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from brainrot.cache import ArtifactCache
+from brainrot.tracing import file_size, span
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+WIDTH = 1080
+HEIGHT = 1920
+IMAGE_CONCURRENCY = 4
+# Patterns are drawn at 1/DRAW_SCALE resolution and upscaled; drawing at
+# full size costs 50–75 ms instead of ~20 ms.
+DRAW_SCALE = 2
+# Fastest zlib level that still compresses: level 0 saves ~30 ms per image
+# but writes ~6 MB files instead of ~0.7 MB.
+PNG_COMPRESS_LEVEL = 1
+
+PATTERNS = ("gradient", "noise", "grid", "tunnel")
+
+_NEON = np.array(
+    [
+        (255, 0, 170),  # magenta
+        (0, 255, 240),  # cyan
+        (140, 60, 255),  # violet
+        (57, 255, 20),  # acid green
+        (255, 140, 0),  # orange
+        (255, 230, 0),  # yellow
+    ],
+    dtype=np.float32,
+) / 255.0
+
+
+def _rng(prompt: str) -> np.random.Generator:
+    """A generator seeded from a hash of *prompt*."""
+    digest = hashlib.sha256(" ".join(prompt.split()).casefold().encode()).digest()
+    return np.random.default_rng(int.from_bytes(digest[:8], "little"))
+
+
+def _coords(width: int, height: int) -> tuple[np.ndarray, np.ndarray]:
+    """Broadcastable x (1, W) and y (H, 1) in [-1, 1] (y scaled to aspect)."""
+    x = np.linspace(-1.0, 1.0, width, dtype=np.float32)[None, :]
+    y = np.linspace(-1.0, 1.0, height, dtype=np.float32)[:, None] * (height / width)
+    return x, y
+
+
+def _sharpen(a: np.ndarray, squarings: int) -> np.ndarray:
+    """Return ``a ** (2 ** squarings)`` by repeated in-place squaring."""
+    for _ in range(squarings):
+        np.multiply(a, a, out=a)
+    return a
+
+
+def _lerp_matrix(n_out: int, n_in: int) -> np.ndarray:
+    """``(n_out, n_in)`` weights that smoothly upsample *n_in* samples."""
+    pos = np.linspace(0, n_in - 1, n_out, dtype=np.float32)
+    idx = np.minimum(pos.astype(np.int32), n_in - 2)
+    t = pos - idx
+    t = t * t * (3 - 2 * t)  # smoothstep hides the lattice seams
+    m = np.zeros((n_out, n_in), dtype=np.float32)
+    rows = np.arange(n_out)
+    m[rows, idx] = 1 - t
+    m[rows, idx + 1] = t
+    return m
+
+
+def _smooth_noise(rng, width: int, height: int, cells: int) -> np.ndarray:
+    """Value noise in [0, 1]: a random lattice upsampled as two matmuls."""
+    gw, gh = cells + 1, int(cells * height / width) + 1
+    lattice = rng.random((gh, gw), dtype=np.float32)
+    return _lerp_matrix(height, gh) @ lattice @ _lerp_matrix(width, gw).T
+
+
+def _gradient(rng, x, y) -> np.ndarray:
+    angle = rng.uniform(0, np.pi)
+    cx, cy = np.float32(np.cos(angle)), np.float32(np.sin(angle))
+    lo = -abs(cx) - abs(cy) * y.max()  # t's minimum over the frame
+    t = (x * cx - lo) + y * cy
+    t *= 1.0 / (-2 * lo)
+    band = np.square((t - np.float32(rng.uniform(0.3, 0.7))) * 8.0)
+    np.negative(band, out=band)
+    np.exp(band, out=band)
+    t *= 0.55
+    t += band * 0.6
+    return t
+
+
+def _noise(rng, x, y) -> np.ndarray:
+    width, height = x.shape[1], y.shape[0]
+    field = _smooth_noise(rng, width, height, 4)
+    field += 0.5 * _smooth_noise(rng, width, height, 10)
+    field *= 1 / 1.5
+    # Contour lines of the field glow.
+    lines = np.abs(np.sin(field * np.float32(rng.uniform(18, 30))))
+    field *= 0.45
+    field += 0.7 * _sharpen(lines, 4)
+    return field
+
+
+def _grid(rng, x, y) -> np.ndarray:
+    horizon = np.float32(rng.uniform(-0.3, 0.2))
+    depth = np.maximum(y - horizon, np.float32(1e-3))  # (H, 1)
+    floor = y > horizon
+    gx = np.abs(np.sin((np.pi * rng.uniform(2.0, 4.0)) * x / depth))
+    gz = _sharpen(np.abs(np.sin(np.pi * rng.uniform(1.0, 2.0) / depth)), 5)
+    lines = np.maximum(_sharpen(gx, 5), gz)
+    lines *= np.minimum(depth * 1.5, 1.0) * floor
+    lines += np.exp(-np.abs(y - horizon) * 4.0) * 0.8  # glow on the horizon
+    return lines
+
+
+def _tunnel(rng, x, y) -> np.ndarray:
+    # Symmetric about the vertical axis: draw the right half and mirror it.
+    half = x[:, x.shape[1] // 2 :]
+    r = np.sqrt(half * half + y * y) + np.float32(1e-3)
+    rings = _sharpen(np.abs(np.sin(np.float32(rng.uniform(2.0, 5.0)) / r)), 3)
+    spokes = _sharpen(
+        np.abs(np.sin(np.arctan2(y, half) * np.float32(rng.integers(4, 12)))), 5
+    )
+    rings += 0.6 * spokes
+    rings *= np.minimum(r * 1.2, 1.0)
+    left = rings[:, ::-1][:, : x.shape[1] - half.shape[1]]
+    return np.concatenate([left, rings], axis=1)
+
+
+_PATTERN_FNS = {
+    "gradient": _gradient,
+    "noise": _noise,
+    "grid": _grid,
+    "tunnel": _tunnel,
+}
+
+
+def render_background(
+    prompt: str,
+    width: int = WIDTH,
+    height: int = HEIGHT,
+    pattern: str | None = None,
+    scale: int = DRAW_SCALE,
+) -> np.ndarray:
+    """
+    Return a neon-on-dark background for *prompt* as an ``(H, W, 3)`` uint8
+    array.
+
+    Args:
+        prompt: Seeds every random choice (pattern, palette, parameters).
+        width: Image width in pixels.
+        height: Image height in pixels.
+        pattern: One of :data:`PATTERNS`; picked from the prompt if None.
+        scale: Draw at ``1/scale`` of the size and upscale by pixel
+            repetition.
+    """
+    full_width, full_height = width, height
+    width, height = -(-width // scale), -(-height // scale)
+    rng = _rng(prompt)
+    choice = PATTERNS[rng.integers(len(PATTERNS))]
+    pattern = pattern or choice
+    x, y = _coords(width, height)
+    field = _PATTERN_FNS[pattern](rng, x, y)
+    np.clip(field, 0.0, 1.0, out=field)
+
+    # Two neon colours blended top to bottom over a near-black base, scaled
+    # so base + colour never exceeds 255.
+    a, b = _NEON[rng.choice(len(_NEON), 2, replace=False)]
+    mix = np.linspace(0.0, 1.0, height, dtype=np.float32)[:, None, None]
+    base = 6.0 + 12.0 * (1.0 - np.abs(y / y.max()))[..., None]
+    colour = (a * (1.0 - mix) + b * mix) * np.float32(236.0)
+    # One (H, W) pass per channel is much cheaper than an (H, W, 3) float
+    # intermediate.
+    img = np.empty((height, width, 3), dtype=np.uint8)
+    for c in range(3):
+        img[..., c] = field * colour[..., c] + base[..., 0]
+    if scale == 1:
+        return img
+    # Widen each row once, then copy whole rows: contiguous copies are much
+    # cheaper than one strided broadcast over the full image.
+    big = np.empty((height, scale, width, scale, 3), dtype=np.uint8)
+    big[:, 0] = img[:, :, None]
+    big[:, 1:] = big[:, :1]
+    return big.reshape(height * scale, width * scale, 3)[:full_height, :full_width]
+
+
+def png_bytes(img: np.ndarray) -> bytes:
+    """Encode an ``(H, W, 3)`` uint8 array as PNG (no filter, fast zlib)."""
+    height, width, _ = img.shape
+    rows = np.zeros((height, width * 3 + 1), dtype=np.uint8)
+    rows[:, 1:] = img.reshape(height, -1)
+
+    def _chunk(tag: bytes, data: bytes) -> bytes:
+        return (
+            struct.pack(">I", len(data))
+            + tag
+            + data
+            + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+        )
+
+    ihdr = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + _chunk(b"IHDR", ihdr)
+        + _chunk(b"IDAT", zlib.compress(rows.tobytes(), PNG_COMPRESS_LEVEL))
+        + _chunk(b"IEND", b"")
+    )
+
+
+def generate_background(prompt: str, output_path: str) -> str:
+    """
+    Render the background for *prompt* and save it as a PNG.
+
+    Returns:
+        The absolute path of the saved image.
+    """
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "wb") as f:
+        f.write(png_bytes(render_background(prompt)))
+    return os.path.abspath(output_path)
+
+
+def generate_scene_image(
+    scene: dict,
+    output_dir: str,
+    cache: ArtifactCache | None = None,
+) -> str:
+    """
+    Draw the background image for a single scene.
+
+    Args:
+        scene: Scene dict containing ``scene_id`` and ``image_prompt``.
+        output_dir: Directory where the image will be saved.
+        cache: Accepted for interface parity with
+            :func:`brainrot.image_generator.generate_scene_image`; unused,
+            since drawing is faster than a cache lookup and copy.
+
+    Returns:
+        The absolute path of the scene image.
+    """
+    scene_id = scene["scene_id"]
+    out = os.path.join(output_dir, f"scene_{scene_id}.png")
+    print(f"  Drawing procedural background for scene {scene_id} …")
+    with span("image", cat="scene", scene=scene_id, backend="procedural") as info:
+        path = generate_background(scene["image_prompt"], out)
+        info["bytes"] = file_size(path)
+    return path
+
+
+def generate_scene_images(
+    scenes: list[dict],
+    output_dir: str,
+    cache: ArtifactCache | None = None,
+    concurrency: int = IMAGE_CONCURRENCY,
+) -> list[str]:
+    """
+    Draw backgrounds for every scene in a script, *concurrency* at a time
+    (NumPy and zlib release the GIL for most of the work).
+
+    Returns:
+        List of file paths for the images (one per scene, in scene order).
+    """
+    if concurrency <= 1:
+        return [generate_scene_image(scene, output_dir, cache) for scene in scenes]
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [
+            pool.submit(generate_scene_image, scene, output_dir, cache)
+            for scene in scenes
+        ]
+        return [f.result() for f in futures]
@@ -0,0 +1,170 @@
+"""
+Rate Limit - Shared token buckets and backoff retry for API calls.
+===================================================================
+Token buckets are registered by name and shared process-wide, so parallel
+jobs (batch mode, the daemon, concurrent scene workers) draw from one quota
+instead of each assuming it has the whole thing.  Throttled calls are
+retried with exponential backoff and jitter.
+
+Only the async variants import :mod:`asyncio`, so loading this module for
+the CLI does not pull it in.
+"""
+
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+RETRY_ATTEMPTS = 6
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 32.0
+# Requests a named bucket lets start together before pacing kicks in, so a
+# batch of concurrent calls is not spread out from the first request.
+DEFAULT_BURST = 4
+
+# Well-known bucket names.
+GEMINI_IMAGE = "gemini.image"
+
+_THROTTLE_CODES = {429, 503}
+_THROTTLE_MARKERS = ("RESOURCE_EXHAUSTED", "UNAVAILABLE", "rate limit", "quota")
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Args:
+        rate: Tokens added per second.
+        capacity: Maximum burst size (defaults to ``max(1, rate)``).  Kept
+            by :meth:`set_rate` unless a new one is given.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self._lock = threading.Lock()
+        self.set_rate(rate, capacity)
+        self._tokens = self.capacity
+
+    def set_rate(self, rate: float, capacity: float | None = None):
+        """Change the refill rate (and optionally the burst size)."""
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        with self._lock:
+            self.rate = rate
+            if capacity is not None:
+                self.capacity = capacity
+            elif not hasattr(self, "capacity"):
+                self.capacity = max(1.0, rate)
+            self._stamp = time.monotonic()
+            self._tokens = min(getattr(self, "_tokens", self.capacity), self.capacity)
+
+    def _try_take(self, tokens: float) -> float:
+        """Take *tokens* if available; otherwise return seconds to wait."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._stamp) * self.rate
+            )
+            self._stamp = now
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens: float = 1.0):
+        """Block until *tokens* are available and take them."""
+        while (wait := self._try_take(tokens)) > 0:
+            time.sleep(wait)
+
+    async def aacquire(self, tokens: float = 1.0):
+        """Async variant of :meth:`acquire`."""
+        import asyncio
+
+        while (wait := self._try_take(tokens)) > 0:
+            await asyncio.sleep(wait)
+
+
+_limiters: dict[str, TokenBucket] = {}
+_registry_lock = threading.Lock()
+
+
+def get_limiter(
+    name: str, requests_per_minute: float = 60.0, burst: int = DEFAULT_BURST
+) -> TokenBucket:
+    """
+    Return the process-wide bucket called *name*, creating it on first use.
+
+    *requests_per_minute* and *burst* only apply when the bucket is created;
+    call :meth:`TokenBucket.set_rate` to change an existing one.  The burst
+    is capped at *requests_per_minute*, so the first minute stays in quota.
+    """
+    with _registry_lock:
+        bucket = _limiters.get(name)
+        if bucket is None:
+            capacity = max(1.0, min(burst, requests_per_minute))
+            bucket = _limiters[name] = TokenBucket(
+                requests_per_minute / 60.0, capacity
+            )
+        return bucket
+
+
+def is_throttle(exc: BaseException) -> bool:
+    """Return True if *exc* looks like a rate-limit / overload response."""
+    code = getattr(exc, "code", None) or getattr(exc, "status_code", None)
+    if code in _THROTTLE_CODES:
+        return True
+    text = str(exc)
+    return any(marker.lower() in text.lower() for marker in _THROTTLE_MARKERS)
+
+
+def _delay(attempt: int, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff for retry number *attempt* (0-based)."""
+    return random.uniform(0, min(cap, base * 2**attempt))
+
+
+def retry_call(
+    fn: Callable[[], Any],
+    attempts: int = RETRY_ATTEMPTS,
+    base_delay: float = RETRY_BASE_DELAY,
+    max_delay: float = RETRY_MAX_DELAY,
+    retry_on: Callable[[BaseException], bool] = is_throttle,
+) -> Any:
+    """
+    Call *fn*, retrying with exponential backoff while *retry_on* matches.
+
+    Raises:
+        The last exception once *attempts* are used up, or immediately for
+        errors *retry_on* rejects.
+    """
+    for attempt in range(attempts):
+        try:
+            return fn()
+        except Exception as exc:
+            if attempt == attempts - 1 or not retry_on(exc):
+                raise
+            delay = _delay(attempt, base_delay, max_delay)
+            print(f"  ⏳ Throttled ({exc.__class__.__name__}); retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+
+async def aretry_call(
+    fn: Callable[[], Awaitable[Any]],
+    attempts: int = RETRY_ATTEMPTS,
+    base_delay: float = RETRY_BASE_DELAY,
+    max_delay: float = RETRY_MAX_DELAY,
+    retry_on: Callable[[BaseException], bool] = is_throttle,
+) -> Any:
+    """Async variant of :func:`retry_call`; *fn* returns an awaitable."""
+    import asyncio
+
+    for attempt in range(attempts):
+        try:
+            return await fn()
+        except Exception as exc:
+            if attempt == attempts - 1 or not retry_on(exc):
+                raise
+            delay = _delay(attempt, base_delay, max_delay)
+            print(f"  ⏳ Throttled ({exc.__class__.__name__}); retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
@@ -8,6 +8,7 @@ with Metal-friendly settings for fast output on macOS.
 import os
 import random
 import textwrap
+import threading
 from pathlib import Path
 
 import numpy as np
@@ -33,17 +34,23 @@ from manim import (
     Text,
     VGroup,
     Wiggle,
+    __version__ as MANIM_VERSION,
     config,
     linear,
     rush_into,
 )
 
+from brainrot.tracing import file_size, span
+
 # ---------------------------------------------------------------------------
 # Brainrot palette
 # ---------------------------------------------------------------------------
 BG_DARK = "#0a0a0a"
 CHAOS_COLORS = ["#FF00FF", "#00FFFF", "#FFFF00", "#FF3300", "#39FF14"]
 
+# Manim's ``config`` is process-global, so only one render may run at a time.
+_RENDER_LOCK = threading.Lock()
+
 
 def _jitter(mob, intensity=0.08):
     """Attach a per-frame random-shake updater."""
@@ -78,13 +85,35 @@ def _flashbang(scene):
 # ---------------------------------------------------------------------------
 # Dynamic scene builder
 # ---------------------------------------------------------------------------
-def _build_scene_class(script: dict, image_paths: list[str]):
+def _build_scene_class(
+    script: dict,
+    image_paths: list[str],
+    scene_indices: list[int] | None = None,
+    name: str = "BrainrotGenerated",
+):
     """
     Return a new Manim Scene subclass whose ``construct`` method renders
     every scene from the generated script.
+
+    When *scene_indices* is given only those scenes are rendered; the intro
+    flash is kept only if the subset contains the first scene and the
+    singularity finale only if it contains the last.  *name* becomes the
+    class name and therefore the output file name.
     """
+    n_scenes = len(script["scenes"])
+    indices = list(range(n_scenes)) if scene_indices is None else list(scene_indices)
+    intro = 0 in indices
+    finale = (n_scenes - 1) in indices
 
     class BrainrotGenerated(Scene):
+        def play(self, *args, **kwargs):
+            with span("manim.play", cat="render"):
+                super().play(*args, **kwargs)
+
+        def wait(self, *args, **kwargs):
+            with span("manim.wait", cat="render"):
+                super().wait(*args, **kwargs)
+
         def construct(self):
             # -- 9:16 vertical config --
             config.frame_width = 9
@@ -93,13 +122,15 @@ def _build_scene_class(script: dict, image_paths: list[str]):
             config.pixel_height = 1920
             self.camera.background_color = BG_DARK
 
-            _flashbang(self)
+            if intro:
+                _flashbang(self)
 
-            for idx, scene_data in enumerate(script["scenes"]):
-                self._render_scene(scene_data, idx)
+            for idx in indices:
+                self._render_scene(script["scenes"][idx], idx)
 
             # Singularity finale
-            self._singularity()
+            if finale:
+                self._singularity()
 
         # ----------------------------------------------------------
         def _render_scene(self, scene_data: dict, idx: int):
@@ -209,9 +240,77 @@ def _build_scene_class(script: dict, image_paths: list[str]):
             self.wait(1.0)
             self.play(FadeOut(outro), run_time=0.3)
 
+    BrainrotGenerated.__name__ = BrainrotGenerated.__qualname__ = name
     return BrainrotGenerated
 
 
+def _configure(output_dir: str):
+    """Apply the Mac M2 optimised Manim settings."""
+    config.frame_width = 9
+    config.frame_height = 16
+    config.pixel_width = 1080
+    config.pixel_height = 1920
+    config.frame_rate = 30
+    config.media_dir = output_dir
+    config.quality = "medium_quality"
+    config.renderer = "cairo"
+    config.disable_caching = True
+
+
+def _render_class(SceneClass, output_dir: str) -> str:
+    """Render *SceneClass* and return the path of the resulting MP4."""
+    name = SceneClass.__name__
+    with _RENDER_LOCK, span("manim.render", cat="render", scene=name) as info:
+        _configure(output_dir)
+        scene = SceneClass()
+        scene.render()
+        path = _locate(scene, output_dir)
+        info["bytes"] = file_size(path)
+    return path
+
+
+def _locate(scene, output_dir: str) -> str:
+    """Return the MP4 path that *scene* was rendered to."""
+    movie = getattr(scene.renderer.file_writer, "movie_file_path", None)
+    if movie and Path(movie).exists():
+        return str(movie)
+    # Fallback: search for the scene's mp4 under output_dir
+    name = type(scene).__name__
+    for mp4 in Path(output_dir).rglob(f"{name}.mp4"):
+        return str(mp4)
+    return str(Path(output_dir) / "videos" / "1080p30" / f"{name}.mp4")
+
+
+def render_segment(
+    script: dict,
+    image_paths: list[str],
+    scene_indices: list[int],
+    output_dir: str,
+    name: str | None = None,
+) -> str:
+    """
+    Render a subset of the script's scenes into its own MP4 segment.
+
+    Segments rendered for consecutive, non-overlapping subsets can be
+    concatenated into the same video :func:`render` would produce.
+
+    Args:
+        script: The parsed script dict (from script_writer).
+        image_paths: Background image per scene; entries for scenes outside
+            *scene_indices* are ignored and may be empty strings.
+        scene_indices: Zero-based indices of the scenes to render.
+        output_dir: Directory for Manim media output.
+        name: Segment (and file) name; derived from the indices by default.
+
+    Returns:
+        Path to the rendered MP4 segment.
+    """
+    if name is None:
+        name = "BrainrotSegment_" + "_".join(str(i) for i in scene_indices)
+    SceneClass = _build_scene_class(script, image_paths, scene_indices, name)
+    return _render_class(SceneClass, output_dir)
+
+
 def render(script: dict, image_paths: list[str], output_dir: str) -> str:
     """
     Render the generated script to an MP4 video.
@@ -230,25 +329,4 @@ def render(script: dict, image_paths: list[str], output_dir: str) -> str:
         Path to the rendered MP4 file.
     """
     SceneClass = _build_scene_class(script, image_paths)
-
-    # Configure Manim for Mac M2 optimised rendering
-    config.frame_width = 9
-    config.frame_height = 16
-    config.pixel_width = 1080
-    config.pixel_height = 1920
-    config.frame_rate = 30
-    config.media_dir = output_dir
-    config.quality = "medium_quality"
-    config.renderer = "cairo"
-    config.disable_caching = True
-
-    scene = SceneClass()
-    scene.render()
-
-    # Locate the rendered file
-    rendered = Path(output_dir) / "videos" / "1080p30" / "BrainrotGenerated.mp4"
-    if not rendered.exists():
-        # Fallback: search for any mp4 under output_dir
-        for mp4 in Path(output_dir).rglob("*.mp4"):
-            return str(mp4)
-    return str(rendered)
+    return _render_class(SceneClass, output_dir)
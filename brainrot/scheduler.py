@@ -0,0 +1,131 @@
+"""
+Scheduler - Dependency-aware concurrent stage execution.
+=========================================================
+Runs pipeline stages as a small DAG on a thread pool so that independent
+work overlaps: network-bound image generation next to CPU-bound TTS,
+transcription next to the Manim render.  Each node's wall-clock window is
+recorded so slow stages are easy to spot.
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable
+
+from brainrot.tracing import span
+
+
+class StageGraph:
+    """
+    A set of named stages with dependencies.
+
+    Every stage callable receives the results of its dependencies as keyword
+    arguments named after those dependencies::
+
+        graph = StageGraph()
+        graph.add("script", lambda: generate_script(topic))
+        graph.add("images", lambda script: ..., deps=("script",))
+        results = graph.run()
+    """
+
+    def __init__(self, max_workers: int | None = None):
+        self.max_workers = max_workers
+        self._stages: dict[str, tuple[Callable[..., Any], tuple[str, ...]]] = {}
+        self.timings: dict[str, dict[str, float]] = {}
+
+    def add(self, name: str, fn: Callable[..., Any], deps: tuple[str, ...] = ()):
+        """Register stage *name* that runs *fn* once all *deps* are done."""
+        if name in self._stages:
+            raise ValueError(f"Duplicate stage: {name!r}")
+        self._stages[name] = (fn, tuple(deps))
+        return self
+
+    def _check(self):
+        """Reject unknown dependencies and cycles before starting any work."""
+        for name, (_, deps) in self._stages.items():
+            for dep in deps:
+                if dep not in self._stages:
+                    raise ValueError(f"Stage {name!r} depends on unknown {dep!r}")
+
+        visiting: set[str] = set()
+        done: set[str] = set()
+
+        def _visit(name: str):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Dependency cycle through stage {name!r}")
+            visiting.add(name)
+            for dep in self._stages[name][1]:
+                _visit(dep)
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self._stages:
+            _visit(name)
+
+    def run(self) -> dict[str, Any]:
+        """
+        Execute all stages, starting each as soon as its dependencies finish.
+
+        Returns:
+            Mapping of stage name to its return value.  Per-stage timings
+            (``start``, ``end`` and ``elapsed`` seconds, relative to the start
+            of the run) are left in :attr:`timings`.
+
+        Raises:
+            The first exception raised by any stage.  Stages that have not
+            started yet are cancelled.
+        """
+        self._check()
+        self.timings = {}
+        results: dict[str, Any] = {}
+        pending = dict(self._stages)
+        running: dict = {}
+        t0 = time.perf_counter()
+
+        def _timed(name: str, fn: Callable[..., Any], kwargs: dict):
+            start = time.perf_counter() - t0
+            try:
+                with span(name, cat="stage"):
+                    return fn(**kwargs)
+            finally:
+                end = time.perf_counter() - t0
+                self.timings[name] = {
+                    "start": start,
+                    "end": end,
+                    "elapsed": end - start,
+                }
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while pending or running:
+                ready = [
+                    name
+                    for name, (_, deps) in pending.items()
+                    if all(d in results for d in deps)
+                ]
+                for name in ready:
+                    fn, deps = pending.pop(name)
+                    kwargs = {d: results[d] for d in deps}
+                    running[pool.submit(_timed, name, fn, kwargs)] = name
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    name = running.pop(fut)
+                    try:
+                        results[name] = fut.result()
+                    except BaseException:
+                        for other in running:
+                            other.cancel()
+                        raise
+        return results
+
+    def summary(self) -> str:
+        """Return a human-readable per-stage timing table."""
+        width = max((len(n) for n in self.timings), default=5)
+        lines = []
+        for name, t in sorted(self.timings.items(), key=lambda kv: kv[1]["start"]):
+            lines.append(
+                f"   {name:<{width}}  {t['start']:7.1f}s → {t['end']:7.1f}s"
+                f"  ({t['elapsed']:.1f}s)"
+            )
+        return "\n".join(lines)
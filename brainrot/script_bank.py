@@ -0,0 +1,207 @@
+"""
+Script Bank - Pre-generated scripts for ``--random``.
+======================================================
+A directory of validated scripts written ahead of time for
+:data:`~brainrot.script_writer.RANDOM_TOPICS`.  ``--random`` pops a ready
+script instead of waiting on Gemini, while a background filler thread tops
+the bank back up to its target depth during the (network-idle) render and
+encode stages.
+
+Each entry is one JSON file holding the script plus metadata (topic, model,
+prompt fingerprint, creation time, generation seconds).  Entries written for
+a different model or system prompt are discarded rather than served.
+Popping claims an entry with an atomic rename, so several processes can
+share one bank.
+"""
+
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from brainrot.cache import cache_key
+from brainrot.script_writer import (
+    RANDOM_TOPICS,
+    SCRIPT_MODEL,
+    SYSTEM_PROMPT,
+    validate_script,
+)
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+DEFAULT_DEPTH = 3
+RETRY_DELAY = 30.0  # seconds to back off after a failed fill
+STOP_TIMEOUT = 5.0  # seconds stop() waits for a script in progress
+
+
+def bank_version() -> str:
+    """Fingerprint of the model and prompt that banked scripts depend on."""
+    return cache_key("script-bank", SCRIPT_MODEL, SYSTEM_PROMPT)[:16]
+
+
+class ScriptBank:
+    """
+    On-disk queue of ready-to-render scripts.
+
+    Args:
+        root: Directory holding the entries.
+        depth: Number of scripts the filler keeps in stock.
+        topics: Topics to pre-generate scripts for.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        depth: int = DEFAULT_DEPTH,
+        topics: list[str] = RANDOM_TOPICS,
+    ):
+        self.root = Path(root)
+        self.depth = depth
+        self.topics = list(topics)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    # ----------------------------------------------------------
+    def _entries(self) -> list[Path]:
+        """Current-version entries, oldest first (stale ones are removed)."""
+        version = bank_version()
+        entries = []
+        for path in self.root.glob("*.json"):
+            if not path.name.startswith(version):
+                path.unlink(missing_ok=True)
+                continue
+            entries.append(path)
+        return sorted(entries)
+
+    def __len__(self) -> int:
+        return len(self._entries())
+
+    def topics_in_stock(self) -> set[str]:
+        """Topics that currently have a banked script."""
+        stocked = set()
+        for path in self._entries():
+            try:
+                stocked.add(json.loads(path.read_text())["topic"])
+            except (OSError, ValueError, KeyError):
+                continue
+        return stocked
+
+    # ----------------------------------------------------------
+    def put(self, topic: str, script: dict, seconds: float | None = None) -> Path:
+        """
+        Add *script* for *topic* to the bank.
+
+        Raises:
+            ValueError: If *script* fails validation.
+        """
+        problems = validate_script(script)
+        if problems:
+            raise ValueError("Refusing to bank invalid script: " + "; ".join(problems))
+        entry = {
+            "topic": topic,
+            "model": SCRIPT_MODEL,
+            "version": bank_version(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "generation_s": seconds,
+            "script": script,
+        }
+        # Version prefix + time-ordered name, so sorting gives FIFO order.
+        name = f"{bank_version()}-{time.time_ns():020d}-{uuid.uuid4().hex[:8]}.json"
+        fd, tmp = tempfile.mkstemp(dir=self.root, prefix=".tmp-")
+        with os.fdopen(fd, "w") as f:
+            json.dump(entry, f, indent=2)
+        dest = self.root / name
+        os.replace(tmp, dest)
+        return dest
+
+    def pop(self) -> tuple[str, dict] | None:
+        """
+        Take the oldest banked script and wake the filler.
+
+        Returns:
+            ``(topic, script)``, or None if the bank is empty.
+        """
+        try:
+            for path in self._entries():
+                claimed = path.with_suffix(".claimed")
+                try:
+                    os.replace(path, claimed)
+                except FileNotFoundError:  # taken by another process
+                    continue
+                try:
+                    entry = json.loads(claimed.read_text())
+                except ValueError:
+                    continue
+                finally:
+                    claimed.unlink(missing_ok=True)
+                return entry["topic"], entry["script"]
+            return None
+        finally:
+            self._wake.set()
+
+    # ----------------------------------------------------------
+    def fill_one(self) -> Path:
+        """Generate, validate and bank one script for an unstocked topic."""
+        from brainrot.script_writer import generate_script
+
+        stocked = self.topics_in_stock()
+        fresh = [t for t in self.topics if t not in stocked]
+        topic = random.choice(fresh or self.topics)
+        start = time.perf_counter()
+        script = generate_script(topic)
+        return self.put(topic, script, round(time.perf_counter() - start, 2))
+
+    def refill(self) -> int:
+        """
+        Generate scripts until the bank holds :attr:`depth` of them.
+
+        Returns:
+            Number of scripts added.
+        """
+        added = 0
+        while len(self) < self.depth and not self._stop.is_set():
+            self.fill_one()
+            added += 1
+        return added
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.clear()
+            try:
+                added = self.refill()
+                if added:
+                    print(f"  🏦 Script bank refilled (+{added}, {len(self)} ready)")
+            except Exception as exc:
+                print(f"  🏦 Script bank refill failed: {exc}")
+                self._stop.wait(RETRY_DELAY)
+                continue
+            self._wake.wait()
+
+    def start(self):
+        """Start the background filler (no-op if already running)."""
+        if self.depth <= 0 or (self._thread and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="script-bank-filler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float | None = STOP_TIMEOUT):
+        """
+        Stop the filler, giving a script being generated (if any) up to
+        *timeout* seconds to be banked (None waits for it, 0 not at all).
+        The filler is a daemon thread, so one still running does not keep
+        the process alive.
+        """
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None and timeout != 0:
+            self._thread.join(timeout)
@@ -5,12 +5,17 @@ Uses gemini-2.5-flash-preview-04-17 to write chaotic educational brainrot script
 with structured scene breakdowns, TTS lines, and image prompts.
 """
 
+import itertools
 import json
-import os
 import random
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator
 
-from google import genai
-from google.genai import types
+from brainrot.gemini import context_config, drop_context, get_client, record_usage
+from brainrot.ratelimit import is_throttle
+from brainrot.tracing import span
 
 # ---------------------------------------------------------------------------
 # Constants
@@ -67,16 +72,75 @@ OUTPUT FORMAT — respond with ONLY valid JSON matching this schema:
 }
 """
 
+# Structured-output schemas (Gemini's OpenAPI subset).
+SCENE_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "scene_id": {"type": "INTEGER"},
+        "narration": {"type": "STRING"},
+        "image_prompt": {"type": "STRING"},
+        "math_elements": {"type": "ARRAY", "items": {"type": "STRING"}},
+        "duration_hint": {"type": "INTEGER"},
+    },
+    "required": ["scene_id", "narration", "image_prompt", "math_elements"],
+    "property_ordering": [
+        "scene_id",
+        "narration",
+        "image_prompt",
+        "math_elements",
+        "duration_hint",
+    ],
+}
+SCRIPT_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "title": {"type": "STRING"},
+        "scenes": {"type": "ARRAY", "items": SCENE_SCHEMA},
+    },
+    "required": ["title", "scenes"],
+    "property_ordering": ["title", "scenes"],
+}
 
-def _get_client() -> genai.Client:
-    """Return a configured Gemini client."""
-    api_key = os.environ.get("GEMINI_API_KEY")
-    if not api_key:
-        raise EnvironmentError(
-            "GEMINI_API_KEY environment variable is required. "
-            "Get one at https://ai.google.dev/"
-        )
-    return genai.Client(api_key=api_key)
+DEFAULT_DURATION_HINT = 5
+
+# Long-form (outline → acts) generation.
+SCENES_PER_MINUTE = 8
+SCENES_PER_ACT = 8
+ACT_CONCURRENCY = 8
+
+OUTLINE_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "title": {"type": "STRING"},
+        "acts": {
+            "type": "ARRAY",
+            "items": {
+                "type": "OBJECT",
+                "properties": {
+                    "summary": {"type": "STRING"},
+                    "beats": {"type": "ARRAY", "items": {"type": "STRING"}},
+                },
+                "required": ["summary", "beats"],
+            },
+        },
+    },
+    "required": ["title", "acts"],
+    "property_ordering": ["title", "acts"],
+}
+
+OUTLINE_PROMPT = """\
+You plan long-form brainrot videos in the style of 3Blue1Brown meets
+internet brain-rot culture: serious math/science presentation applied to
+absurd Gen-Alpha meme concepts, delivered deadpan.
+
+Given a topic and a number of acts, produce a title and exactly that many
+acts. Each act gets a one-sentence summary and 3-6 beats (short phrases)
+that build on the previous act, so the acts read as one escalating
+argument from a hook to a chaotic finale.
+
+Respond with ONLY JSON: {"title": "...", "acts": [{"summary": "...",
+"beats": ["..."]}]}
+"""
 
 
 def pick_random_topic() -> str:
@@ -84,29 +148,78 @@ def pick_random_topic() -> str:
     return random.choice(RANDOM_TOPICS)
 
 
-def generate_script(topic: str) -> dict:
-    """
-    Generate a brainrot video script for the given topic.
+def _system(inline: bool) -> dict:
+    """Config kwargs supplying SYSTEM_PROMPT, via the context cache if possible."""
+    if inline:
+        return {"system_instruction": SYSTEM_PROMPT}
+    return context_config(SCRIPT_MODEL, SYSTEM_PROMPT)
 
-    Args:
-        topic: The brainrot topic to write about.
 
-    Returns:
-        Parsed JSON dict with title and scenes list.
-    """
-    client = _get_client()
+def _request(topic: str, inline: bool = False) -> dict:
+    """Return the ``generate_content`` keyword arguments for *topic*."""
+    # Imported here so topic picking and the constants above stay cheap to
+    # import for the CLI.
+    from google.genai import types
 
-    response = client.models.generate_content(
+    return dict(
         model=SCRIPT_MODEL,
         contents=f"Write a brainrot video script about: {topic}",
         config=types.GenerateContentConfig(
-            system_instruction=SYSTEM_PROMPT,
+            **_system(inline),
             temperature=1.0,
             max_output_tokens=2048,
+            response_mime_type="application/json",
+            response_schema=SCRIPT_SCHEMA,
+        ),
+    )
+
+
+def _repair_request(
+    contents: str, schema: dict, max_tokens: int, inline: bool = False
+) -> dict:
+    """Return ``generate_content`` kwargs for a low-temperature repair call."""
+    from google.genai import types
+
+    return dict(
+        model=SCRIPT_MODEL,
+        contents=contents,
+        config=types.GenerateContentConfig(
+            **_system(inline),
+            temperature=0.2,
+            max_output_tokens=max_tokens,
+            response_mime_type="application/json",
+            response_schema=schema,
         ),
     )
 
-    raw = response.text.strip()
+
+def _send(build: Callable[[bool], dict], name: str, **args):
+    """
+    Send the request made by ``build(inline)`` and record its token usage.
+
+    If the context-cache handle is rejected (e.g. it expired early), the
+    handle is dropped and the request is resent with the prompt inline.
+    """
+    client = get_client()
+    request = build(False)
+    with span(name, cat="gemini", model=SCRIPT_MODEL, **args) as info:
+        start = time.perf_counter()
+        try:
+            response = client.models.generate_content(**request)
+        except Exception as exc:
+            if is_throttle(exc) or not request["config"].cached_content:
+                raise
+            drop_context(SCRIPT_MODEL, SYSTEM_PROMPT)
+            request = build(True)
+            start = time.perf_counter()
+            response = client.models.generate_content(**request)
+        record_usage(response, request["config"], time.perf_counter() - start, info)
+    return response
+
+
+def _parse(text: str) -> dict:
+    """Parse a script from the model's response text."""
+    raw = text.strip()
     # Strip markdown code fences if present
     if raw.startswith("```"):
         raw = raw.split("\n", 1)[1]
@@ -116,3 +229,487 @@ def generate_script(topic: str) -> dict:
 
     script = json.loads(raw)
     return script
+
+
+def _scene_problems(scene) -> list[str]:
+    """Return what is wrong with one scene (empty if it is usable)."""
+    if not isinstance(scene, dict):
+        return ["not an object"]
+    problems = []
+    if not isinstance(scene.get("scene_id"), int):
+        problems.append("'scene_id' must be an integer")
+    for field in ("narration", "image_prompt"):
+        value = scene.get(field)
+        if not isinstance(value, str) or not value.strip():
+            problems.append(f"'{field}' must be a non-empty string")
+    elements = scene.get("math_elements", [])
+    if not isinstance(elements, list) or not all(
+        isinstance(e, str) for e in elements
+    ):
+        problems.append("'math_elements' must be a list of strings")
+    if not isinstance(scene.get("duration_hint", DEFAULT_DURATION_HINT), int):
+        problems.append("'duration_hint' must be an integer")
+    return problems
+
+
+def validate_script(script) -> list[str]:
+    """
+    Check *script* against :data:`SCRIPT_SCHEMA`.
+
+    Returns:
+        Human-readable problems, empty if the script is valid.
+    """
+    if not isinstance(script, dict):
+        return ["script must be a JSON object"]
+    problems = []
+    if not isinstance(script.get("title"), str) or not script["title"].strip():
+        problems.append("'title' must be a non-empty string")
+    scenes = script.get("scenes")
+    if not isinstance(scenes, list) or not scenes:
+        return problems + ["'scenes' must be a non-empty list"]
+    for idx, scene in enumerate(scenes):
+        problems += [f"scene {idx + 1}: {p}" for p in _scene_problems(scene)]
+    ids = [s.get("scene_id") for s in scenes if isinstance(s, dict)]
+    if len(set(map(str, ids))) != len(ids):
+        problems.append("'scene_id' values must be unique")
+    return problems
+
+
+def _free_id(used: set[int]) -> int:
+    """Claim and return the smallest positive scene id not in *used*."""
+    scene_id = 1
+    while scene_id in used:
+        scene_id += 1
+    used.add(scene_id)
+    return scene_id
+
+
+def _patch_scene(scene: dict, used: set[int]) -> dict:
+    """
+    Fill in the fields of *scene* that have safe local defaults.  A missing
+    ``scene_id`` becomes the smallest id not in *used* (the ids already
+    taken), so it cannot collide with one the model chose.
+    """
+    scene = dict(scene)
+    if not isinstance(scene.get("scene_id"), int):
+        scene["scene_id"] = _free_id(used)
+    if not isinstance(scene.get("math_elements"), list):
+        scene["math_elements"] = []
+    scene["math_elements"] = [str(e) for e in scene["math_elements"]]
+    if not isinstance(scene.get("duration_hint", DEFAULT_DURATION_HINT), int):
+        scene["duration_hint"] = DEFAULT_DURATION_HINT
+    return scene
+
+
+def _repair_scene(
+    topic: str, script: dict, idx: int, scene_id: int, problems: list[str]
+) -> dict:
+    """Ask Gemini to rewrite only scene *idx* of *script* as *scene_id*."""
+    scenes = script["scenes"]
+    context = [
+        s.get("narration")
+        for i, s in enumerate(scenes)
+        if i != idx and isinstance(s, dict)
+    ]
+    contents = (
+        f"Topic: {topic}\n"
+        f"Scene {idx + 1} of {len(scenes)} in this brainrot script is invalid "
+        f"({'; '.join(problems)}):\n{json.dumps(scenes[idx])}\n"
+        f"Narration of the other scenes, for continuity: {json.dumps(context)}\n"
+        f"Return only the corrected scene with scene_id {scene_id}."
+    )
+    response = _send(
+        lambda inline: _repair_request(contents, SCENE_SCHEMA, 512, inline),
+        "gemini.script_repair",
+        part="scene",
+    )
+    return _parse(response.text)
+
+
+def _repair_json(text: str, error: json.JSONDecodeError) -> dict:
+    """Ask Gemini to fix the syntax of a malformed script document."""
+    contents = (
+        f"This brainrot script is not valid JSON ({error}). Fix the syntax "
+        f"without changing its content and return the script:\n{text}"
+    )
+    response = _send(
+        lambda inline: _repair_request(contents, SCRIPT_SCHEMA, 2048, inline),
+        "gemini.script_repair",
+        part="json",
+    )
+    return _parse(response.text)
+
+
+def _finish(topic: str, text: str) -> dict:
+    """
+    Parse and validate a script response, repairing what is broken.
+
+    Malformed JSON is sent back for a syntax fix, missing or repeated ids,
+    elements and hints are filled in locally, and only scenes whose narration or image
+    prompt is unusable are regenerated — each with its own small request —
+    rather than paying for a whole new script.
+
+    Raises:
+        ValueError: If the script is still invalid after repair.
+    """
+    try:
+        script = _parse(text)
+    except json.JSONDecodeError as exc:
+        print(f"  🩹 Script JSON is malformed ({exc.msg}); repairing it …")
+        script = _repair_json(text, exc)
+
+    if isinstance(script, dict) and isinstance(script.get("scenes"), list):
+        if not isinstance(script.get("title"), str) or not script["title"].strip():
+            script["title"] = topic
+        scenes = script["scenes"]
+        used = {
+            s["scene_id"]
+            for s in scenes
+            if isinstance(s, dict) and isinstance(s.get("scene_id"), int)
+        }
+        seen: set[int] = set()
+        for idx, scene in enumerate(scenes):
+            if isinstance(scene, dict):
+                if isinstance(scene.get("scene_id"), int) and scene["scene_id"] in seen:
+                    # A repeated id: the first scene keeps it, this one is
+                    # renumbered like a missing id.
+                    scene = {**scene, "scene_id": None}
+                scenes[idx] = scene = _patch_scene(scene, used)
+                scene_id = scene["scene_id"]
+            else:
+                scene_id = _free_id(used)
+            seen.add(scene_id)
+            problems = _scene_problems(scene)
+            if problems:
+                print(f"  🩹 Scene {idx + 1} is invalid; regenerating only it …")
+                repaired = _repair_scene(topic, script, idx, scene_id, problems)
+                if isinstance(repaired, dict):
+                    repaired["scene_id"] = scene_id
+                    scenes[idx] = _patch_scene(repaired, used)
+
+    problems = validate_script(script)
+    if problems:
+        raise ValueError("Invalid script from Gemini: " + "; ".join(problems))
+    return script
+
+
+def generate_script(topic: str) -> dict:
+    """
+    Generate a brainrot video script for the given topic.
+
+    The response is constrained to :data:`SCRIPT_SCHEMA` and validated;
+    broken parts are repaired with small targeted requests.
+
+    Args:
+        topic: The brainrot topic to write about.
+
+    Returns:
+        Parsed JSON dict with title and scenes list.
+
+    Raises:
+        ValueError: If the script cannot be repaired.
+    """
+    response = _send(lambda inline: _request(topic, inline), "gemini.script")
+    return _finish(topic, response.text)
+
+
+# ---------------------------------------------------------------------------
+# Streaming
+# ---------------------------------------------------------------------------
+_TITLE_RE = re.compile(r'"title"\s*:\s*("(?:[^"\\]|\\.)*")')
+
+
+class SceneStreamParser:
+    """
+    Incremental parser that pulls complete scene objects out of a partial
+    script JSON document.
+
+    Feed it text as it arrives; :meth:`feed` returns the scenes whose
+    closing brace has just been seen.  Only the ``scenes`` array of the
+    top-level object is tracked, so code fences or chatter around the JSON
+    are ignored.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = -1
+        self._last_key = None
+        self._in_scenes = False
+        self._scene_start = -1
+
+    @property
+    def title(self) -> str | None:
+        """The script title, once it has streamed in."""
+        match = _TITLE_RE.search(self.text)
+        return json.loads(match.group(1)) if match else None
+
+    def feed(self, chunk: str) -> list[dict]:
+        """Consume *chunk* and return any scenes it completed."""
+        self.text += chunk
+        scenes = []
+        text = self.text
+        for i in range(self._pos, len(text)):
+            ch = text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._last_key = json.loads(text[self._string_start : i + 1])
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                self._string_start = i
+            elif ch in "{[":
+                if ch == "[" and self._depth == 1 and self._last_key == "scenes":
+                    self._in_scenes = True
+                elif ch == "{" and self._depth == 2 and self._in_scenes:
+                    self._scene_start = i
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if ch == "}" and self._depth == 2 and self._scene_start >= 0:
+                    try:
+                        scenes.append(json.loads(text[self._scene_start : i + 1]))
+                    except json.JSONDecodeError:
+                        pass  # left for whole-document parsing to report
+                    self._scene_start = -1
+                elif ch == "]" and self._depth == 1:
+                    self._in_scenes = False
+        self._pos = len(text)
+        return scenes
+
+
+class ScriptStream:
+    """
+    A script being streamed from Gemini.
+
+    Iterating yields each scene dict as soon as it is complete and valid;
+    afterwards :meth:`result` returns the whole validated script.  Yielding
+    stops at the first scene that needs repair or repeats an earlier id, so
+    the scenes seen so far are always a prefix of :meth:`result`'s.
+    """
+
+    def __init__(self, chunks: Iterable[str], topic: str = ""):
+        self._chunks = chunks
+        self._topic = topic
+        self._parser = SceneStreamParser()
+        self._done = False
+        self._script = None
+
+    def __iter__(self) -> Iterator[dict]:
+        if self._done:
+            raise RuntimeError("ScriptStream can only be iterated once")
+        held, ids = False, set()
+        for chunk in self._chunks:
+            for scene in self._parser.feed(chunk):
+                held = held or bool(_scene_problems(scene))
+                held = held or scene["scene_id"] in ids
+                if not held:
+                    ids.add(scene["scene_id"])
+                    yield scene
+        self._done = True
+
+    @property
+    def title(self) -> str | None:
+        """The script title, once it has streamed in."""
+        return self._parser.title
+
+    def result(self) -> dict:
+        """Return the complete script (consuming any remaining stream)."""
+        if self._script is None:
+            if not self._done:
+                for _ in self:
+                    pass
+            self._script = _finish(self._topic, self._parser.text)
+        return self._script
+
+
+def stream_script(topic: str) -> ScriptStream:
+    """
+    Stream a brainrot video script for *topic*.
+
+    Uses the streaming ``generate_content`` API so callers can start
+    image generation and TTS for scene 1 while later scenes are still being
+    written.  As in :func:`_send`, a rejected context-cache handle is
+    dropped and the request restarted with the prompt inline; a handle is
+    rejected before the first chunk, so nothing has been yielded yet.
+
+    Args:
+        topic: The brainrot topic to write about.
+
+    Returns:
+        A :class:`ScriptStream` yielding scene dicts as they complete.
+    """
+    client = get_client()
+
+    def _open(request: dict) -> Iterator:
+        # Pull the first chunk so a rejected request fails here.
+        stream = iter(client.models.generate_content_stream(**request))
+        first = next(stream, None)
+        return itertools.chain([] if first is None else [first], stream)
+
+    def _chunks() -> Iterator[str]:
+        request = _request(topic)
+        with span("gemini.script_stream", cat="gemini", model=SCRIPT_MODEL) as info:
+            start = time.perf_counter()
+            try:
+                stream = _open(request)
+            except Exception as exc:
+                if is_throttle(exc) or not request["config"].cached_content:
+                    raise
+                drop_context(SCRIPT_MODEL, SYSTEM_PROMPT)
+                request = _request(topic, inline=True)
+                start = time.perf_counter()
+                stream = _open(request)
+            chunk = None
+            for chunk in stream:
+                if chunk.text:
+                    yield chunk.text
+            # Usage totals arrive with the final chunk.
+            seconds = time.perf_counter() - start
+            record_usage(chunk, request["config"], seconds, info)
+
+    return ScriptStream(_chunks(), topic)
+
+
+# ---------------------------------------------------------------------------
+# Long-form
+# ---------------------------------------------------------------------------
+def _outline_request(topic: str, n_acts: int) -> dict:
+    """
+    Return ``generate_content`` kwargs for a long-form outline.  The outline
+    prompt is short, so it is always sent inline rather than context-cached.
+    """
+    from google.genai import types
+
+    return dict(
+        model=SCRIPT_MODEL,
+        contents=f"Outline a {n_acts}-act brainrot video about: {topic}",
+        config=types.GenerateContentConfig(
+            system_instruction=OUTLINE_PROMPT,
+            temperature=1.0,
+            max_output_tokens=2048,
+            response_mime_type="application/json",
+            response_schema=OUTLINE_SCHEMA,
+        ),
+    )
+
+
+def _act_request(
+    outline: dict, idx: int, n_scenes: int, inline: bool = False
+) -> dict:
+    """Return ``generate_content`` kwargs expanding act *idx* into scenes."""
+    from google.genai import types
+
+    acts = outline["acts"]
+    act = acts[idx]
+    if idx == 0:
+        position = "It opens the video."
+    elif idx == len(acts) - 1:
+        position = "It is the finale."
+    else:
+        position = "It continues from the previous act."
+    contents = (
+        f"Write act {idx + 1} of {len(acts)} of a long-form brainrot video "
+        f"titled {outline['title']!r}. {position}\n"
+        f"Act summary: {act['summary']}\n"
+        f"Beats: {json.dumps(act['beats'])}\n"
+        f"Previous act: {acts[idx - 1]['summary'] if idx else 'none'}\n"
+        f"Next act: {acts[idx + 1]['summary'] if idx + 1 < len(acts) else 'none'}\n"
+        f"This act needs exactly {n_scenes} scenes (this overrides the 5-7 "
+        "scene rule). Number them from 1; use the video title as the title."
+    )
+    return dict(
+        model=SCRIPT_MODEL,
+        contents=contents,
+        config=types.GenerateContentConfig(
+            **_system(inline),
+            temperature=1.0,
+            max_output_tokens=max(2048, 256 * n_scenes),
+            response_mime_type="application/json",
+            response_schema=SCRIPT_SCHEMA,
+        ),
+    )
+
+
+def plan_acts(minutes: float) -> list[int]:
+    """
+    Return the scene count of each act for a video of about *minutes*.
+
+    Scenes are split as evenly as possible into acts of at most
+    :data:`SCENES_PER_ACT`.
+    """
+    total = max(1, round(minutes * SCENES_PER_MINUTE))
+    n_acts = -(-total // SCENES_PER_ACT)
+    return [total // n_acts + (i < total % n_acts) for i in range(n_acts)]
+
+
+def merge_acts(title: str, acts: list[dict]) -> dict:
+    """
+    Concatenate per-act scripts into one ``{"title", "scenes"}`` script,
+    renumbering ``scene_id`` from 1.
+    """
+    scenes = []
+    for act in acts:
+        for scene in act["scenes"]:
+            scenes.append({**scene, "scene_id": len(scenes) + 1})
+    return {"title": title, "scenes": scenes}
+
+
+def generate_long_script(
+    topic: str, minutes: float, concurrency: int = ACT_CONCURRENCY
+) -> dict:
+    """
+    Generate a long-form script (several minutes) for *topic*.
+
+    An outline of acts is written first; every act is then expanded into
+    scenes concurrently, so total latency is the outline plus the slowest
+    act rather than the sum of all acts.  Each act is validated and
+    repaired like a normal script.
+
+    Args:
+        topic: The brainrot topic to write about.
+        minutes: Approximate target length of the video.
+        concurrency: Maximum act expansions in flight.
+
+    Returns:
+        Parsed JSON dict with title and scenes list, in the same format as
+        :func:`generate_script`.
+    """
+    sizes = plan_acts(minutes)
+    response = _send(
+        lambda _inline: _outline_request(topic, len(sizes)),
+        "gemini.script_outline",
+        acts=len(sizes),
+    )
+    outline = _parse(response.text)
+    acts = outline.get("acts") if isinstance(outline, dict) else None
+    if not isinstance(acts, list) or len(acts) < len(sizes):
+        raise ValueError(
+            f"Outline for {topic!r} has {len(acts or [])} acts, "
+            f"expected {len(sizes)}"
+        )
+    outline["acts"] = acts[: len(sizes)]
+    outline["title"] = outline.get("title") or topic
+
+    def _expand(idx: int) -> dict:
+        response = _send(
+            lambda inline: _act_request(outline, idx, sizes[idx], inline),
+            "gemini.script_act",
+            act=idx + 1,
+        )
+        return _finish(topic, response.text)
+
+    print(f"  Expanding {len(sizes)} acts ({sum(sizes)} scenes) …")
+    with ThreadPoolExecutor(max(1, min(concurrency, len(sizes)))) as pool:
+        expanded = list(pool.map(_expand, range(len(sizes))))
+    return merge_acts(outline["title"], expanded)
@@ -0,0 +1,158 @@
+"""
+Streaming - Per-scene pipeline without whole-video stage barriers.
+===================================================================
+Instead of waiting for every scene to clear a stage before the next stage
+starts, each scene flows through image → render and TTS → transcription on
+its own.  Scene 1 can be voiced, transcribed and rendered into its own
+segment while scene 3's image is still being generated; the segments are
+stitched by the compositor at the end.
+
+The script itself may still be streaming in: given a
+:class:`~brainrot.script_writer.ScriptStream`, image and TTS work for each
+scene starts as soon as that scene's JSON object is complete.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable
+
+from brainrot.cache import ArtifactCache, cache_key, hash_file
+from brainrot.image_generator import IMAGE_CONCURRENCY, generate_scene_image
+from brainrot.renderer import MANIM_VERSION, render_segment
+from brainrot.script_writer import ScriptStream
+from brainrot.transcriber import transcribe_scene
+from brainrot.tts_engine import get_workers, preload, synthesize_scene
+
+
+def render_scene_segment(
+    script: dict,
+    idx: int,
+    image_path: str,
+    output_dir: str,
+    cache: ArtifactCache | None,
+) -> str:
+    """
+    Render scene *idx* into its own segment, consulting *cache* first.
+
+    Segments are named after the scene's ``scene_id``.  Besides the scene
+    itself, a segment only depends on whether it is the first scene (intro
+    flash) or the last (singularity finale), so that is all the cache key
+    records about its position.
+    """
+    scenes = script["scenes"]
+    name = f"BrainrotSegment_{scenes[idx]['scene_id']}"
+    key = None
+    if cache is not None:
+        key = cache_key(
+            "segment",
+            MANIM_VERSION,
+            scenes[idx],
+            idx == 0,
+            idx == len(scenes) - 1,
+            hash_file(image_path) if os.path.exists(image_path) else None,
+        )
+        hit = cache.fetch(key, os.path.join(output_dir, "segments", f"{name}.mp4"))
+        if hit:
+            print(f"  Reusing cached segment for scene {idx + 1}")
+            return hit
+
+    print(f"  Rendering segment for scene {idx + 1} …")
+    image_paths = [""] * len(scenes)
+    image_paths[idx] = image_path
+    path = render_segment(script, image_paths, [idx], output_dir, name)
+    if key is not None:
+        cache.store(key, path)
+    return path
+
+
+def stream_scenes(
+    script: dict | ScriptStream,
+    assets_dir: str,
+    audio_dir: str,
+    media_dir: str,
+    cache: ArtifactCache | None = None,
+    image_concurrency: int = IMAGE_CONCURRENCY,
+    image_fn: Callable[[dict, str, ArtifactCache | None], str] = generate_scene_image,
+) -> tuple[list[str], list[str], list[str], list[dict]]:
+    """
+    Run images, TTS, transcription and rendering per scene, concurrently.
+
+    Images are requested up to *image_concurrency* at a time, TTS runs on
+    its own worker, transcription follows each scene's TTS clip, and the
+    calling thread renders segments in whatever order their images arrive
+    (Manim's global config allows only one render at a time anyway).
+
+    When *script* is a :class:`ScriptStream`, scenes are dispatched as they
+    stream in (any that needed repair once the stream is finished);
+    rendering starts once the whole script has arrived, since a segment
+    needs to know whether its scene is the last one.
+
+    Args:
+        script: The parsed script dict, or a script still streaming in
+            (both from script_writer).
+        assets_dir: Directory for generated scene images.
+        audio_dir: Directory for TTS WAV files.
+        media_dir: Directory for Manim media output.
+        cache: Optional artifact cache shared by every per-scene step.
+        image_concurrency: Maximum image requests in flight.
+        image_fn: Per-scene image backend, called as
+            ``image_fn(scene, assets_dir, cache)``.
+
+    Returns:
+        ``(segment_paths, image_paths, tts_paths, transcriptions)``, each in
+        scene order.
+    """
+    scenes: list[dict] = []
+    image_futs = {}
+    tts_futs, asr_futs = [], []
+
+    with (
+        ThreadPoolExecutor(max(1, image_concurrency)) as image_pool,
+        ThreadPoolExecutor(get_workers()) as tts_pool,
+        ThreadPoolExecutor(1) as asr_pool,
+    ):
+
+        # One model replica per TTS thread; copying them overlaps with the
+        # first Gemini chunks instead of delaying them.
+        tts_pool.submit(preload, get_workers())
+
+        def _transcribe(i: int) -> dict:
+            return transcribe_scene(tts_futs[i].result(), i + 1, cache)
+
+        def _dispatch(scene: dict):
+            idx = len(scenes)
+            scenes.append(scene)
+            fut = image_pool.submit(image_fn, scene, assets_dir, cache)
+            image_futs[fut] = idx
+            tts_futs.append(tts_pool.submit(synthesize_scene, scene, audio_dir, cache))
+            asr_futs.append(asr_pool.submit(_transcribe, idx))
+
+        try:
+            if isinstance(script, dict):
+                for scene in script["scenes"]:
+                    _dispatch(scene)
+            else:
+                for scene in script:
+                    _dispatch(scene)
+                # Scenes held back for repair are dispatched from the
+                # finished script.
+                script = script.result()
+                for scene in script["scenes"][len(scenes) :]:
+                    _dispatch(scene)
+
+            segments: list[str] = [""] * len(scenes)
+            image_paths: list[str] = [""] * len(scenes)
+            for fut in as_completed(image_futs):
+                idx = image_futs[fut]
+                image_paths[idx] = fut.result()
+                segments[idx] = render_scene_segment(
+                    script, idx, image_paths[idx], media_dir, cache
+                )
+            tts_paths = [f.result() for f in tts_futs]
+            transcriptions = [f.result() for f in asr_futs]
+        except BaseException:
+            for f in (*image_futs, *tts_futs, *asr_futs):
+                f.cancel()
+            raise
+
+    return segments, image_paths, tts_paths, transcriptions
@@ -0,0 +1,234 @@
+"""
+Tracing - Span recording with Chrome trace-event output.
+=========================================================
+Records a span for every pipeline stage and every per-scene step inside it
+(Gemini requests, TTS inference, Whisper, Manim animations, MoviePy encode)
+together with bytes written and the process's peak RSS.  Spans can be
+written as Chrome trace-event JSON (open in ``chrome://tracing`` or
+Perfetto) and summarised as a per-span table.
+
+Spans inside an asyncio task get the task's own track, so concurrent
+requests on the shared event loop show up side by side instead of
+overlapping on the loop thread.  Worker processes record into their own
+copy of the buffer; they hand it back with :func:`drain` and the parent
+merges it with :func:`add_events`.
+
+Tracing is off by default and :func:`span` is then a near no-op.
+"""
+
+import json
+import os
+import resource
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+_enabled = False
+_events: list[dict] = []
+_tracks: dict[tuple[int, int], str] = {}  # (pid, tid) -> track label
+_lock = threading.Lock()
+_t0 = time.perf_counter()
+
+
+def enable():
+    """Start recording spans (clears anything recorded before)."""
+    global _enabled, _t0
+    with _lock:
+        _events.clear()
+        _tracks.clear()
+        _t0 = time.perf_counter()
+        _enabled = True
+
+
+def disable():
+    """Stop recording spans; what was recorded is kept."""
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    """Return True while spans are being recorded."""
+    return _enabled
+
+
+def peak_rss_mb() -> float:
+    """Return the process's peak resident set size in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and KiB on Linux.
+    return peak / 1024**2 if sys.platform == "darwin" else peak / 1024
+
+
+def file_size(path: str) -> int:
+    """Return the size of *path* in bytes (0 if it does not exist)."""
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def _track() -> tuple[int, str]:
+    """Return the caller's track id and label: its asyncio task, else thread."""
+    # Only look for a task if asyncio is loaded; otherwise there is none.
+    asyncio = sys.modules.get("asyncio")
+    if asyncio is not None:
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:  # no running loop in this thread
+            task = None
+        if task is not None:
+            return id(task), task.get_name()
+    return threading.get_ident(), threading.current_thread().name
+
+
+@contextmanager
+def span(name: str, cat: str = "pipeline", **args: Any):
+    """
+    Record the enclosed block as a span.
+
+    Yields a dict of span arguments that the block may add to, e.g.
+    ``info["bytes"] = file_size(path)``; ``bytes`` values are summed in
+    :func:`summary`.
+    """
+    if not _enabled:
+        yield args
+        return
+
+    tid, label = _track()
+    start = time.perf_counter()
+    try:
+        yield args
+    except BaseException as exc:
+        args["error"] = repr(exc)
+        raise
+    finally:
+        end = time.perf_counter()
+        args["peak_rss_mb"] = round(peak_rss_mb(), 1)
+        pid = os.getpid()
+        event = {
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "ts": (start - _t0) * 1e6,
+            "dur": (end - start) * 1e6,
+            "pid": pid,
+            "tid": tid,
+            "args": args,
+        }
+        with _lock:
+            _events.append(event)
+            _tracks.setdefault((pid, tid), label)
+
+
+def events() -> list[dict]:
+    """Return a copy of the recorded span events."""
+    with _lock:
+        return list(_events)
+
+
+def drain() -> list[dict]:
+    """
+    Remove and return the recorded span events.
+
+    Used by forked worker processes to send their spans to the parent with
+    each result; the parent passes them to :func:`add_events`.  Timestamps
+    stay comparable because the fork inherits the parent's start time.
+    """
+    with _lock:
+        drained = list(_events)
+        _events.clear()
+    return drained
+
+
+def add_events(new: list[dict]):
+    """Merge span events recorded in another process (see :func:`drain`)."""
+    if not new or not _enabled:
+        return
+    with _lock:
+        _events.extend(new)
+
+
+def write_chrome_trace(path: str) -> str:
+    """
+    Write recorded spans as Chrome trace-event JSON.
+
+    Returns:
+        Absolute path of the written trace.
+    """
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with _lock:
+        labels = dict(_tracks)
+    names = {}
+    for ev in events():
+        track = ev["pid"], ev["tid"]
+        if track not in names:
+            names[track] = labels.get(track) or f"thread-{len(names)}"
+    meta = [
+        {
+            "name": "thread_name",
+            "ph": "M",
+            "pid": pid,
+            "tid": tid,
+            "args": {"name": label},
+        }
+        for (pid, tid), label in names.items()
+    ]
+    with open(path, "w") as f:
+        json.dump(
+            {"traceEvents": meta + events(), "displayTimeUnit": "ms"},
+            f,
+            default=str,
+        )
+    return os.path.abspath(path)
+
+
+def _wall(intervals: list[tuple[float, float]]) -> float:
+    """Length of the union of ``(start, end)`` intervals."""
+    total, reach = 0.0, float("-inf")
+    for start, end in sorted(intervals):
+        if end > reach:
+            total += end - max(start, reach)
+            reach = end
+    return total
+
+
+def summary() -> str:
+    """
+    Return a per-span table: count, wall-clock/mean/max seconds and bytes.
+
+    Wall-clock time is the union of a span's intervals, so spans running
+    concurrently (parallel images, TTS replicas) are not counted twice.
+    """
+    rows: dict[tuple[str, str], dict] = {}
+    for ev in events():
+        row = rows.setdefault(
+            (ev["cat"], ev["name"]),
+            {"count": 0, "total": 0.0, "max": 0.0, "bytes": 0, "spans": []},
+        )
+        dur = ev["dur"] / 1e6
+        row["count"] += 1
+        row["total"] += dur
+        row["max"] = max(row["max"], dur)
+        row["bytes"] += ev["args"].get("bytes", 0)
+        row["spans"].append((ev["ts"] / 1e6, ev["ts"] / 1e6 + dur))
+    for row in rows.values():
+        row["wall"] = _wall(row.pop("spans"))
+
+    if not rows:
+        return "   (no spans recorded)"
+
+    width = max(len(f"{cat}/{name}") for cat, name in rows)
+    lines = [
+        f"   {'span':<{width}}  {'n':>4}  {'wall':>8}  {'mean':>7}"
+        f"  {'max':>7}  {'MiB out':>8}"
+    ]
+    for (cat, name), r in sorted(rows.items(), key=lambda kv: -kv[1]["wall"]):
+        lines.append(
+            f"   {cat + '/' + name:<{width}}  {r['count']:>4}  {r['wall']:>7.2f}s"
+            f"  {r['total'] / r['count']:>6.2f}s  {r['max']:>6.2f}s"
+            f"  {r['bytes'] / 1024**2:>8.1f}"
+        )
+    lines.append(f"   peak RSS: {peak_rss_mb():.0f} MiB")
+    return "\n".join(lines)
@@ -3,45 +3,102 @@ Transcriber - Word-level transcription using MLX-Whisper.
 ==========================================================
 Uses mlx-whisper with the ``whisper-large-v3-turbo`` model (optimised for
 Apple Silicon) to produce word-level timestamps for caption sync.
+
+Audio may be a file path or an in-memory
+:class:`~brainrot.audio.AudioBuffer`, which is resampled to Whisper's
+16 kHz and passed as an array, skipping the ffmpeg decode.
 """
 
+import mlx.core as mx
 import mlx_whisper
+from mlx_whisper.transcribe import ModelHolder
+
+from brainrot.audio import AudioBuffer
+from brainrot.cache import ArtifactCache, cache_key, hash_file
+from brainrot.tracing import span
 
 # HuggingFace repo for the MLX-optimised large model.
 MODEL_REPO = "mlx-community/whisper-large-v3-turbo"
+WHISPER_RATE = 16000  # sample rate Whisper expects for array input
+
+
+def preload():
+    """
+    Load the Whisper weights now.
+
+    mlx-whisper keeps the most recently used model in ``ModelHolder``, so
+    every later :func:`transcribe` call in this process reuses it.
+    """
+    ModelHolder.get_model(MODEL_REPO, mx.float16)
 
 
-def transcribe(audio_path: str) -> dict:
+def transcribe(audio: str | AudioBuffer) -> dict:
     """
-    Transcribe an audio file and return word-level timestamps.
+    Transcribe audio and return word-level timestamps.
 
     Args:
-        audio_path: Path to a WAV/MP3 file.
+        audio: Path to a WAV/MP3 file, or an in-memory buffer.
 
     Returns:
         The full mlx-whisper result dict containing ``text`` and ``segments``
         (each segment has a ``words`` list when ``word_timestamps=True``).
     """
+    if isinstance(audio, AudioBuffer):
+        audio = audio.resampled(WHISPER_RATE).samples
     result = mlx_whisper.transcribe(
-        audio_path,
+        audio,
         path_or_hf_repo=MODEL_REPO,
         word_timestamps=True,
     )
     return result
 
 
-def transcribe_scenes(audio_paths: list[str]) -> list[dict]:
+def transcribe_scene(
+    audio: str | AudioBuffer,
+    scene_num: int,
+    cache: ArtifactCache | None = None,
+) -> dict:
+    """
+    Transcribe one scene's audio, consulting *cache* first.
+
+    Args:
+        audio: Path to the scene's WAV/MP3 file, or its buffer.
+        scene_num: 1-based scene number (for progress output).
+        cache: Optional artifact cache; results are keyed by model and the
+            audio's content hash (the same for a buffer and its WAV file).
+
+    Returns:
+        The mlx-whisper result dict for the scene.
+    """
+    key = None
+    if cache is not None:
+        digest = audio.digest() if isinstance(audio, AudioBuffer) else hash_file(audio)
+        key = cache_key("transcribe", MODEL_REPO, digest)
+        hit = cache.load_json(key)
+        if hit is not None:
+            print(f"  Reusing cached transcription for scene {scene_num}")
+            return hit
+    print(f"  Transcribing scene {scene_num} …")
+    with span("whisper", cat="scene", scene=scene_num):
+        result = transcribe(audio)
+    if key is not None:
+        cache.save_json(key, result)
+    return result
+
+
+def transcribe_scenes(
+    audios: list[str | AudioBuffer],
+    cache: ArtifactCache | None = None,
+) -> list[dict]:
     """
-    Transcribe a list of audio files (one per scene).
+    Transcribe each scene's audio.
 
     Args:
-        audio_paths: Ordered list of audio file paths.
+        audios: Ordered audio file paths or buffers (one per scene).
+        cache: Optional artifact cache; results are keyed by model and the
+            audio's content hash.
 
     Returns:
         List of transcription result dicts (one per scene).
     """
-    results: list[dict] = []
-    for i, path in enumerate(audio_paths, 1):
-        print(f"  Transcribing scene {i} …")
-        results.append(transcribe(path))
-    return results
+    return [transcribe_scene(audio, i, cache) for i, audio in enumerate(audios, 1)]
@@ -0,0 +1,131 @@
+"""
+TTS Cache - Sentence-level cache of synthesized speech.
+========================================================
+Narrations repeat themselves across videos — stock hooks, sign-offs, the
+same punchline in a re-cut scene — so speech is cached one sentence at a
+time rather than one whole narration at a time.  A scene's audio is then
+assembled from cached sentences plus freshly synthesized ones, and a
+narration that only partly matches an earlier one still reuses the
+overlapping sentences.
+
+Entries are keyed by normalized sentence text, voice and model version,
+stored as ``.npy`` blobs in an :class:`~brainrot.cache.ArtifactCache` with
+its own byte budget (least recently used sentences are evicted first).
+"""
+
+import io
+import re
+import threading
+from typing import TYPE_CHECKING
+
+from brainrot.cache import ArtifactCache, cache_key
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+DEFAULT_MAX_BYTES = 512 * 1024**2  # 512 MiB
+
+# A sentence ends at . ! ? or … followed by whitespace and something that
+# starts a new sentence, so "been… educational" and "e.g. this" stay whole.
+_SENTENCE_END = re.compile(
+    r"(?:(?<=[.!?…])|(?<=[.!?…][\"')\]]))\s+(?=[\"'(\[]?[A-Z0-9])"
+)
+_QUOTES = str.maketrans({"‘": "'", "’": "'", "“": '"', "”": '"'})
+
+_active: "SentenceCache | None" = None
+
+
+def normalize(sentence: str) -> str:
+    """Canonical form of *sentence* for cache keys (spacing, quotes, ``...``)."""
+    text = " ".join(sentence.split()).translate(_QUOTES)
+    return text.replace("...", "…")
+
+
+def split_sentences(text: str) -> list[str]:
+    """Split *text* into normalized, non-empty sentences."""
+    return [s for s in (normalize(p) for p in _SENTENCE_END.split(text)) if s]
+
+
+class SentenceCache(ArtifactCache):
+    """
+    Sentence clips (float sample arrays) with hit-rate statistics.
+
+    Args:
+        root: Directory holding the entries.
+        max_bytes: Size cap; least recently used sentences are evicted.
+    """
+
+    def __init__(self, root: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        super().__init__(root, max_bytes)
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.seconds_reused = 0.0
+
+    @staticmethod
+    def key(sentence: str, voice: str, model_version: str) -> str:
+        """Cache key for *sentence* spoken by *voice* on *model_version*."""
+        return cache_key("tts-sentence", model_version, voice, normalize(sentence))
+
+    def get(self, key: str, sample_rate: int) -> "np.ndarray | None":
+        """Return the clip stored under *key*, or None (counted as a miss)."""
+        import numpy as np
+
+        data = self.load_bytes(key)
+        audio = None
+        if data is not None:
+            try:
+                audio = np.load(io.BytesIO(data), allow_pickle=False)
+            except ValueError:  # truncated entry
+                audio = None
+        with self._stats_lock:
+            if audio is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.seconds_reused += len(audio) / sample_rate
+        return audio
+
+    def put(self, key: str, audio: "np.ndarray"):
+        """Store *audio* under *key*."""
+        import numpy as np
+
+        buf = io.BytesIO()
+        np.save(buf, audio, allow_pickle=False)
+        self.save_bytes(key, buf.getvalue())
+
+    def stats(self) -> dict:
+        """Lookups so far: hits, misses, hit rate and seconds of audio reused."""
+        with self._stats_lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "seconds_reused": self.seconds_reused,
+            }
+
+    def summary(self) -> str | None:
+        """One-line summary of :meth:`stats`, or None before any lookup."""
+        s = self.stats()
+        if not s["hits"] + s["misses"]:
+            return None
+        return (
+            f"   {s['hits']} of {s['hits'] + s['misses']} sentences reused "
+            f"({s['hit_rate']:.0%}, {s['seconds_reused']:.1f}s of audio), "
+            f"{self.size() / 1024**2:.1f} of {self.max_bytes / 1024**2:.0f} MiB"
+        )
+
+
+def install(cache: SentenceCache | None):
+    """Make *cache* the process-wide sentence cache (None disables it)."""
+    global _active
+    _active = cache
+
+
+def active() -> SentenceCache | None:
+    """Return the process-wide sentence cache, if one is installed."""
+    return _active
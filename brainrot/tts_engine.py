@@ -3,64 +3,658 @@ TTS Engine - Text-to-speech using pocket-tts.
 ==============================================
 Generates speech audio for each scene's narration using the lightweight,
 CPU-friendly pocket-tts library.
+
+pocket-tts synthesizes one text at a time (there is no batched
+``generate_audio``), so multi-scene synthesis runs on a small pool of model
+replicas instead: each worker thread checks out its own copy of the model,
+and torch releases the GIL while it computes.
+
+Encoding a voice prompt is slow, so voice states are computed once per
+(voice, model version), saved under ``voices/`` and memory-mapped back in by
+later processes.  A scene may name its own ``voice``; recently used states
+are kept in memory.
+
+When a :class:`~brainrot.tts_cache.SentenceCache` is installed, narrations
+are synthesized sentence by sentence and each sentence is reused across
+scenes and videos.
+
+:func:`synthesize_stream` yields audio chunks as the model produces them and
+appends each one to the WAV, whose header is kept valid throughout, so
+consumers can start on the first second of a long narration.
+
+On many-core Linux machines, :func:`start_pool` forks worker processes from
+a parent that has already loaded the model, so every worker shares its
+weights copy-on-write and runs with its own torch thread budget; batched
+synthesis is then spread across the processes instead of threads.
 """
 
+import atexit
+import copy
+import multiprocessing
 import os
+import queue
+import re
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from importlib.metadata import version
+from multiprocessing import resource_tracker
 from pathlib import Path
+from typing import Iterator
 
-import scipy.io.wavfile as wav
+import numpy as np
+import torch
 from pocket_tts import TTSModel
 
+from brainrot import tracing, tts_cache
+from brainrot.audio import AudioBuffer, WavWriter
+from brainrot.cache import ArtifactCache, SingleFlight, cache_key, hash_file
+from brainrot.tracing import file_size, span
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+VOICE = "alba"
+MODEL_VERSION = version("pocket-tts")
+# Default concurrent generations (model replicas).  Every replica after the
+# first is a full deepcopy of the model, weights included, and the replicas
+# split the CPU's torch threads between them, so more replicas only pay off
+# where benchmarks/tts.py shows a gain on the machine; opt in with
+# set_workers() (--tts-workers).
+TTS_WORKERS = 1
+VOICE_DIR = Path(__file__).resolve().parent.parent / "voices"
+VOICE_LRU_SIZE = 4  # voice states kept in memory
+POOL_TIMEOUT = 600  # seconds to wait for one result from the process pool
 
 # Module-level cache so the model is loaded only once per process.
 _model: TTSModel | None = None
-_voice_state = None
+_load_lock = threading.Lock()
+# A model is not safe to share between concurrent generations, so each
+# in-flight synthesis checks out its own replica.
+_replicas: "queue.Queue[TTSModel]" = queue.Queue()
+_n_replicas = 0
+_workers = TTS_WORKERS
+
+# voice -> state, most recently used last.  Generation only reads a state,
+# so replicas share them.
+_voices: "OrderedDict[str, dict]" = OrderedDict()
+_voice_lock = threading.Lock()
+
+# Scenes synthesized concurrently often share a stock sentence.
+_sentence_flight = SingleFlight()
 
+_pool: "TTSPool | None" = None
 
-def _get_model():
-    """Lazy-load the TTS model and default voice."""
-    global _model, _voice_state
+
+def _get_model() -> TTSModel:
+    """Lazy-load the TTS model."""
+    global _model
     if _model is None:
-        _model = TTSModel.load_model()
-        _voice_state = _model.get_state_for_audio_prompt("alba")
-    return _model, _voice_state
+        with _load_lock:
+            if _model is None:
+                _model = TTSModel.load_model()
+    return _model
+
+
+def _ensure_replicas(n: int):
+    """Grow the replica pool to at least *n* copies of the model."""
+    global _n_replicas
+    model = _get_model()
+    with _load_lock:
+        if _n_replicas == 0:
+            _replicas.put(model)
+            _n_replicas = 1
+        while _n_replicas < n:
+            _replicas.put(copy.deepcopy(model))
+            _n_replicas += 1
+
+
+def _use_replicas(n: int):
+    """
+    Get ready for *n* concurrent generations: *n* replicas, with torch's
+    intra-op threads split between them so they do not oversubscribe the
+    cores.
+    """
+    _ensure_replicas(n)
+    torch.set_num_threads(max(1, (os.cpu_count() or 1) // n))
+
+
+def set_workers(n: int):
+    """Set the default number of concurrent generations (model replicas)."""
+    global _workers
+    if n < 1:
+        raise ValueError("TTS workers must be at least 1")
+    _workers = n
+
+
+def get_workers() -> int:
+    """Return the default number of concurrent generations."""
+    return _workers
+
+
+@contextmanager
+def _checkout():
+    """Borrow a model replica for one generation."""
+    _ensure_replicas(1)
+    model = _replicas.get()
+    try:
+        yield model
+    finally:
+        _replicas.put(model)
+
+
+# ---------------------------------------------------------------------------
+# Voice states
+# ---------------------------------------------------------------------------
+def _voice_id(voice: str) -> str:
+    """Cache identity of *voice*; a local audio prompt is keyed by contents."""
+    return hash_file(voice) if os.path.isfile(voice) else voice
+
+
+def _voice_path(voice: str) -> Path:
+    """On-disk location of *voice*'s state for the current model version."""
+    name = re.sub(r"[^A-Za-z0-9_-]+", "_", Path(voice).stem)[:32]
+    key = cache_key("voice", MODEL_VERSION, _voice_id(voice))
+    return VOICE_DIR / f"{name}-{key[:16]}.pt"
+
+
+def _load_voice(voice: str, encode: bool = True) -> dict | None:
+    """
+    Memory-map *voice*'s saved state, encoding and saving it first if needed
+    (or returning None when *encode* is false).
+    """
+    path = _voice_path(voice)
+    if path.exists():
+        try:
+            with span("tts.voice_load", cat="tts", voice=voice):
+                return torch.load(
+                    path, map_location="cpu", mmap=True, weights_only=True
+                )
+        except Exception as exc:  # truncated or from an incompatible torch
+            print(f"  Discarding unreadable voice state {path.name} ({exc})")
+            path.unlink(missing_ok=True)
+    if not encode:
+        return None
+
+    print(f"  Encoding voice '{voice}' …")
+    with span("tts.voice_encode", cat="tts", voice=voice):
+        state = _get_model().get_state_for_audio_prompt(voice)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        with os.fdopen(fd, "wb") as f:
+            torch.save(state, f)
+        os.replace(tmp, path)
+    except Exception as exc:
+        print(f"  Could not save voice state for '{voice}' ({exc})")
+    return state
+
+
+def voice_state(voice: str = VOICE, encode: bool = True) -> dict | None:
+    """
+    Return the model state for *voice*: a pocket-tts voice name, or a path
+    or URL of an audio prompt to clone.
+
+    States come from memory, then ``voices/``, and are only encoded when
+    neither has them.  With *encode* false, a state that would need encoding
+    is not computed and None is returned instead.
+    """
+    with _voice_lock:
+        if voice in _voices:
+            _voices.move_to_end(voice)
+            return _voices[voice]
+        state = _load_voice(voice, encode)
+        if state is None:
+            return None
+        _voices[voice] = state
+        while len(_voices) > VOICE_LRU_SIZE:
+            _voices.popitem(last=False)
+        return state
+
+
+def preload(workers: int = 1, voices: tuple[str, ...] = (VOICE,)):
+    """
+    Load the TTS model and *voices* now instead of on the first synthesis,
+    with *workers* replicas ready for batched synthesis (a single one when
+    a process pool does the batching).
+    """
+    _use_replicas(workers if _pool is None else 1)
+    for voice in voices:
+        voice_state(voice)
+
+
+def sample_rate() -> int:
+    """Sample rate of the audio the model produces."""
+    return _get_model().sample_rate
+
+
+def _synth(text: str, voice: str) -> np.ndarray:
+    """Synthesize *text* on a free replica and return the samples."""
+    state = voice_state(voice)
+    with _checkout() as model:
+        with span("tts.generate_audio", cat="tts", chars=len(text), voice=voice):
+            return model.generate_audio(state, text).cpu().numpy()
+
+
+def _generate(text: str, voice: str = VOICE) -> np.ndarray:
+    """
+    Return the samples for *text*: synthesized whole, or assembled from
+    cached and fresh sentences when a sentence cache is installed.
+    """
+    sentences = tts_cache.active()
+    if sentences is None:
+        return _synth(text, voice)
+
+    rate, voice_id = sample_rate(), _voice_id(voice)
+
+    def _sentence(sentence: str) -> np.ndarray:
+        key = sentences.key(sentence, voice_id, MODEL_VERSION)
+
+        def _fetch_or_synth():
+            audio = sentences.get(key, rate)
+            if audio is None:
+                audio = _synth(sentence, voice)
+                sentences.put(key, audio)
+            return audio
+
+        return _sentence_flight.do(key, _fetch_or_synth)
+
+    parts = tts_cache.split_sentences(text) or [text]
+    return np.concatenate([_sentence(p) for p in parts])
+
+
+def _stream_synth(text: str, voice: str) -> Iterator[np.ndarray]:
+    """Yield *text*'s samples chunk by chunk as a free replica produces them."""
+    state = voice_state(voice)
+    with _checkout() as model:
+        with span(
+            "tts.generate_audio", cat="tts", chars=len(text), voice=voice, stream=True
+        ) as info:
+            start = time.perf_counter()
+            stream = getattr(model, "generate_audio_stream", None)
+            if stream is None:  # pocket-tts without streaming support
+                chunks = iter([model.generate_audio(state, text)])
+            else:
+                chunks = stream(state, text)
+            for i, chunk in enumerate(chunks):
+                if i == 0:
+                    info["first_chunk_ms"] = round(
+                        (time.perf_counter() - start) * 1000, 1
+                    )
+                yield chunk.cpu().numpy()
+
+
+def _stream(text: str, voice: str) -> Iterator[np.ndarray]:
+    """
+    Streaming counterpart of :func:`_generate`: cached sentences are yielded
+    whole, fresh ones chunk by chunk (and cached once complete).
+    """
+    sentences = tts_cache.active()
+    if sentences is None:
+        yield from _stream_synth(text, voice)
+        return
+
+    rate, voice_id = sample_rate(), _voice_id(voice)
+    for part in tts_cache.split_sentences(text) or [text]:
+        key = sentences.key(part, voice_id, MODEL_VERSION)
+        audio = sentences.get(key, rate)
+        if audio is not None:
+            yield audio
+            continue
+        chunks = []
+        for chunk in _stream_synth(part, voice):
+            chunks.append(chunk)
+            yield chunk
+        if chunks:
+            sentences.put(key, np.concatenate(chunks))
+
+
+def synthesize_stream(
+    text: str,
+    output_path: str | None = None,
+    voice: str = VOICE,
+) -> Iterator[np.ndarray]:
+    """
+    Synthesize *text*, yielding float sample chunks as they are produced.
+
+    Args:
+        text: The narration string.
+        output_path: If given, each chunk is appended to this WAV before it
+            is yielded; the file is a valid WAV at every point.
+        voice: Voice name or audio prompt (see :func:`voice_state`).
+
+    Yields:
+        1-D float arrays at :func:`sample_rate`, in order.
+    """
+    writer = WavWriter(output_path, sample_rate()) if output_path else None
+    try:
+        for chunk in _stream(text, voice):
+            if writer is not None:
+                writer.append(chunk)
+            yield chunk
+    finally:
+        if writer is not None:
+            writer.close()
 
 
-def synthesize(text: str, output_path: str) -> str:
+def synthesize(text: str, output_path: str, voice: str = VOICE) -> str:
     """
-    Synthesize *text* to a WAV file at *output_path*.
+    Synthesize *text* to a WAV file at *output_path*, writing it
+    incrementally (see :func:`synthesize_stream`).
 
     Args:
         text: The narration string.
         output_path: Destination .wav file path.
+        voice: Voice name or audio prompt (see :func:`voice_state`).
 
     Returns:
         Absolute path of the saved WAV.
     """
-    model, voice = _get_model()
-    audio = model.generate_audio(voice, text)
-
-    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-    wav.write(output_path, model.sample_rate, audio.cpu().numpy())
+    for _ in synthesize_stream(text, output_path, voice):
+        pass
     return os.path.abspath(output_path)
 
 
-def synthesize_scenes(scenes: list[dict], output_dir: str) -> list[str]:
+# ---------------------------------------------------------------------------
+# Process pool
+# ---------------------------------------------------------------------------
+def _init_worker(threads: int):
+    """Give a freshly forked worker its thread budget and its own locks."""
+    global _load_lock, _voice_lock, _replicas, _n_replicas, _pool
+    torch.set_num_threads(threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:  # already fixed by the parent
+        pass
+    # Locks and the replica queue may have been held mid-use by another
+    # parent thread at fork time.
+    _load_lock, _voice_lock = threading.Lock(), threading.Lock()
+    _replicas, _n_replicas, _pool = queue.Queue(), 0, None
+    tracing.drain()  # the parent's spans, copied by the fork
+
+
+def _pool_synth(text: str, voice: str) -> tuple[AudioBuffer, list[dict]]:
+    """
+    Worker side of :meth:`TTSPool.map`: the audio, in a shared-memory
+    segment the parent copies and frees, plus the spans recorded for it.
+    """
+    clip = AudioBuffer(_synth(text, voice), sample_rate()).share()
+    return clip, tracing.drain()
+
+
+class TTSPool:
     """
-    Generate TTS audio for every scene.
+    TTS worker processes forked from a parent that holds the loaded model.
 
     Args:
-        scenes: List of scene dicts with ``narration`` keys.
-        output_dir: Directory to write WAV files.
+        workers: Number of worker processes.
+        threads: Torch intra-op threads per worker; defaults to an even
+            share of the CPUs.
+        voices: Voices to share with the workers if their states are
+            already saved; the workers encode any that are not.
+
+    Raises:
+        RuntimeError: If not running on Linux.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        threads: int | None = None,
+        voices: tuple[str, ...] = (VOICE,),
+    ):
+        # fork() after torch has started is only dependable on Linux.
+        if sys.platform != "linux":
+            raise RuntimeError("A TTS process pool is only supported on Linux")
+        self.workers = workers
+        self.threads = threads or max(1, (os.cpu_count() or 1) // workers)
+        # Load the weights and saved voices before forking so the workers
+        # inherit the pages instead of each loading their own copy.  Nothing
+        # here may run the model: encoding a missing voice is left to the
+        # workers, since OpenMP thread pools do not survive a fork.
+        _get_model()
+        for voice in voices:
+            voice_state(voice, encode=False)
+        # Workers return audio in shared memory; with the resource tracker
+        # started here they register their segments with the parent's, which
+        # unregisters them when it frees them.
+        resource_tracker.ensure_running()
+        self._pool = multiprocessing.get_context("fork").Pool(
+            workers, initializer=_init_worker, initargs=(self.threads,)
+        )
+
+    def map(self, texts: list[str], voices: list[str]) -> list[np.ndarray]:
+        """
+        Synthesize *texts* across the workers, longest first.
+
+        Raises:
+            RuntimeError: If a result does not arrive within
+                :data:`POOL_TIMEOUT` seconds (e.g. its worker was killed for
+                running out of memory, which loses the task).
+        """
+        order = sorted(range(len(texts)), key=lambda i: -len(texts[i]))
+        results = {
+            i: self._pool.apply_async(_pool_synth, (texts[i], voices[i]))
+            for i in order
+        }
+        clips = []
+        for i in range(len(texts)):
+            try:
+                clip, spans = results[i].get(POOL_TIMEOUT)
+            except multiprocessing.TimeoutError:
+                raise RuntimeError(
+                    f"TTS worker returned nothing within {POOL_TIMEOUT}s "
+                    "(was it killed, e.g. out of memory?)"
+                ) from None
+            clip.release()
+            tracing.add_events(spans)
+            clips.append(clip.samples)
+        return clips
+
+    def close(self):
+        self._pool.terminate()
+        self._pool.join()
+
+
+def start_pool(workers: int, threads: int | None = None) -> TTSPool:
+    """
+    Fork *workers* TTS processes with *threads* torch threads each and route
+    batched synthesis through them.
+
+    Start the pool before the process runs any inference of its own: OpenMP
+    thread pools do not survive a fork.
+    """
+    global _pool
+    stop_pool()
+    _pool = TTSPool(workers, threads)
+    print(f"  🔊 TTS pool: {_pool.workers} processes × {_pool.threads} threads")
+    return _pool
+
+
+def stop_pool():
+    """Shut the process pool down (no-op if none is running)."""
+    global _pool
+    if _pool is not None:
+        _pool.close()
+        _pool = None
+
+
+atexit.register(stop_pool)
+
+
+def _pool_batch(texts: list[str], voices: list[str]) -> list[np.ndarray]:
+    """
+    Synthesize *texts* on the process pool.  With a sentence cache, lookups
+    stay in this process and only the missing sentences (each once) are
+    sent to the workers.
+    """
+    sentences = tts_cache.active()
+    if sentences is None:
+        return _pool.map(texts, voices)
+
+    rate = sample_rate()
+    keys, clips, todo = [], {}, {}
+    for text, voice in zip(texts, voices):
+        parts = tts_cache.split_sentences(text) or [text]
+        voice_id = _voice_id(voice)
+        keys.append([sentences.key(p, voice_id, MODEL_VERSION) for p in parts])
+        for part, key in zip(parts, keys[-1]):
+            if key in clips or key in todo:
+                continue
+            audio = sentences.get(key, rate)
+            if audio is None:
+                todo[key] = (part, voice)
+            else:
+                clips[key] = audio
+    if todo:
+        parts, part_voices = zip(*todo.values())
+        fresh = _pool.map(list(parts), list(part_voices))
+        for key, audio in zip(todo, fresh):
+            sentences.put(key, audio)
+            clips[key] = audio
+    return [np.concatenate([clips[k] for k in text_keys]) for text_keys in keys]
+
+
+def synthesize_batch(
+    texts: list[str],
+    workers: int | None = None,
+    voices: str | list[str] = VOICE,
+) -> list[AudioBuffer]:
+    """
+    Synthesize several texts at once across *workers* model replicas, or
+    across the process pool when one is running.
+
+    Texts are started longest first so no worker is left with one long
+    narration at the end.
+
+    Args:
+        texts: Narration strings.
+        workers: Concurrent generations (model replicas; default
+            :func:`get_workers`); ignored when the process pool is running.
+        voices: One voice for every text, or one per text.
+
+    Returns:
+        One buffer (samples, sample rate, duration) per text, in input order.
+    """
+    if isinstance(voices, str):
+        voices = [voices] * len(texts)
+    if _pool is not None:
+        rate = sample_rate()
+        return [AudioBuffer(audio, rate) for audio in _pool_batch(texts, voices)]
+    workers = max(1, min(workers or _workers, len(texts)))
+    _use_replicas(workers)
+    rate = sample_rate()
+    order = sorted(range(len(texts)), key=lambda i: -len(texts[i]))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {i: pool.submit(_generate, texts[i], voices[i]) for i in order}
+        clips = [futures[i].result() for i in range(len(texts))]
+    return [AudioBuffer(audio, rate) for audio in clips]
+
+
+def _scene_key(scene: dict) -> str:
+    voice = _voice_id(scene.get("voice", VOICE))
+    return cache_key("tts", MODEL_VERSION, voice, scene["narration"])
+
+
+def synthesize_scene(
+    scene: dict,
+    output_dir: str,
+    cache: ArtifactCache | None = None,
+) -> str:
+    """
+    Generate TTS audio for a single scene.
+
+    Args:
+        scene: Scene dict with ``scene_id`` and ``narration`` keys, and an
+            optional ``voice`` (default :data:`VOICE`).
+        output_dir: Directory to write the WAV file.
+        cache: Optional artifact cache; clips are keyed by model version,
+            voice and narration text.
 
     Returns:
-        Ordered list of WAV file paths.
-    """
-    paths: list[str] = []
-    for scene in scenes:
-        scene_id = scene["scene_id"]
-        out = os.path.join(output_dir, f"tts_{scene_id}.wav")
-        print(f"  Synthesizing TTS for scene {scene_id} …")
-        path = synthesize(scene["narration"], out)
-        paths.append(path)
-    return paths
+        Absolute path of the scene's WAV.
+    """
+    scene_id = scene["scene_id"]
+    out = os.path.join(output_dir, f"tts_{scene_id}.wav")
+    key = _scene_key(scene)
+    if cache is not None and cache.fetch(key, out):
+        print(f"  Reusing cached TTS for scene {scene_id}")
+        return os.path.abspath(out)
+    print(f"  Synthesizing TTS for scene {scene_id} …")
+    voice = scene.get("voice", VOICE)
+    with span("tts", cat="scene", scene=scene_id) as info:
+        if _pool is not None:
+            audio = _pool_batch([scene["narration"]], [voice])[0]
+            path = AudioBuffer(audio, sample_rate()).save(out)
+        else:
+            path = synthesize(scene["narration"], out, voice)
+        info["bytes"] = file_size(path)
+    if cache is not None:
+        cache.store(key, path)
+    return path
+
+
+def synthesize_scenes(
+    scenes: list[dict],
+    output_dir: str | None,
+    cache: ArtifactCache | None = None,
+    workers: int | None = None,
+) -> list[AudioBuffer]:
+    """
+    Generate TTS audio for every scene, in memory.
+
+    Cached clips are reused; the remaining narrations are synthesized
+    together with :func:`synthesize_batch`.
+
+    Args:
+        scenes: List of scene dicts with ``narration`` (and optionally
+            ``voice``) keys.
+        output_dir: Directory to also save ``tts_<id>.wav`` files in, or
+            None to keep the audio in memory only.
+        cache: Optional artifact cache; clips are keyed by model version,
+            voice and narration text.
+        workers: Concurrent generations for the uncached scenes (default
+            :func:`get_workers`).
+
+    Returns:
+        One :class:`~brainrot.audio.AudioBuffer` per scene, in order; each
+        buffer's ``path`` is set when it was saved.
+    """
+    buffers: list[AudioBuffer | None] = [None] * len(scenes)
+    keys, todo = [], []
+    for idx, scene in enumerate(scenes):
+        keys.append(_scene_key(scene))
+        data = cache.load_bytes(keys[idx]) if cache is not None else None
+        if data is not None:
+            try:
+                buffers[idx] = AudioBuffer.from_wav_bytes(data)
+            except ValueError:  # written in an older format; redo it
+                todo.append(idx)
+                continue
+            print(f"  Reusing cached TTS for scene {scene['scene_id']}")
+        else:
+            todo.append(idx)
+
+    if todo:
+        if _pool is not None:
+            workers = _pool.workers
+        print(f"  Synthesizing TTS for {len(todo)} scenes ({workers} workers) …")
+        with span("tts.batch", cat="tts", scenes=len(todo), workers=workers):
+            clips = synthesize_batch(
+                [scenes[i]["narration"] for i in todo],
+                workers,
+                [scenes[i].get("voice", VOICE) for i in todo],
+            )
+            for idx, buf in zip(todo, clips):
+                buffers[idx] = buf
+                if cache is not None:
+                    cache.save_bytes(keys[idx], buf.wav_bytes())
+
+    if output_dir is not None:
+        for scene, buf in zip(scenes, buffers):
+            buf.save(os.path.join(output_dir, f"tts_{scene['scene_id']}.wav"))
+    return buffers
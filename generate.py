@@ -11,6 +11,19 @@ Usage:
     # Specific topic
     python generate.py --topic "The Thermodynamics of the Grimace Shake"
 
+    # Many videos in one warm process
+    python generate.py --batch topics.txt --jobs 2
+    python generate.py --random --count 10
+
+    # Re-render only the scenes changed in a hand-edited output/script.json
+    python generate.py --rebuild
+
+    # Warm daemon accepting jobs on localhost
+    python generate.py --serve --port 8765
+
+    # Pre-generate scripts so --random starts rendering immediately
+    python generate.py --fill-bank --bank-depth 5
+
 Environment:
     GEMINI_API_KEY  — required for script writing and image generation.
 
@@ -20,25 +33,36 @@ Optimised for Mac M2 (Apple Silicon).
 import argparse
 import json
 import os
+import re
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-from brainrot.script_writer import generate_script, pick_random_topic
-from brainrot.image_generator import generate_scene_images
-from brainrot.tts_engine import synthesize_scenes
-from brainrot.transcriber import transcribe_scenes
-from brainrot.renderer import render
-from brainrot.compositor import compose
+# Only lightweight modules are imported here.  The heavy backends (manim,
+# moviepy, mlx-whisper, pocket-tts/torch, google-genai) are imported inside
+# the stage that needs them, so --help and argument errors return instantly
+# and a machine missing one backend can still run the others.
+from brainrot.cache import DEFAULT_MAX_BYTES, ArtifactCache, cache_key, hash_file
+from brainrot.script_writer import SCRIPT_MODEL, SYSTEM_PROMPT, pick_random_topic
+from brainrot.scheduler import StageGraph
+from brainrot.daemon import DEFAULT_HOST, DEFAULT_PORT, serve
+from brainrot.gemini import usage_snapshot, usage_summary
+from brainrot.incremental import rebuild, write_manifest
+from brainrot.ratelimit import DEFAULT_BURST, GEMINI_IMAGE, get_limiter
+from brainrot.script_bank import ScriptBank
+from brainrot import tracing, tts_cache
 
 # ---------------------------------------------------------------------------
 # Directories
 # ---------------------------------------------------------------------------
 BASE_DIR = Path(__file__).resolve().parent
 OUTPUT_DIR = BASE_DIR / "output"
-ASSETS_DIR = OUTPUT_DIR / "generated_assets"
-AUDIO_DIR = OUTPUT_DIR / "audio"
-MEDIA_DIR = OUTPUT_DIR / "media"
+BATCH_DIR = OUTPUT_DIR / "batch"
+JOBS_DIR = OUTPUT_DIR / "jobs"
+CACHE_DIR = BASE_DIR / "cache"
+BANK_DIR = BASE_DIR / "script_bank"
+TTS_CACHE_DIR = BASE_DIR / "tts_cache"
 
 
 def banner():
@@ -56,55 +80,417 @@ def banner():
     )
 
 
-def run_pipeline(topic: str):
-    """Execute the full brainrot generation pipeline."""
+def run_pipeline(
+    topic: str,
+    output_dir: Path = OUTPUT_DIR,
+    cache: ArtifactCache | None = None,
+    resume: bool = False,
+    stream: bool = False,
+    script: dict | None = None,
+    image_concurrency: int | None = None,
+    minutes: float | None = None,
+    script_source: str = "gemini",
+    scenes: int | None = None,
+    seed: int = 0,
+    image_backend: str = "gemini",
+    keep_audio: bool = True,
+):
+    """
+    Execute the full brainrot generation pipeline.
+
+    Stages run as a dependency graph: images and TTS both start as soon as
+    the script exists, transcription overlaps the Manim render, and only the
+    final composite waits for everything.
+
+    Args:
+        topic: The brainrot topic to write about.
+        output_dir: Root directory for this run's script, assets and video.
+        cache: Optional artifact cache.  Every stage output is stored under a
+            hash of its inputs, so unchanged stages are skipped on re-runs.
+        resume: Reuse the cached script for *topic* instead of asking Gemini
+            for a fresh one.  Without it scripts are still cached (so later
+            ``--resume`` runs can find them) but never read back.
+        stream: Push each scene through images/TTS/transcription/render on
+            its own and stitch per-scene segments at the end, instead of
+            waiting for every scene at each stage.  A freshly generated
+            script is streamed too, so scene 1's image and TTS start while
+            later scenes are still being written.
+        script: A pre-written script to render instead of generating one.
+        image_concurrency: Maximum image requests in flight (defaults to
+            ``image_generator.IMAGE_CONCURRENCY``).
+        minutes: Generate a long-form script of about this many minutes
+            (outline first, then every act in parallel) instead of a 5–7
+            scene short.
+        script_source: ``"gemini"``, or ``"offline"`` to build the script
+            from templates with no network (for load tests).
+        scenes: Scene count for offline scripts (default: derived from
+            *minutes*, else ``offline_script.DEFAULT_SCENES``).
+        seed: Seed for offline scripts.
+        image_backend: ``"gemini"``, or ``"procedural"`` for instant local
+            NumPy backgrounds (drafts).
+        keep_audio: Also save each scene's TTS as ``audio/tts_<id>.wav``.
+            TTS audio reaches transcription and compositing in memory
+            either way; without the files, ``--rebuild`` re-voices scenes.
+    """
     start = time.time()
+    usage_start = usage_snapshot()
+    key = cache_key("script", SCRIPT_MODEL, SYSTEM_PROMPT, topic)
+    if minutes:
+        key = cache_key("long-script", SCRIPT_MODEL, SYSTEM_PROMPT, topic, minutes)
 
     # -- Prepare directories --
-    for d in (OUTPUT_DIR, ASSETS_DIR, AUDIO_DIR, MEDIA_DIR):
+    output_dir = Path(output_dir)
+    assets_dir = output_dir / "generated_assets"
+    audio_dir = output_dir / "audio"
+    media_dir = output_dir / "media"
+    for d in (output_dir, assets_dir, audio_dir, media_dir):
         d.mkdir(parents=True, exist_ok=True)
 
-    # -- Step 1: Generate script --
-    print("\n🧠 Step 1/5 — Generating script with Gemini …")
-    print(f"   Topic: {topic}")
-    script = generate_script(topic)
-    script_path = OUTPUT_DIR / "script.json"
-    script_path.write_text(json.dumps(script, indent=2))
-    print(f"   ✓ Script saved to {script_path}")
-    print(f"   Title: {script['title']}")
-    print(f"   Scenes: {len(script['scenes'])}")
-
-    # -- Step 2: Generate images --
-    print("\n🎨 Step 2/5 — Generating images with Gemini …")
-    image_paths = generate_scene_images(script["scenes"], str(ASSETS_DIR))
-    print(f"   ✓ {len(image_paths)} images generated")
-
-    # -- Step 3: Generate TTS audio --
-    print("\n🔊 Step 3/5 — Generating TTS with pocket-tts …")
-    tts_paths = synthesize_scenes(script["scenes"], str(AUDIO_DIR))
-    print(f"   ✓ {len(tts_paths)} audio clips generated")
-
-    # -- Step 4: Transcribe for captions --
-    print("\n📝 Step 4/5 — Transcribing with MLX-Whisper …")
-    transcriptions = transcribe_scenes(tts_paths)
-    print(f"   ✓ {len(transcriptions)} transcriptions complete")
-
-    # -- Step 5: Render with Manim --
-    print("\n🎬 Step 5/5 — Rendering with Manim (Mac M2 optimised) …")
-    video_path = render(script, image_paths, str(MEDIA_DIR))
-    print(f"   ✓ Rendered: {video_path}")
-
-    # -- Step 6: Composite final video --
-    print("\n🔧 Compositing final video …")
-    final_path = str(OUTPUT_DIR / "final_brainrot.mp4")
-    result = compose(video_path, tts_paths, transcriptions, final_path)
-    print(f"   ✓ Final video: {result}")
+    def _script():
+        if script is not None:
+            print("\n🧠 Using provided script …")
+            return _save_script(script)
+        if script_source == "offline":
+            from brainrot.offline_script import DEFAULT_SCENES, generate_offline_script
+            from brainrot.script_writer import plan_acts
+
+            n = scenes or (sum(plan_acts(minutes)) if minutes else DEFAULT_SCENES)
+            print(f"\n🧠 Building offline script ({n} scenes, seed {seed}) …")
+            return _save_script(generate_offline_script(topic, n, seed))
+        print("\n🧠 Generating script with Gemini …")
+        print(f"   Topic: {topic}")
+        generated = cache.load_json(key) if cache is not None and resume else None
+        if generated is not None:
+            print("   ✓ Resumed cached script")
+        elif minutes:
+            from brainrot.script_writer import generate_long_script
+
+            print(f"   Long-form: ~{minutes:g} minutes")
+            generated = generate_long_script(topic, minutes)
+            if cache is not None:
+                cache.save_json(key, generated)
+        elif stream:
+            from brainrot.script_writer import stream_script
+
+            # Finished (and cached) by _scenes once every scene has arrived.
+            return stream_script(topic)
+        else:
+            from brainrot.script_writer import generate_script
+
+            generated = generate_script(topic)
+            if cache is not None:
+                cache.save_json(key, generated)
+        return _save_script(generated)
+
+    def _save_script(script):
+        script_path = output_dir / "script.json"
+        script_path.write_text(json.dumps(script, indent=2))
+        print(f"   ✓ Script saved to {script_path}")
+        print(f"   Title: {script['title']}")
+        print(f"   Scenes: {len(script['scenes'])}")
+        return script
+
+    def _image_backend():
+        if image_backend == "procedural":
+            import brainrot.procedural_images as backend
+        else:
+            import brainrot.image_generator as backend
+        return backend
+
+    def _images(script):
+        backend = _image_backend()
+        if image_backend == "procedural":
+            print("\n🎨 Drawing procedural backgrounds …")
+        else:
+            print("\n🎨 Generating images with Gemini …")
+        image_paths = backend.generate_scene_images(
+            script["scenes"],
+            str(assets_dir),
+            cache,
+            concurrency=image_concurrency or backend.IMAGE_CONCURRENCY,
+        )
+        print(f"   ✓ {len(image_paths)} images generated")
+        return image_paths
+
+    def _tts(script):
+        from brainrot.tts_engine import synthesize_scenes
+
+        print("\n🔊 Generating TTS with pocket-tts …")
+        buffers = synthesize_scenes(
+            script["scenes"], str(audio_dir) if keep_audio else None, cache
+        )
+        print(f"   ✓ {len(buffers)} audio clips generated")
+        return buffers
+
+    def _transcribe(tts):
+        from brainrot.transcriber import transcribe_scenes
+
+        print("\n📝 Transcribing with MLX-Whisper …")
+        transcriptions = transcribe_scenes(tts, cache)
+        print(f"   ✓ {len(transcriptions)} transcriptions complete")
+        return transcriptions
+
+    def _render(script, images):
+        from brainrot.renderer import MANIM_VERSION, render
+
+        print("\n🎬 Rendering with Manim (Mac M2 optimised) …")
+        key = None
+        if cache is not None:
+            key = cache_key(
+                "render", MANIM_VERSION, script, [hash_file(p) for p in images]
+            )
+            hit = cache.fetch(key, str(media_dir / "BrainrotGenerated.mp4"))
+            if hit:
+                print(f"   ✓ Reused cached render: {hit}")
+                return hit
+        video_path = render(script, images, str(media_dir))
+        if key is not None:
+            cache.store(key, video_path)
+        print(f"   ✓ Rendered: {video_path}")
+        return video_path
+
+    def _compose(render, tts, transcribe):
+        from brainrot.compositor import compose
+
+        print("\n🔧 Compositing final video …")
+        final_path = str(output_dir / "final_brainrot.mp4")
+        key = None
+        if cache is not None:
+            key = cache_key(
+                "compose",
+                hash_file(render),
+                [buf.digest() for buf in tts],
+                transcribe,
+            )
+            hit = cache.fetch(key, final_path)
+            if hit:
+                print(f"   ✓ Reused cached final video: {hit}")
+                return hit
+        result = compose(render, tts, transcribe, final_path)
+        if key is not None:
+            cache.store(key, result)
+        print(f"   ✓ Final video: {result}")
+        return result
+
+    def _scenes(script):
+        from brainrot.streaming import stream_scenes
+
+        backend = _image_backend()
+        print("\n🌊 Streaming scenes (images · TTS · transcription · render) …")
+        scenes = stream_scenes(
+            script,
+            str(assets_dir),
+            str(audio_dir),
+            str(media_dir),
+            cache,
+            image_concurrency=image_concurrency or backend.IMAGE_CONCURRENCY,
+            image_fn=backend.generate_scene_image,
+        )
+        if not isinstance(script, dict):
+            finished = script.result()
+            if cache is not None:
+                cache.save_json(key, finished)
+            _save_script(finished)
+        print(f"   ✓ {len(scenes[0])} segments rendered")
+        return scenes
+
+    def _stitch(scenes):
+        from brainrot.compositor import compose_segments
+
+        print("\n🔧 Stitching segments into final video …")
+        segments, _, tts_paths, transcriptions = scenes
+        final_path = str(output_dir / "final_brainrot.mp4")
+        result = compose_segments(segments, tts_paths, transcriptions, final_path)
+        print(f"   ✓ Final video: {result}")
+        return result
+
+    graph = StageGraph()
+    graph.add("script", _script)
+    if stream:
+        graph.add("scenes", _scenes, deps=("script",))
+        graph.add("compose", _stitch, deps=("scenes",))
+    else:
+        graph.add("images", _images, deps=("script",))
+        graph.add("tts", _tts, deps=("script",))
+        graph.add("transcribe", _transcribe, deps=("tts",))
+        graph.add("render", _render, deps=("script", "images"))
+        graph.add("compose", _compose, deps=("render", "tts", "transcribe"))
+    results = graph.run()
+    result = results["compose"]
+    if stream:
+        segments, images, tts, transcriptions = results["scenes"]
+    else:
+        segments = None
+        images = results["images"]
+        tts = [buf.path for buf in results["tts"]]
+        transcriptions = results["transcribe"]
+    final_script = results["script"]
+    if not isinstance(final_script, dict):
+        final_script = final_script.result()
+    write_manifest(
+        str(output_dir),
+        final_script,
+        images,
+        tts,
+        transcriptions,
+        segments,
+        result,
+        image_backend,
+    )
 
     elapsed = time.time() - start
+    print("\n⏱  Stage timings:")
+    print(graph.summary())
+    usage = usage_summary(usage_start)
+    if usage:
+        print("\n💾 Gemini prompt usage:")
+        print(usage)
+    sentences = tts_cache.active()
+    if sentences is not None and sentences.summary():
+        print("\n🔁 TTS sentence cache:")
+        print(sentences.summary())
     print(f"\n✅ Done in {elapsed:.1f}s")
     return result
 
 
+def run_rebuild(output_dir: Path = OUTPUT_DIR, cache: ArtifactCache | None = None):
+    """Re-render only the scenes whose entries in ``script.json`` changed."""
+    start = time.time()
+    print(f"\n♻️  Rebuilding changed scenes in {output_dir} …")
+    result = rebuild(str(output_dir), cache)
+    print(f"   ✓ Final video: {result}")
+    print(f"\n✅ Done in {time.time() - start:.1f}s")
+    return result
+
+
+def _slug(text: str, max_len: int = 40) -> str:
+    """Return a filesystem-safe slug for *text*."""
+    slug = re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+    return slug[:max_len].rstrip("-") or "video"
+
+
+def read_topics(path: str) -> list[str]:
+    """Read one topic per line from *path*, skipping blanks and ``#`` comments."""
+    topics = []
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            topics.append(line)
+    return topics
+
+
+def warm_up():
+    """
+    Import every backend and load the Gemini client, pocket-tts voice and
+    Whisper weights now, instead of lazily on each stage's first use.
+    """
+    print("\n🔥 Warming up shared models …")
+    import brainrot.compositor  # noqa: F401  (moviepy)
+    import brainrot.renderer  # noqa: F401  (manim)
+    from brainrot.gemini import get_client
+    from brainrot.transcriber import preload as preload_whisper
+    from brainrot.tts_engine import get_workers
+    from brainrot.tts_engine import preload as preload_tts
+
+    get_client()
+    preload_tts(get_workers())
+    preload_whisper()
+
+
+def random_job(bank: ScriptBank | None) -> tuple[str, dict | None]:
+    """
+    Return ``(topic, script)`` for a random video: a banked script if one is
+    ready, otherwise a random topic whose script is still to be written.
+    """
+    entry = bank.pop() if bank is not None else None
+    if entry is not None:
+        print(f"\n🏦 Using banked script for {entry[0]!r} ({len(bank)} left)")
+        return entry
+    return pick_random_topic(), None
+
+
+def run_batch(
+    topics: list[str],
+    jobs: int = 1,
+    scripts: list[dict | None] | None = None,
+    **options,
+) -> list[str | None]:
+    """
+    Generate one video per topic inside this process.
+
+    The Gemini client, pocket-tts model/voice and Whisper weights are loaded
+    once up front and shared by every job, and each job writes to its own
+    directory under ``output/batch/<timestamp>/`` so parallel jobs never
+    collide.  A failing job is reported and skipped; the rest carry on.
+
+    Args:
+        topics: Topics to generate, one video each.
+        jobs: Number of videos to generate concurrently.  Manim renders are
+            still serialised, but scripting, images, TTS and transcription
+            of different jobs overlap.
+        scripts: Optional ready-made script per topic (None entries are
+            written by Gemini as usual).
+        **options: Passed to :func:`run_pipeline` for every job (``cache``,
+            ``stream``, ``image_concurrency`` …).
+
+    Returns:
+        Final video path per topic (None for jobs that failed).
+    """
+    warm_up()
+
+    batch_dir = BATCH_DIR / time.strftime("%Y%m%d-%H%M%S")
+    scripts = scripts or [None] * len(topics)
+
+    def _job(i: int, topic: str) -> str | None:
+        job_dir = batch_dir / f"{i:03d}_{_slug(topic)}"
+        try:
+            return run_pipeline(topic, job_dir, script=scripts[i - 1], **options)
+        except Exception as exc:
+            print(f"\n❌ Job {i} ({topic!r}) failed: {exc}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        results = list(pool.map(_job, range(1, len(topics) + 1), topics))
+
+    ok = sum(r is not None for r in results)
+    print(f"\n📦 Batch finished: {ok}/{len(results)} videos in {batch_dir}")
+    for topic, result in zip(topics, results):
+        print(f"   {'✓' if result else '✗'} {topic} → {result or 'failed'}")
+    return results
+
+
+def run_daemon(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    jobs: int = 1,
+    bank: ScriptBank | None = None,
+    **options,
+):
+    """
+    Serve generation jobs over localhost HTTP with models kept warm.
+
+    Each job runs :func:`run_pipeline` in ``output/jobs/<job id>/`` with
+    *options*; see :mod:`brainrot.daemon` for the request format.  Random
+    jobs take scripts from *bank*, which is refilled in the background for
+    as long as the daemon runs.
+    """
+    warm_up()
+    if bank is not None:
+        bank.start()
+
+    def _run_job(job_id: str, spec: dict) -> str:
+        script = spec.get("script")
+        if spec.get("topic"):
+            topic = spec["topic"]
+        elif script is not None:
+            topic = script["title"]
+        else:
+            topic, script = random_job(bank)
+        return run_pipeline(topic, JOBS_DIR / job_id, script=script, **options)
+
+    serve(_run_job, host, port, workers=jobs)
+
+
 def main():
     banner()
 
@@ -115,6 +501,8 @@ def main():
             "Examples:\n"
             "  python generate.py --random\n"
             '  python generate.py --topic "Sigma Male as a Markov Chain"\n'
+            "  python generate.py --batch topics.txt --jobs 2\n"
+            "  python generate.py --random --count 10\n"
         ),
     )
 
@@ -129,17 +517,295 @@ def main():
         type=str,
         help="Specify a custom topic for the video.",
     )
+    group.add_argument(
+        "--rebuild",
+        nargs="?",
+        const=str(OUTPUT_DIR),
+        metavar="DIR",
+        help="Incrementally rebuild a previous run after editing its "
+        "script.json (default: %(const)s).",
+    )
+    group.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run as a daemon accepting jobs over localhost HTTP.",
+    )
+    group.add_argument(
+        "--batch",
+        metavar="FILE",
+        help="Generate one video per line of FILE in a single warm process.",
+    )
+    group.add_argument(
+        "--fill-bank",
+        action="store_true",
+        help="Pre-generate scripts for random topics up to --bank-depth, "
+        "then exit.",
+    )
+    parser.add_argument(
+        "--count",
+        type=int,
+        default=1,
+        help="Number of videos to generate for --random/--topic (default: 1).",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Videos to generate concurrently in batch/daemon mode "
+        "(default: 1).",
+    )
+    parser.add_argument(
+        "--host",
+        default=DEFAULT_HOST,
+        help="Daemon bind address (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=DEFAULT_PORT,
+        help="Daemon port (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--bank-depth",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Ready scripts to keep in the --random script bank, refilled in "
+        "the background; 0 only uses scripts already banked "
+        "(default: %(default)s).",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Reuse the cached script for this topic and skip every stage "
+        "whose inputs are unchanged.",
+    )
+    parser.add_argument(
+        "--minutes",
+        type=float,
+        metavar="M",
+        help="Write a long-form script of about M minutes (e.g. 3–10) by "
+        "outlining acts and expanding them in parallel.",
+    )
+    parser.add_argument(
+        "--script-source",
+        choices=("gemini", "offline"),
+        default="gemini",
+        help="Where scripts come from: Gemini, or instant offline templates "
+        "for load-testing render/compose (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--scenes",
+        type=int,
+        metavar="N",
+        help="Scene count for offline scripts (default: 6, or derived from "
+        "--minutes).",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Seed for offline scripts (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Process each scene end-to-end as soon as it can and stitch "
+        "per-scene segments (lower time-to-video for 6–7 scene scripts).",
+    )
+    parser.add_argument(
+        "--image-backend",
+        choices=("gemini", "procedural"),
+        default="gemini",
+        help="Scene backgrounds from Gemini, or drawn locally in "
+        "milliseconds for drafts (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--image-concurrency",
+        type=int,
+        metavar="N",
+        help="Maximum image requests in flight per video (default: 4).",
+    )
+    parser.add_argument(
+        "--image-rpm",
+        type=float,
+        metavar="RPM",
+        help="Image requests per minute, shared by all jobs in this process "
+        "(default: 30).",
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="PATH",
+        help="Record per-stage and per-scene spans and write them as Chrome "
+        "trace-event JSON (open in chrome://tracing or Perfetto).",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Disable the artifact cache entirely.",
+    )
+    parser.add_argument(
+        "--cache-max-gb",
+        type=float,
+        default=DEFAULT_MAX_BYTES / 1024**3,
+        help="Size cap for the artifact cache; least recently used entries "
+        "are evicted first (default: %(default)g).",
+    )
+    parser.add_argument(
+        "--no-audio-files",
+        action="store_true",
+        help="Keep TTS audio in memory only instead of also saving "
+        "audio/tts_<id>.wav (a later --rebuild then re-voices every scene; "
+        "not with --stream/--rebuild, which need the files).",
+    )
+    parser.add_argument(
+        "--tts-workers",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Synthesize up to N scenes at once on N in-process model copies "
+        "sharing the CPU (each costs the model's memory again; check "
+        "benchmarks/tts.py first). Default: %(default)s.",
+    )
+    parser.add_argument(
+        "--tts-processes",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Fork N TTS worker processes sharing one loaded model (Linux; "
+        "for many-core machines). Default: threads in this process.",
+    )
+    parser.add_argument(
+        "--tts-threads",
+        type=int,
+        metavar="T",
+        help="Torch threads per TTS worker process (default: CPUs / N).",
+    )
+    parser.add_argument(
+        "--tts-cache-mb",
+        type=float,
+        default=tts_cache.DEFAULT_MAX_BYTES / 1024**2,
+        help="Size cap for the sentence-level TTS cache; 0 disables it "
+        "(default: %(default)g).",
+    )
 
     args = parser.parse_args()
+    if args.count < 1:
+        parser.error("--count must be at least 1")
+    if args.bank_depth < 0:
+        parser.error("--bank-depth must not be negative")
+    if args.fill_bank and not args.bank_depth:
+        parser.error("--fill-bank needs --bank-depth N")
+    if args.minutes is not None and args.minutes <= 0:
+        parser.error("--minutes must be positive")
+    if args.scenes is not None and args.scenes < 1:
+        parser.error("--scenes must be at least 1")
+    if args.tts_processes < 0:
+        parser.error("--tts-processes must not be negative")
+    if args.tts_processes and sys.platform != "linux":
+        parser.error("--tts-processes is only supported on Linux")
+    if args.tts_workers < 1:
+        parser.error("--tts-workers must be at least 1")
+    if args.tts_threads is not None and args.tts_threads < 1:
+        parser.error("--tts-threads must be at least 1")
+    if args.no_audio_files and (args.stream or args.rebuild):
+        parser.error("--no-audio-files cannot be combined with --stream/--rebuild")
+    if (args.batch or args.serve or args.rebuild or args.fill_bank) and args.count != 1:
+        parser.error("--count only applies to --random/--topic")
 
-    # Validate environment
-    if not os.environ.get("GEMINI_API_KEY"):
+    # Validate environment (fully offline runs need no API key)
+    offline = args.script_source == "offline" and args.image_backend == "procedural"
+    if not offline and not os.environ.get("GEMINI_API_KEY"):
         print("❌ Error: GEMINI_API_KEY environment variable is not set.")
         print("   Get a key at https://ai.google.dev/")
         sys.exit(1)
 
-    topic = args.topic if args.topic else pick_random_topic()
-    run_pipeline(topic)
+    cache = None
+    if not args.no_cache:
+        cache = ArtifactCache(str(CACHE_DIR), int(args.cache_max_gb * 1024**3))
+        if args.tts_cache_mb > 0:
+            tts_cache.install(
+                tts_cache.SentenceCache(
+                    str(TTS_CACHE_DIR), int(args.tts_cache_mb * 1024**2)
+                )
+            )
+
+    if args.trace:
+        tracing.enable()
+    if args.image_rpm:
+        burst = args.image_concurrency or DEFAULT_BURST
+        limiter = get_limiter(GEMINI_IMAGE, args.image_rpm, burst)
+        limiter.set_rate(args.image_rpm / 60.0)
+
+    options = dict(
+        cache=cache,
+        stream=args.stream,
+        image_concurrency=args.image_concurrency,
+        minutes=args.minutes,
+        script_source=args.script_source,
+        scenes=args.scenes,
+        seed=args.seed,
+        image_backend=args.image_backend,
+        keep_audio=not args.no_audio_files,
+    )
+    bank = None
+    # Banked scripts are Gemini-written shorts; long-form and offline runs
+    # make their own.
+    own_scripts = args.minutes or args.script_source == "offline"
+    # Without a filler (--bank-depth 0) the bank is still read if it exists.
+    if (args.bank_depth or BANK_DIR.is_dir()) and not own_scripts and (
+        args.random or args.serve or args.fill_bank
+    ):
+        bank = ScriptBank(str(BANK_DIR), args.bank_depth)
+
+    try:
+        if args.tts_processes:
+            # Fork before this process runs inference or starts other threads.
+            from brainrot.tts_engine import start_pool
+
+            start_pool(args.tts_processes, args.tts_threads)
+        if args.tts_workers > 1:
+            from brainrot.tts_engine import set_workers
+
+            set_workers(args.tts_workers)
+        if args.rebuild:
+            run_rebuild(Path(args.rebuild), cache)
+        elif args.fill_bank:
+            print(f"\n🏦 Filling script bank to {args.bank_depth} …")
+            added = bank.refill() if bank is not None else 0
+            print(f"   ✓ Added {added}; {len(bank) if bank else 0} scripts ready")
+        elif args.serve:
+            run_daemon(args.host, args.port, args.jobs, bank, **options)
+        elif args.batch or args.count > 1:
+            scripts = None
+            if args.batch:
+                topics = read_topics(args.batch)
+            elif args.random:
+                topics, scripts = map(
+                    list, zip(*(random_job(bank) for _ in range(args.count)))
+                )
+            else:
+                topics = [args.topic] * args.count
+            if bank is not None:
+                bank.start()
+            results = run_batch(topics, args.jobs, scripts, **options)
+            if not all(results):
+                sys.exit(1)
+        elif args.random:
+            topic, script = random_job(bank)
+            if bank is not None:
+                # Top the bank back up while this video renders.
+                bank.start()
+            run_pipeline(topic, resume=args.resume, script=script, **options)
+        else:
+            run_pipeline(args.topic, resume=args.resume, **options)
+    finally:
+        if bank is not None:
+            bank.stop()
+        if args.trace:
+            print("\n📈 Trace summary:")
+            print(tracing.summary())
+            print(f"   Trace written to {tracing.write_chrome_trace(args.trace)}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,13 @@
+import pytest
+
+
+@pytest.fixture
+def fake_client():
+    """The offline Gemini stand-in, installed for one test."""
+    # Request configs are built with google.genai.types.
+    pytest.importorskip("google.genai")
+    from brainrot import fake_gemini, gemini
+
+    client = fake_gemini.install()
+    yield client
+    gemini.set_client(None)
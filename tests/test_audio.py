@@ -0,0 +1,111 @@
+import io
+import multiprocessing
+import pickle
+import sys
+import wave
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+import pytest
+
+from brainrot.audio import AudioBuffer, WavWriter
+from brainrot.cache import hash_file
+
+
+def _tone(freq: float, rate: int, seconds: float = 1.0) -> np.ndarray:
+    t = np.arange(int(rate * seconds)) / rate
+    return 0.5 * np.sin(2 * np.pi * freq * t)
+
+
+def _peak_hz(buf: AudioBuffer) -> float:
+    spectrum = np.abs(np.fft.rfft(buf.samples))
+    return np.argmax(spectrum) * buf.sample_rate / len(buf.samples)
+
+
+def test_resampled_keeps_duration_and_pitch():
+    buf = AudioBuffer(_tone(440, 24000), 24000)
+    out = buf.resampled(16000)
+    assert out.sample_rate == 16000
+    assert len(out) == 16000
+    assert out.duration == pytest.approx(buf.duration)
+    assert _peak_hz(out) == pytest.approx(440, abs=1)
+
+
+def test_resampled_drops_content_above_new_nyquist():
+    buf = AudioBuffer(_tone(440, 24000) + _tone(10000, 24000), 24000)
+    out = buf.resampled(16000)
+    spectrum = np.abs(np.fft.rfft(out.samples))
+    # 10 kHz cannot be represented at 16 kHz; nothing may alias to 6 kHz.
+    assert spectrum[6000] < 1e-3 * spectrum[440]
+
+
+def test_resampled_to_same_rate_or_empty_is_identity():
+    buf = AudioBuffer(_tone(440, 16000), 16000)
+    assert buf.resampled(16000) is buf
+    empty = AudioBuffer(np.zeros(0), 24000)
+    assert empty.resampled(16000) is empty
+
+
+def test_wav_round_trip_and_digest(tmp_path):
+    buf = AudioBuffer(_tone(440, 24000, 0.25), 24000)
+    path = buf.save(str(tmp_path / "a" / "clip.wav"))
+    assert buf.path == path
+    again = AudioBuffer.from_file(path)
+    assert again.sample_rate == 24000
+    np.testing.assert_allclose(again.samples, buf.samples, atol=1 / 32767)
+    assert buf.digest() == hash_file(path) == again.digest()
+
+
+def test_from_wav_bytes_rejects_other_formats():
+    out = io.BytesIO()
+    with wave.open(out, "wb") as w:
+        w.setnchannels(2)
+        w.setsampwidth(2)
+        w.setframerate(8000)
+        w.writeframes(b"\0" * 16)
+    with pytest.raises(ValueError):
+        AudioBuffer.from_wav_bytes(out.getvalue())
+    with pytest.raises(ValueError):
+        AudioBuffer.from_wav_bytes(b"not a wav")
+
+
+def test_wav_writer_header_is_valid_after_each_append(tmp_path):
+    path = tmp_path / "stream.wav"
+    writer = WavWriter(str(path), 8000)
+    for n in (1, 2):
+        writer.append(np.zeros(800))
+        with wave.open(str(path)) as w:
+            assert w.getnframes() == 800 * n
+    writer.close()
+
+
+def _shared_ramp(n: int) -> AudioBuffer:
+    return AudioBuffer(np.linspace(-1, 1, n), 8000).share()
+
+
+def test_pickling_a_shared_buffer_hands_over_the_segment():
+    buf = _shared_ramp(800)
+    name = buf._shm.name
+    data = pickle.dumps(buf)
+    assert len(data) < 800  # the name, not the samples
+    received = pickle.loads(data)
+    np.testing.assert_array_equal(received.samples, buf.samples)
+    buf.release()  # no longer the owner: detaches only
+    received.release()
+    assert received._shm is None and received.samples[-1] == 1
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=name)
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="fork is only used on Linux")
+def test_worker_result_is_copied_and_freed():
+    resource_tracker.ensure_running()
+    with multiprocessing.get_context("fork").Pool(1) as pool:
+        buf = pool.apply(_shared_ramp, (800,))
+    name = buf._shm.name
+    expected = np.linspace(-1, 1, 800).astype(np.float32)
+    np.testing.assert_array_equal(buf.samples, expected)
+    buf.release()
+    np.testing.assert_array_equal(buf.samples, expected)
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=name)
@@ -0,0 +1,76 @@
+import os
+
+import pytest
+
+from brainrot.cache import ArtifactCache, cache_key
+
+
+def _key(i) -> str:
+    return cache_key("entry", i)
+
+
+def _age(cache: ArtifactCache, key: str, mtime: float):
+    os.utime(cache._path(key), (mtime, mtime))
+
+
+def test_cache_key_ignores_dict_order():
+    assert cache_key({"a": 1, "b": 2}) == cache_key({"b": 2, "a": 1})
+    assert cache_key("a", 1) != cache_key("a", "1")
+
+
+def test_round_trips(tmp_path):
+    cache = ArtifactCache(str(tmp_path))
+    cache.save_bytes(_key(1), b"png")
+    cache.save_json(_key(2), {"scenes": [1, 2]})
+    assert cache.load_bytes(_key(1)) == b"png"
+    assert cache.load_json(_key(2)) == {"scenes": [1, 2]}
+    assert cache.load_bytes(_key(3)) is None
+    src = tmp_path / "in.bin"
+    src.write_bytes(b"wav")
+    cache.store(_key(3), str(src))
+    assert cache.fetch(_key(3), str(tmp_path / "out" / "a.bin"))
+    assert (tmp_path / "out" / "a.bin").read_bytes() == b"wav"
+
+
+def test_evicts_least_recently_used_by_mtime(tmp_path):
+    cache = ArtifactCache(str(tmp_path / "c"), max_bytes=300)
+    for i in range(3):
+        cache.save_bytes(_key(i), b"x" * 100)
+        _age(cache, _key(i), 1000 + i)
+    cache.load_bytes(_key(0))  # a read makes entry 0 the newest
+    cache.save_bytes(_key(3), b"x" * 100)
+    assert not cache.has(_key(1))
+    assert all(cache.has(_key(i)) for i in (0, 2, 3))
+    assert cache.size() == 300
+
+
+def test_evict_frees_down_to_the_limit(tmp_path):
+    cache = ArtifactCache(str(tmp_path / "c"), max_bytes=10_000)
+    for i in range(5):
+        cache.save_bytes(_key(i), b"x" * 100)
+        _age(cache, _key(i), 1000 + i)
+    cache.max_bytes = 250
+    assert cache.evict() == 300
+    assert [cache.has(_key(i)) for i in range(5)] == [False] * 3 + [True] * 2
+
+
+def test_writes_scan_only_when_over_the_limit(tmp_path, monkeypatch):
+    cache = ArtifactCache(str(tmp_path / "c"), max_bytes=1000)
+    cache.save_bytes(_key(0), b"x" * 100)  # first write scans once
+    scans = []
+    entries = cache._entries
+    monkeypatch.setattr(cache, "_entries", lambda: scans.append(1) or entries())
+    for i in range(1, 9):
+        cache.save_bytes(_key(i), b"x" * 100)
+    cache.save_bytes(_key(1), b"y" * 100)  # overwrite: size unchanged
+    assert scans == []
+    cache.save_bytes(_key(9), b"x" * 200)
+    assert scans == [1]
+    assert cache.size() <= 1000
+
+
+@pytest.mark.parametrize("max_bytes", [0, 50])
+def test_entry_larger_than_limit_is_not_kept(tmp_path, max_bytes):
+    cache = ArtifactCache(str(tmp_path / "c"), max_bytes=max_bytes)
+    cache.save_bytes(_key(0), b"x" * 100)
+    assert not cache.has(_key(0))
@@ -0,0 +1,105 @@
+import threading
+import time
+
+import pytest
+
+from brainrot.daemon import JobQueue, validate_spec
+from brainrot.offline_script import generate_offline_script
+
+
+def _wait_for(jobs: JobQueue, job_id: str, status: str, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = jobs.get(job_id)
+        if job["status"] == status:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} is {jobs.get(job_id)['status']!r}")
+
+
+@pytest.mark.parametrize(
+    "spec",
+    [
+        {"topic": "Rizz"},
+        {"random": True},
+        {"script": generate_offline_script("Rizz", 2)},
+    ],
+)
+def test_validate_spec_accepts_one_kind(spec):
+    assert validate_spec(spec) is spec
+
+
+@pytest.mark.parametrize(
+    "spec, message",
+    [
+        ([], "JSON object"),
+        ({}, "exactly one"),
+        ({"topic": "a", "random": True}, "exactly one"),
+        ({"topic": 3}, "'topic'"),
+        ({"script": {"title": "T", "scenes": []}}, "invalid 'script'"),
+    ],
+)
+def test_validate_spec_rejects(spec, message):
+    with pytest.raises(ValueError, match=message):
+        validate_spec(spec)
+
+
+def test_submit_runs_job_and_reports_status():
+    jobs = JobQueue(lambda job_id, spec: f"/out/{spec['topic']}.mp4")
+    queued = jobs.submit({"topic": "Ohio"})
+    assert queued["status"] == "queued" and queued["queue_position"] == 1
+    jobs.start()
+    done = _wait_for(jobs, queued["id"], "done")
+    assert done["result"] == "/out/Ohio.mp4"
+    assert done["started"] <= done["finished"]
+    assert done["queue_position"] is None
+    assert [j["id"] for j in jobs.list()] == [queued["id"]]
+    jobs.stop()
+
+
+def test_failed_job_records_error_and_worker_continues():
+    def _run(job_id, spec):
+        if spec["topic"] == "bad":
+            raise RuntimeError("boom")
+        return "ok"
+
+    jobs = JobQueue(_run)
+    jobs.start()
+    bad = jobs.submit({"topic": "bad"})
+    good = jobs.submit({"topic": "good"})
+    assert "boom" in _wait_for(jobs, bad["id"], "failed")["error"]
+    _wait_for(jobs, good["id"], "done")
+    jobs.stop()
+
+
+def test_submit_rejects_invalid_spec():
+    jobs = JobQueue(lambda job_id, spec: "ok")
+    with pytest.raises(ValueError):
+        jobs.submit({"topic": ""})
+    assert jobs.list() == []
+
+
+def test_stop_cancels_queued_jobs():
+    release = threading.Event()
+    ran = []
+
+    def _run(job_id, spec):
+        ran.append(spec["topic"])
+        release.wait(5)
+        return "ok"
+
+    jobs = JobQueue(_run)
+    jobs.start()
+    first = jobs.submit({"topic": "first"})
+    _wait_for(jobs, first["id"], "running")
+    rest = [jobs.submit({"topic": f"t{i}"}) for i in range(3)]
+
+    stopper = threading.Thread(target=jobs.stop)
+    stopper.start()
+    time.sleep(0.05)
+    release.set()
+    stopper.join(5)
+    assert not stopper.is_alive()
+    assert ran == ["first"]
+    assert jobs.get(first["id"])["status"] == "done"
+    assert [jobs.get(j["id"])["status"] for j in rest] == ["cancelled"] * 3
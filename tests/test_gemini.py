@@ -0,0 +1,74 @@
+from types import SimpleNamespace
+
+from brainrot import gemini
+
+
+def _record(cached_content=None, prompt=100, cached=0):
+    response = SimpleNamespace(
+        usage_metadata=SimpleNamespace(
+            prompt_token_count=prompt, cached_content_token_count=cached
+        )
+    )
+    config = SimpleNamespace(cached_content=cached_content)
+    gemini.record_usage(response, config, 0.5)
+
+
+def test_usage_summary_counts_only_since_snapshot():
+    _record()
+    since = gemini.usage_snapshot()
+    assert gemini.usage_summary(since) is None
+    _record("cachedContents/x", prompt=1000, cached=900)
+    _record()
+    summary = gemini.usage_summary(since)
+    assert "1 cached / 1 inline requests" in summary
+    assert "900 of 1,100 prompt tokens" in summary
+
+
+def _script_calls(client):
+    return [c["config"] for c in client.calls]
+
+
+def test_context_cache_created_once(fake_client):
+    from brainrot.script_writer import generate_script
+
+    since = gemini.usage_snapshot()
+    generate_script("Ohio")
+    generate_script("Rizz")
+    assert len(fake_client.contexts) == 1
+    (name,) = fake_client.contexts
+    for config in _script_calls(fake_client):
+        assert config.cached_content == name
+        assert config.system_instruction is None
+    assert "2 cached / 0 inline" in gemini.usage_summary(since)
+
+
+def test_rejected_handle_is_dropped_and_retried_inline(fake_client):
+    from brainrot.script_writer import SYSTEM_PROMPT, generate_script
+
+    generate_script("Ohio")
+    fake_client.contexts.clear()  # the server forgot the cache early
+    script = generate_script("Rizz")
+    assert script["scenes"]
+    rejected, retried = _script_calls(fake_client)[-2:]
+    assert rejected.cached_content
+    assert retried.cached_content is None
+    assert retried.system_instruction == SYSTEM_PROMPT
+    # The stale handle is gone; the next request makes a fresh cache.
+    generate_script("Skibidi")
+    assert len(fake_client.contexts) == 1
+    assert _script_calls(fake_client)[-1].cached_content in fake_client.contexts
+
+
+def test_unsupported_cache_falls_back_inline(fake_client):
+    from brainrot import fake_gemini
+    from brainrot.script_writer import SYSTEM_PROMPT, generate_script
+
+    client = fake_gemini.install(context_cache=False)
+    since = gemini.usage_snapshot()
+    generate_script("Ohio")
+    generate_script("Rizz")
+    assert client.contexts == {}
+    for config in _script_calls(client):
+        assert config.cached_content is None
+        assert config.system_instruction == SYSTEM_PROMPT
+    assert "0 cached / 2 inline" in gemini.usage_summary(since)
@@ -0,0 +1,11 @@
+import pytest
+
+
+def test_image_key_normalises_whitespace_only():
+    # The module builds request configs with google.genai.types.
+    pytest.importorskip("google.genai")
+    from brainrot.image_generator import image_key
+
+    assert image_key("neon  Ohio\nskyline ") == image_key("neon Ohio skyline")
+    assert image_key("neon Ohio skyline") != image_key("NEON OHIO SKYLINE")
+    assert image_key("neon Ohio skyline") != image_key("neon Ohio skyline!")
@@ -0,0 +1,89 @@
+import copy
+
+import pytest
+
+from brainrot.incremental import load_manifest, plan_rebuild, write_manifest
+
+
+def _scene(scene_id: int, **fields) -> dict:
+    scene = {
+        "scene_id": scene_id,
+        "narration": f"Narration {scene_id}.",
+        "image_prompt": f"Prompt {scene_id}",
+        "math_elements": ["x = y"],
+    }
+    scene.update(fields)
+    return scene
+
+
+@pytest.fixture
+def built(tmp_path):
+    """A script with three scenes and a manifest whose artifacts all exist."""
+    script = {"title": "T", "scenes": [_scene(i) for i in (1, 2, 3)]}
+    paths = {}
+    for kind in ("image", "tts", "segment"):
+        paths[kind] = []
+        for i in (1, 2, 3):
+            path = tmp_path / f"{kind}_{i}"
+            path.write_bytes(b"x")
+            paths[kind].append(str(path))
+    write_manifest(
+        str(tmp_path),
+        script,
+        paths["image"],
+        paths["tts"],
+        [{"words": []}] * 3,
+        paths["segment"],
+    )
+    return script, load_manifest(str(tmp_path))
+
+
+def _flags(plan: list[dict]) -> list[tuple[bool, bool, bool]]:
+    return [(p["image"], p["tts"], p["segment"]) for p in plan]
+
+
+def test_unchanged_script_rebuilds_nothing(built):
+    script, manifest = built
+    assert _flags(plan_rebuild(script, manifest)) == [(False, False, False)] * 3
+
+
+def test_without_manifest_everything_is_rebuilt(built):
+    script, _ = built
+    assert _flags(plan_rebuild(script, None)) == [(True, True, True)] * 3
+
+
+def test_changed_fields_rebuild_only_their_artifacts(built):
+    script, manifest = built
+    edited = copy.deepcopy(script)
+    edited["scenes"][0]["image_prompt"] = "New prompt"
+    edited["scenes"][1]["narration"] = "New narration."
+    edited["scenes"][2]["math_elements"] = ["a = b"]
+    assert _flags(plan_rebuild(edited, manifest)) == [
+        (True, False, True),
+        (False, True, True),
+        (False, False, True),
+    ]
+
+
+def test_new_voice_revoices_the_scene(built):
+    script, manifest = built
+    edited = copy.deepcopy(script)
+    edited["scenes"][1]["voice"] = "marius"
+    assert _flags(plan_rebuild(edited, manifest))[1] == (False, True, True)
+
+
+def test_moved_scene_rerenders_its_segment(built):
+    script, manifest = built
+    edited = copy.deepcopy(script)
+    # Dropping scene 3 makes scene 2 the last scene.
+    edited["scenes"].pop()
+    assert _flags(plan_rebuild(edited, manifest)) == [
+        (False, False, False),
+        (False, False, True),
+    ]
+
+
+def test_missing_artifact_is_rebuilt(built):
+    script, manifest = built
+    manifest["scenes"][0]["image"] = "/nonexistent.png"
+    assert _flags(plan_rebuild(script, manifest))[0] == (True, False, True)
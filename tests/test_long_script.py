@@ -0,0 +1,76 @@
+from types import SimpleNamespace
+
+import pytest
+
+from brainrot.offline_script import generate_offline_script
+from brainrot.script_writer import (
+    generate_long_script,
+    merge_acts,
+    plan_acts,
+    validate_script,
+)
+
+
+@pytest.mark.parametrize(
+    "minutes, sizes",
+    [
+        (3, [8, 8, 8]),
+        (1, [8]),
+        (2.5, [7, 7, 6]),
+        (0.05, [1]),
+    ],
+)
+def test_plan_acts(minutes, sizes):
+    assert plan_acts(minutes) == sizes
+
+
+def test_merge_acts_renumbers_scenes():
+    acts = [generate_offline_script("A", 2), generate_offline_script("B", 3)]
+    merged = merge_acts("Long", acts)
+    assert merged["title"] == "Long"
+    assert [s["scene_id"] for s in merged["scenes"]] == [1, 2, 3, 4, 5]
+    assert acts[1]["scenes"][0]["scene_id"] == 1  # inputs are not modified
+
+
+def test_long_script_renumbers_acts_from_one(fake_client):
+    script = generate_long_script("Ohio", 2)
+    assert validate_script(script) == []
+    assert script["title"] == "Ohio"
+    assert [s["scene_id"] for s in script["scenes"]] == list(range(1, 17))
+    prompts = [str(c["contents"]) for c in fake_client.calls]
+    assert sum("2-act" in p for p in prompts) == 1
+    assert sum(p.startswith("Write act") for p in prompts) == 2
+
+
+def _failing(client, marker, response=None):
+    real = client.models.generate_content
+
+    def _generate(**kwargs):
+        if marker in str(kwargs["contents"]):
+            if response is None:
+                raise RuntimeError("act exploded")
+            return response
+        return real(**kwargs)
+
+    return _generate
+
+
+def test_failed_act_fails_the_script(fake_client, monkeypatch):
+    monkeypatch.setattr(
+        fake_client.models,
+        "generate_content",
+        _failing(fake_client, "Write act 2 of 3"),
+    )
+    with pytest.raises(RuntimeError, match="act exploded"):
+        generate_long_script("Ohio", 3)
+
+
+def test_short_outline_is_rejected(fake_client, monkeypatch):
+    outline = SimpleNamespace(text='{"title": "T", "acts": []}', usage_metadata=None)
+    monkeypatch.setattr(
+        fake_client.models,
+        "generate_content",
+        _failing(fake_client, "-act", outline),
+    )
+    with pytest.raises(ValueError, match="expected 3"):
+        generate_long_script("Ohio", 3)
@@ -0,0 +1,32 @@
+import pytest
+
+from brainrot.offline_script import generate_offline_script
+from brainrot.script_writer import RANDOM_TOPICS, validate_script
+
+
+def test_same_seed_same_script():
+    for topic in ("Ohio", None):
+        script = generate_offline_script(topic, 6, seed=3)
+        assert script == generate_offline_script(topic, 6, seed=3)
+
+
+def test_seed_changes_the_script():
+    scripts = [generate_offline_script("Ohio", 6, seed=s) for s in range(5)]
+    assert len({repr(s) for s in scripts}) == 5
+
+
+@pytest.mark.parametrize("n_scenes", [1, 2, 7, 40])
+@pytest.mark.parametrize("seed", range(5))
+def test_scripts_pass_validation(n_scenes, seed):
+    script = generate_offline_script("Skibidi", n_scenes, seed)
+    assert validate_script(script) == []
+    assert [s["scene_id"] for s in script["scenes"]] == list(range(1, n_scenes + 1))
+
+
+def test_random_topic_comes_from_the_list():
+    assert generate_offline_script(seed=1)["title"] in RANDOM_TOPICS
+
+
+def test_needs_a_scene():
+    with pytest.raises(ValueError):
+        generate_offline_script("Ohio", 0)
@@ -0,0 +1,53 @@
+import time
+
+import numpy as np
+import pytest
+
+from brainrot.procedural_images import (
+    HEIGHT,
+    PATTERNS,
+    WIDTH,
+    generate_background,
+    png_bytes,
+    render_background,
+)
+
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_render_is_deterministic_and_full_size(pattern):
+    img = render_background("neon Ohio skyline", pattern=pattern)
+    assert img.shape == (HEIGHT, WIDTH, 3) and img.dtype == np.uint8
+    np.testing.assert_array_equal(
+        img, render_background("neon  Ohio skyline", pattern=pattern)
+    )
+    assert img.std() > 0
+
+
+def test_different_prompts_give_different_images():
+    a = render_background("sigma grindset")
+    b = render_background("skibidi toilet")
+    assert not np.array_equal(a, b)
+
+
+def test_odd_sizes_and_no_upscale():
+    assert render_background("x", 101, 179).shape == (179, 101, 3)
+    assert render_background("x", 64, 96, scale=1).shape == (96, 64, 3)
+
+
+def test_generate_background_writes_png(tmp_path):
+    path = generate_background("vaporwave", str(tmp_path / "a" / "bg.png"))
+    with open(path, "rb") as f:
+        data = f.read()
+    assert data == png_bytes(render_background("vaporwave"))
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_render_and_encode_under_100ms(pattern):
+    # Best of a few runs, so a busy CI machine does not fail the build.
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        png_bytes(render_background("benchmark", pattern=pattern))
+        best = min(best, time.perf_counter() - start)
+    assert best < 0.1
@@ -0,0 +1,96 @@
+import asyncio
+import time
+
+import pytest
+
+from brainrot.ratelimit import TokenBucket, get_limiter, is_throttle, retry_call
+
+
+def test_burst_then_refill_rate():
+    bucket = TokenBucket(rate=20.0, capacity=2)
+    start = time.monotonic()
+    bucket.acquire()
+    bucket.acquire()
+    assert time.monotonic() - start < 0.04  # the burst is free
+    bucket.acquire()
+    bucket.acquire()
+    # Two more tokens at 20/s take about 0.1 s.
+    assert time.monotonic() - start >= 0.09
+
+
+def test_async_acquire_waits_too():
+    bucket = TokenBucket(rate=20.0, capacity=1)
+
+    async def _take_two():
+        await bucket.aacquire()
+        await bucket.aacquire()
+
+    start = time.monotonic()
+    asyncio.run(_take_two())
+    assert time.monotonic() - start >= 0.04
+
+
+def test_rate_must_be_positive():
+    with pytest.raises(ValueError):
+        TokenBucket(0)
+    bucket = TokenBucket(1.0)
+    with pytest.raises(ValueError):
+        bucket.set_rate(-1)
+
+
+def test_set_rate_clamps_stored_tokens():
+    bucket = TokenBucket(rate=100.0, capacity=10)
+    bucket.set_rate(1.0, capacity=1)
+    assert bucket.capacity == 1
+    bucket.acquire()
+    assert bucket._try_take(1) > 0
+
+
+def test_limiters_are_shared_by_name():
+    assert get_limiter("test.shared", 60) is get_limiter("test.shared", 1)
+
+
+class _ApiError(Exception):
+    def __init__(self, code):
+        super().__init__(f"HTTP {code}")
+        self.code = code
+
+
+def test_is_throttle():
+    assert is_throttle(_ApiError(429))
+    assert is_throttle(Exception("RESOURCE_EXHAUSTED: quota"))
+    assert not is_throttle(_ApiError(400))
+
+
+def test_retry_call_retries_only_throttles():
+    calls = []
+
+    def _flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise _ApiError(429)
+        return "ok"
+
+    assert retry_call(_flaky, base_delay=0.0) == "ok"
+    assert len(calls) == 3
+
+    def _broken():
+        calls.append(1)
+        raise _ApiError(400)
+
+    calls.clear()
+    with pytest.raises(_ApiError):
+        retry_call(_broken, base_delay=0.0)
+    assert len(calls) == 1
+
+
+def test_named_bucket_lets_a_batch_start_together():
+    bucket = get_limiter("test.burst", 30, burst=4)
+    assert bucket.capacity == 4
+    for _ in range(4):
+        assert bucket._try_take(1) == 0
+    assert bucket._try_take(1) > 0
+    # Changing the rate keeps the burst; tiny quotas cap it.
+    bucket.set_rate(1.0)
+    assert bucket.capacity == 4
+    assert get_limiter("test.tiny", 2, burst=4).capacity == 2
@@ -0,0 +1,68 @@
+import threading
+import time
+
+import pytest
+
+from brainrot.scheduler import StageGraph
+
+
+def test_dependencies_receive_results():
+    graph = StageGraph()
+    graph.add("script", lambda: "s")
+    graph.add("images", lambda script: script + "-img", deps=("script",))
+    graph.add("tts", lambda script: script + "-tts", deps=("script",))
+    graph.add(
+        "compose",
+        lambda images, tts: (images, tts),
+        deps=("images", "tts"),
+    )
+    results = graph.run()
+    assert results["compose"] == ("s-img", "s-tts")
+    assert set(graph.timings) == {"script", "images", "tts", "compose"}
+
+
+def test_independent_stages_overlap():
+    barrier = threading.Barrier(2, timeout=5)
+    graph = StageGraph(max_workers=2)
+    # Each stage waits for the other, so this only finishes if both run at once.
+    graph.add("a", barrier.wait)
+    graph.add("b", barrier.wait)
+    graph.run()
+    a, b = graph.timings["a"], graph.timings["b"]
+    assert a["start"] < b["end"] and b["start"] < a["end"]
+
+
+def test_stage_starts_after_its_dependencies():
+    graph = StageGraph()
+    graph.add("slow", lambda: time.sleep(0.05))
+    graph.add("next", lambda slow: None, deps=("slow",))
+    graph.run()
+    assert graph.timings["next"]["start"] >= graph.timings["slow"]["end"]
+
+
+def test_error_propagates_and_skips_dependents():
+    ran = []
+    graph = StageGraph()
+    graph.add("bad", lambda: 1 / 0)
+    graph.add("after", lambda bad: ran.append("after"), deps=("bad",))
+    with pytest.raises(ZeroDivisionError):
+        graph.run()
+    assert ran == []
+
+
+def test_rejects_unknown_dependency_and_cycles():
+    graph = StageGraph().add("a", lambda missing: None, deps=("missing",))
+    with pytest.raises(ValueError, match="unknown"):
+        graph.run()
+
+    graph = StageGraph()
+    graph.add("a", lambda b: None, deps=("b",))
+    graph.add("b", lambda a: None, deps=("a",))
+    with pytest.raises(ValueError, match="cycle"):
+        graph.run()
+
+
+def test_rejects_duplicate_stage():
+    graph = StageGraph().add("a", lambda: None)
+    with pytest.raises(ValueError, match="Duplicate"):
+        graph.add("a", lambda: None)
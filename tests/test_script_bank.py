@@ -0,0 +1,85 @@
+import threading
+import time
+
+import pytest
+
+from brainrot import script_bank
+from brainrot.offline_script import generate_offline_script
+from brainrot.script_bank import ScriptBank
+
+
+@pytest.fixture
+def bank(tmp_path):
+    return ScriptBank(str(tmp_path / "bank"), depth=2, topics=["A", "B", "C"])
+
+
+def test_pop_is_fifo_and_empties(bank):
+    for topic in ("A", "B"):
+        bank.put(topic, generate_offline_script(topic, 3))
+    assert len(bank) == 2
+    assert bank.topics_in_stock() == {"A", "B"}
+    assert bank.pop()[0] == "A"
+    topic, script = bank.pop()
+    assert topic == "B" and len(script["scenes"]) == 3
+    assert bank.pop() is None
+    assert not list(bank.root.iterdir())
+
+
+def test_invalid_scripts_are_not_banked(bank):
+    with pytest.raises(ValueError):
+        bank.put("A", {"title": "A", "scenes": []})
+    assert len(bank) == 0
+
+
+def test_stale_entries_are_discarded(bank, monkeypatch):
+    bank.put("A", generate_offline_script("A", 3))
+    monkeypatch.setattr(script_bank, "bank_version", lambda: "0" * 16)
+    assert len(bank) == 0
+    assert bank.pop() is None
+
+
+def test_concurrent_pops_claim_each_entry_once(bank):
+    for i in range(20):
+        bank.put(f"T{i}", generate_offline_script(f"T{i}", 1))
+    taken = []
+    lock = threading.Lock()
+
+    def _drain():
+        while (entry := bank.pop()) is not None:
+            with lock:
+                taken.append(entry[0])
+
+    threads = [threading.Thread(target=_drain) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(taken) == sorted(f"T{i}" for i in range(20))
+
+
+def test_refill_tops_up_to_depth(bank, fake_client):
+    assert bank.refill() == 2
+    assert len(bank) == 2
+    bank.pop()
+    assert bank.refill() == 1
+
+
+def test_stop_does_not_wait_for_a_slow_fill(bank, monkeypatch):
+    started = threading.Event()
+
+    def _slow_fill():
+        started.set()
+        time.sleep(5)
+
+    monkeypatch.setattr(bank, "fill_one", _slow_fill)
+    bank.start()
+    assert started.wait(2)
+    start = time.monotonic()
+    bank.stop(timeout=0.1)
+    assert time.monotonic() - start < 1
+
+
+def test_depth_zero_never_starts_a_filler(tmp_path):
+    bank = ScriptBank(str(tmp_path), depth=0)
+    bank.start()
+    assert bank._thread is None
@@ -0,0 +1,78 @@
+import json
+
+import pytest
+
+from brainrot.offline_script import generate_offline_script
+from brainrot.script_writer import SceneStreamParser, ScriptStream
+
+
+def _chunks(text: str, size: int) -> list[str]:
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+@pytest.fixture
+def script():
+    script = generate_offline_script("Streaming", 4)
+    # Braces and quotes inside strings must not confuse the parser.
+    script["scenes"][1]["narration"] = 'He said "{not a scene}" and left.'
+    return script
+
+
+@pytest.mark.parametrize("size", [1, 7, 10_000])
+def test_parser_yields_each_scene_once(script, size):
+    text = "```json\n" + json.dumps(script, indent=2) + "\n```"
+    parser = SceneStreamParser()
+    scenes = []
+    for chunk in _chunks(text, size):
+        scenes += parser.feed(chunk)
+    assert scenes == script["scenes"]
+    assert parser.title == script["title"]
+
+
+def test_parser_emits_a_scene_once_its_brace_closes():
+    head = '{"title": "T", "scenes": [{"scene_id": 1, "narration": "a"'
+    parser = SceneStreamParser()
+    assert parser.feed(head) == []
+    assert parser.feed("}") == [{"scene_id": 1, "narration": "a"}]
+
+
+def test_parser_ignores_objects_outside_scenes():
+    parser = SceneStreamParser()
+    text = '{"meta": {"a": {"b": 1}}, "title": "T", "scenes": [{"scene_id": 1}]}'
+    assert parser.feed(text) == [{"scene_id": 1}]
+
+
+def test_stream_holds_back_from_first_invalid_scene(script):
+    script["scenes"][1]["narration"] = ""
+    stream = ScriptStream(_chunks(json.dumps(script), 16), "Streaming")
+    assert list(stream) == script["scenes"][:1]
+    with pytest.raises(RuntimeError):
+        list(stream)
+
+
+def test_stream_result_matches_yielded_prefix(script):
+    stream = ScriptStream(_chunks(json.dumps(script), 16), "Streaming")
+    yielded = list(stream)
+    assert yielded == script["scenes"]
+    assert stream.result()["scenes"][: len(yielded)] == yielded
+
+
+def test_stream_result_repairs_held_scenes(script, fake_client):
+    script["scenes"][2]["image_prompt"] = None
+    stream = ScriptStream(_chunks(json.dumps(script), 16), "Streaming")
+    yielded = list(stream)
+    result = stream.result()
+    assert len(yielded) == 2
+    assert result["scenes"][:2] == yielded
+    assert result["scenes"][2]["image_prompt"]
+    assert [s["scene_id"] for s in result["scenes"]] == [1, 2, 3, 4]
+
+
+def test_stream_holds_back_from_repeated_id(script):
+    script["scenes"][2]["scene_id"] = 1
+    stream = ScriptStream(_chunks(json.dumps(script), 16), "Streaming")
+    yielded = list(stream)
+    assert yielded == script["scenes"][:2]
+    result = stream.result()
+    assert result["scenes"][:2] == yielded
+    assert [s["scene_id"] for s in result["scenes"]] == [1, 2, 3, 4]
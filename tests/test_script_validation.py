@@ -0,0 +1,93 @@
+import json
+
+import pytest
+
+from brainrot.offline_script import generate_offline_script
+from brainrot.script_writer import _finish, validate_script
+
+
+@pytest.fixture
+def script():
+    return generate_offline_script("Validation", 4)
+
+
+def test_valid_script_has_no_problems(script):
+    assert validate_script(script) == []
+
+
+@pytest.mark.parametrize(
+    "break_it, problem",
+    [
+        (lambda s: s.update(title=" "), "'title'"),
+        (lambda s: s.update(scenes=[]), "'scenes'"),
+        (lambda s: s["scenes"][0].update(narration=""), "scene 1: 'narration'"),
+        (lambda s: s["scenes"][1].pop("image_prompt"), "scene 2: 'image_prompt'"),
+        (lambda s: s["scenes"][2].update(scene_id="3"), "scene 3: 'scene_id'"),
+        (lambda s: s["scenes"][3].update(math_elements=[1]), "'math_elements'"),
+        (lambda s: s["scenes"][0].update(duration_hint="5"), "'duration_hint'"),
+        (lambda s: s["scenes"][1].update(scene_id=1), "unique"),
+        (lambda s: s["scenes"].__setitem__(0, "oops"), "scene 1: not an object"),
+    ],
+)
+def test_problems_are_reported(script, break_it, problem):
+    break_it(script)
+    assert any(problem in p for p in validate_script(script))
+
+
+def test_non_object_script():
+    assert validate_script([]) == ["script must be a JSON object"]
+
+
+def test_finish_fills_local_defaults_without_requests(script):
+    for scene in script["scenes"]:
+        del scene["math_elements"], scene["duration_hint"]
+    del script["scenes"][0]["scene_id"]
+    script["title"] = ""
+    fixed = _finish("Validation", json.dumps(script))
+    assert fixed["title"] == "Validation"
+    # The patched id must not collide with the ids the model chose (2-4).
+    assert [s["scene_id"] for s in fixed["scenes"]] == [1, 2, 3, 4]
+    assert validate_script(fixed) == []
+
+
+def test_finish_gives_missing_ids_unused_values(script):
+    script["scenes"][0]["scene_id"] = 3
+    del script["scenes"][1]["scene_id"]
+    script["scenes"][2]["scene_id"] = 1
+    del script["scenes"][3]["scene_id"]
+    fixed = _finish("Validation", json.dumps(script))
+    assert [s["scene_id"] for s in fixed["scenes"]] == [3, 2, 1, 4]
+
+
+def test_finish_renumbers_repeated_ids_without_requests(script):
+    for scene, scene_id in zip(script["scenes"], [2, 2, 1, 2]):
+        scene["scene_id"] = scene_id
+    fixed = _finish("Validation", json.dumps(script))
+    assert [s["scene_id"] for s in fixed["scenes"]] == [2, 3, 1, 4]
+    assert [s["narration"] for s in fixed["scenes"]] == [
+        s["narration"] for s in script["scenes"]
+    ]
+    assert validate_script(fixed) == []
+
+
+def test_finish_repairs_only_broken_scenes(script, fake_client):
+    script["scenes"][1]["narration"] = ""
+    script["scenes"][3] = "not a scene"
+    fixed = _finish("Validation", json.dumps(script))
+    assert validate_script(fixed) == []
+    assert fixed["scenes"][0] == script["scenes"][0]
+    assert fixed["scenes"][2] == script["scenes"][2]
+    assert [s["scene_id"] for s in fixed["scenes"]] == [1, 2, 3, 4]
+    # One single-scene request per broken scene, nothing else.
+    assert len(fake_client.calls) == 2
+
+
+def test_finish_repairs_malformed_json(script, fake_client):
+    fixed = _finish("Validation", json.dumps(script)[:-5])
+    assert validate_script(fixed) == []
+    assert len(fake_client.calls) == 1
+
+
+def test_finish_raises_when_unrepairable():
+    with pytest.raises(ValueError, match="Invalid script"):
+        _finish("Validation", json.dumps({"title": "T", "scenes": []}))
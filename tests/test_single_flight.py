@@ -0,0 +1,55 @@
+import asyncio
+import threading
+import time
+
+from brainrot.cache import SingleFlight
+
+
+def test_concurrent_calls_share_one_result():
+    flight = SingleFlight()
+    calls = []
+
+    def _work():
+        calls.append(1)
+        time.sleep(0.1)
+        return "done"
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(flight.do("k", _work)))
+        for _ in range(4)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == ["done"] * 4
+    assert len(calls) == 1
+    assert flight.shared == 3
+
+
+def test_async_calls_share_per_loop():
+    flight = SingleFlight()
+    calls = []
+
+    async def _work():
+        calls.append(1)
+        await asyncio.sleep(0.1)
+        return "done"
+
+    async def _three():
+        return await asyncio.gather(*(flight.ado("k", _work) for _ in range(3)))
+
+    # Two loops at once: each runs its own call and never awaits the other's.
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(asyncio.run(_three())))
+        for _ in range(2)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == [["done"] * 3] * 2
+    assert len(calls) == 2
+    assert flight.shared == 4
@@ -0,0 +1,63 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from brainrot import tracing
+
+
+@pytest.fixture
+def recording():
+    tracing.enable()
+    yield
+    tracing.disable()
+
+
+def test_async_tasks_get_their_own_tracks(recording):
+    async def _request(i):
+        with tracing.span("image", scene=i):
+            await asyncio.sleep(0.02)
+
+    async def _all():
+        await asyncio.gather(*(_request(i) for i in range(3)))
+
+    asyncio.run(_all())
+    spans = tracing.events()
+    assert len({ev["tid"] for ev in spans}) == 3
+    assert threading.get_ident() not in {ev["tid"] for ev in spans}
+
+
+def test_summary_reports_wall_clock_not_sum(recording):
+    def _work():
+        with tracing.span("tts", cat="scene"):
+            time.sleep(0.1)
+
+    threads = [threading.Thread(target=_work) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    row = next(line for line in tracing.summary().splitlines() if "scene/tts" in line)
+    count, wall = row.split()[1:3]
+    assert count == "4"
+    assert 0.1 <= float(wall.rstrip("s")) < 0.3
+
+
+def test_wall_merges_overlaps():
+    assert tracing._wall([(0, 2), (1, 3), (5, 6), (5.5, 5.7)]) == 4
+    assert tracing._wall([]) == 0
+
+
+def test_drained_events_can_be_merged_back(recording, tmp_path):
+    with tracing.span("tts.generate_audio", cat="tts"):
+        pass
+    moved = tracing.drain()
+    assert tracing.events() == []
+    tracing.add_events([dict(ev, pid=ev["pid"] + 1) for ev in moved])
+    path = tracing.write_chrome_trace(str(tmp_path / "trace.json"))
+    with open(path) as f:
+        trace = json.load(f)["traceEvents"]
+    assert [ev["name"] for ev in trace] == ["thread_name", "tts.generate_audio"]
+    assert trace[0]["pid"] == trace[1]["pid"]
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from brainrot.tts_cache import SentenceCache, normalize, split_sentences
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("One. Two! Three?", ["One.", "Two!", "Three?"]),
+        ("  Spaced   out.\n\nNext line.  ", ["Spaced out.", "Next line."]),
+        ("It has been… educational.", ["It has been… educational."]),
+        ("Use e.g. this one. Then 2 more.", ["Use e.g. this one.", "Then 2 more."]),
+        ('He said "Ohio." Then left.', ['He said "Ohio."', "Then left."]),
+        ("Wait... What?", ["Wait…", "What?"]),
+        ("(Quiet.) Loud!", ["(Quiet.)", "Loud!"]),
+        ("", []),
+        ("No ending", ["No ending"]),
+    ],
+)
+def test_split_sentences(text, expected):
+    assert split_sentences(text) == expected
+
+
+def test_normalize_unifies_quotes_and_ellipses():
+    assert normalize("“Rizz”  isn’t  real...") == "\"Rizz\" isn't real…"
+
+
+def test_key_ignores_formatting_but_not_voice_or_model():
+    key = SentenceCache.key
+    assert key("Hi there.", "alba", "1") == key(" Hi  there.", "alba", "1")
+    assert key("Hi there.", "alba", "1") != key("Hi there.", "marius", "1")
+    assert key("Hi there.", "alba", "1") != key("Hi there.", "alba", "2")
+
+
+def test_get_put_and_stats(tmp_path):
+    cache = SentenceCache(str(tmp_path))
+    key = cache.key("Hello.", "alba", "1")
+    assert cache.get(key, 24000) is None
+    clip = np.linspace(-1, 1, 12000, dtype=np.float32)
+    cache.put(key, clip)
+    np.testing.assert_array_equal(cache.get(key, 24000), clip)
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+    assert stats["hit_rate"] == 0.5
+    assert stats["seconds_reused"] == pytest.approx(0.5)